@@ -18,23 +18,37 @@ It serves as the core directory manipulation layer used by the FAT12Image handle
 """
 
 import struct
-import os
 import datetime
 import logging
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Callable, FrozenSet, List, Optional
 
 from .vfat_utils import (
-    decode_lfn_text, decode_short_name, decode_raw_83_name,
+    decode_lfn_text, decode_short_name, decode_raw_83_name, decode_raw_83_name_upper,
     calculate_lfn_checksum, create_lfn_entries, generate_83_name,
     format_83_name, decode_fat_date, decode_fat_time,
     encode_fat_time, encode_fat_date,
-    DIR_ATTR_OFFSET, LFN_CHECKSUM_OFFSET, DIR_CRT_TIME_TENTH_OFFSET, DIR_SHORT_NAME_LEN,
-    DIR_LAST_MOD_TIME_OFFSET
+    DIR_ATTR_OFFSET, LFN_CHECKSUM_OFFSET, DIR_SHORT_NAME_LEN
 )
 
 logger = logging.getLogger(__name__)
 
+# 32-byte short directory entry: name+ext, attributes, NT case flags, creation
+# tenth/time/date, last access date, high cluster, last modified time/date,
+# low cluster, file size
+_DIR_ENTRY_STRUCT = struct.Struct('<11sBBBHHHHHHHI')
+
+# bytes.translate() table mapping a slot's first byte to 1 if the slot is
+# free (end of directory 0x00 or deleted 0xE5) and 0 if it is in use
+_FREE_SLOT_TABLE = bytes(1 if b in (0x00, 0xE5) else 0 for b in range(256))
+
+# A 255-character long name takes at most 20 LFN slots of 13 characters
+_MAX_LFN_SLOTS = 20
+
+# Attribute bits set_entry_attributes can change, with their log labels
+_ATTR_LABELS = ((0x01, "RO"), (0x02, "HID"), (0x04, "SYS"), (0x20, "ARC"))
+
 class FAT12Error(Exception):
     """Base exception for FAT12 filesystem errors"""
     pass
@@ -43,11 +57,105 @@ class FAT12CorruptionError(FAT12Error):
     """Exception for detected filesystem corruption (loops, invalid chains)"""
     pass
 
-def iter_directory_entries(fs, cluster: int = None):
+@dataclass
+class DirEntry:
+    """
+    A parsed directory entry, as returned by read_directory().
+
+    Entries are not dicts. Fields live in slots rather than a per-entry dict,
+    and the set of keys is fixed. For the callers written against the old
+    dicts, entries keep the read side of the mapping API (entry['name'],
+    entry.get('is_dir'), 'name' in entry, keys(), values(), items()) and
+    allow existing keys to be assigned (entry['parent_cluster'] = ...).
+    Assigning an unknown key raises KeyError. Use to_dict() where a real
+    dict is needed, e.g. for json.dumps().
+    """
+    # Declared by hand: dataclass(slots=True) needs Python 3.10
+    __slots__ = (
+        'name', 'short_name', 'raw_short_name', 'size', 'cluster',
+        'file_type', 'index', 'parent_cluster', 'is_read_only', 'is_hidden',
+        'is_system', 'is_dir', 'is_archive', 'attributes', 'nt_case_info',
+        'creation_time', 'creation_time_tenth', 'creation_date',
+        'creation_datetime_str', 'last_accessed_date', 'last_accessed_str',
+        'last_modified_time', 'last_modified_date',
+        'last_modified_datetime_str',
+    )
+
+    name: str
+    short_name: str
+    raw_short_name: str
+    size: int
+    cluster: int
+    file_type: str
+    index: int
+    parent_cluster: int
+    is_read_only: bool
+    is_hidden: bool
+    is_system: bool
+    is_dir: bool
+    is_archive: bool
+    attributes: int
+    nt_case_info: int
+    creation_time: int
+    creation_time_tenth: int
+    creation_date: int
+    creation_datetime_str: str
+    last_accessed_date: int
+    last_accessed_str: str
+    last_modified_time: int
+    last_modified_date: int
+    last_modified_datetime_str: str
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _DIR_ENTRY_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any):
+        if key not in _DIR_ENTRY_FIELDS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key: str) -> bool:
+        return key in _DIR_ENTRY_FIELDS
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in _DIR_ENTRY_FIELDS else default
+
+    def keys(self) -> List[str]:
+        return list(self.__slots__)
+
+    def values(self) -> List[Any]:
+        return [getattr(self, key) for key in self.__slots__]
+
+    def items(self) -> List[tuple]:
+        return [(key, getattr(self, key)) for key in self.__slots__]
+
+    def update(self, other=(), **kwargs):
+        """Assign several existing keys at once. Unknown keys raise KeyError."""
+        pairs = other.items() if hasattr(other, 'items') else other
+        for key, value in pairs:
+            self[key] = value
+        for key, value in kwargs.items():
+            self[key] = value
+
+    def copy(self) -> 'DirEntry':
+        return replace(self)
+
+    def to_dict(self) -> dict:
+        """Return the entry as a plain dict."""
+        return dict(self.items())
+
+_DIR_ENTRY_FIELDS = frozenset(DirEntry.__slots__)
+
+def iter_directory_entries(fs, cluster: int = None, fat_data: bytearray = None):
     """
     Iterates through all 32-byte directory entries in a given directory.
 
-    This generator handles both the fixed-size root directory and cluster-chained
+    This handles both the fixed-size root directory and cluster-chained
     subdirectories. It yields each entry as a raw bytes object along with its
     sequential index within the directory. Includes cycle detection to prevent
     infinite loops on corrupted disk images.
@@ -56,41 +164,185 @@ def iter_directory_entries(fs, cluster: int = None):
         fs: The FAT12Image filesystem object.
         cluster: The starting cluster of the directory to read. If None or 0,
                  the root directory is read.
+        fat_data: An optional pre-read FAT to avoid re-reading.
 
     Yields:
         A tuple of (int, bytes) representing the entry's index and its
         32-byte raw data.
     """
-    with open(fs.image_path, 'rb') as f:
-        if cluster is None or cluster == 0:
-            # Root Directory
-            f.seek(fs.root_start)
-            for i in range(fs.root_entries):
-                yield i, f.read(32)
-        else:
-            # Subdirectory (Cluster Chain)
-            fat_data = fs.read_fat()
-            current_cluster = cluster
-            idx = 0
-            visited = set()
+    # Positional reads on the image's shared descriptor, so several
+    # iterators can be active at once without disturbing each other.
+    # Dispatch once; the root never needs the FAT or a chain walk.
+    if cluster is None or cluster == 0:
+        return _iter_root_entries(fs)
+    return _iter_subdirectory_entries(fs, cluster, fat_data)
+
+def _iter_root_entries(fs):
+    """
+    Iterates through the fixed-size root directory, read in one go.
+
+    Returns:
+        An iterator of (index, 32-byte entry) tuples.
+    """
+    data = fs._pread(fs.root_entries * 32, fs.root_start)
+    return enumerate([data[off:off + 32] for off in range(0, fs.root_entries * 32, 32)])
+
+def _iter_subdirectory_entries(fs, cluster: int, fat_data: bytearray = None):
+    """
+    Iterates through a subdirectory's cluster chain, reading one run of
+    adjacent clusters at a time.
+
+    Yields:
+        (index, 32-byte entry) tuples.
+
+    Raises:
+        FAT12CorruptionError: If the cluster chain loops.
+    """
+    if fat_data is None:
+        fat_data = fs.read_fat()
+    current_cluster = cluster
+    idx = 0
+    visited = set()
+    run_start, run_len = 0, 0
+
+    while True:
+        in_chain = 2 <= current_cluster < 0xFF8
+
+        # Read the pending run once the chain leaves it
+        if run_len and (not in_chain or current_cluster in visited
+                        or current_cluster != run_start + run_len):
+            offset = fs.data_start + ((run_start - 2) * fs.bytes_per_cluster)
+            data = fs._pread(run_len * fs.bytes_per_cluster, offset)
+            for i in range(len(data) // 32):
+                yield idx, data[i * 32:(i + 1) * 32]
+                idx += 1
+            run_len = 0
+
+        if not in_chain:
+            break
+        if current_cluster in visited:
+            logger.error(f"Loop detected in directory cluster chain at {current_cluster}")
+            raise FAT12CorruptionError(f"Loop detected in directory cluster chain at {current_cluster}")
+        visited.add(current_cluster)
+
+        if run_len == 0:
+            run_start = current_cluster
+        run_len += 1
+
+        current_cluster = fs.get_fat_entry(fat_data, current_cluster)
+
+def _parse_short_entry(fs, entry_data: bytes, index: int, parent_cluster: int,
+                       lfn_parts: List[str], lfn_checksum: Optional[int]) -> Optional[DirEntry]:
+    """
+    Builds the read_directory() DirEntry for one 8.3 entry.
+
+    Args:
+        fs: The FAT12Image filesystem object.
+        entry_data: The raw 32-byte short entry.
+        index: The entry's index within its directory.
+        parent_cluster: The directory's starting cluster (0 for root).
+        lfn_parts: LFN fragments collected for this entry, last fragment first.
+        lfn_checksum: The checksum the LFN fragments carry, if any.
+
+    Returns:
+        The DirEntry, or None if the entry has no name.
+    """
+    name, ext = decode_short_name(entry_data)
+    if not name or name[0] == '\x00':
+        return None
+        
+    attr = entry_data[DIR_ATTR_OFFSET]
+    short_name_83 = f"{name}.{ext}" if ext else name
+        
+    # Store raw 11-byte name for robust collision detection
+    raw_short_name = decode_raw_83_name(entry_data)
+        
+    # Check if we have a valid LFN for this entry
+    long_name = None
+    if lfn_parts and lfn_checksum is not None:
+        # Verify checksum
+        short_name_bytes = entry_data[0:DIR_SHORT_NAME_LEN]
+        calculated_checksum = calculate_lfn_checksum(short_name_bytes)
             
-            while current_cluster >= 2 and current_cluster < 0xFF8:
-                if current_cluster in visited:
-                    logger.error(f"Loop detected in directory cluster chain at {current_cluster}")
-                    raise FAT12CorruptionError(f"Loop detected in directory cluster chain at {current_cluster}")
-                visited.add(current_cluster)
-
-                offset = fs.data_start + ((current_cluster - 2) * fs.bytes_per_cluster)
-                f.seek(offset)
-                
-                entries_per_cluster = fs.bytes_per_cluster // 32
-                for _ in range(entries_per_cluster):
-                    yield idx, f.read(32)
-                    idx += 1
-                    
-                current_cluster = fs.get_fat_entry(fat_data, current_cluster)
+        if calculated_checksum == lfn_checksum:
+            # LFN entries are stored in reverse order, so reverse the list
+            long_name = ''.join(reversed(lfn_parts))
+        else:
+            logger.warning(f"LFN checksum mismatch for {short_name_83}. Expected 0x{lfn_checksum:02X}, got 0x{calculated_checksum:02X}")
+        
+    # Use long name if available, otherwise use short name
+    display_name = long_name if long_name else short_name_83
+        
+    (_, _, nt_case_info, creation_time_tenth, creation_time, creation_date,
+     last_accessed_date, hi_cluster, last_modified_time, last_modified_date,
+     lo_cluster, size) = _DIR_ENTRY_STRUCT.unpack(entry_data)
+
+    if fs.fat_type != 'FAT32':
+        hi_cluster = 0
+
+    entry_cluster = (hi_cluster << 16) | lo_cluster
+        
+    # Decode dates and times
+    creation_datetime_str = f"{decode_fat_date(creation_date)} {decode_fat_time(creation_time)}"
+    if creation_time_tenth > 0:
+        creation_datetime_str += f".{creation_time_tenth * 10:02d}"
+        
+    last_accessed_str = decode_fat_date(last_accessed_date)
+    last_modified_datetime_str = f"{decode_fat_date(last_modified_date)} {decode_fat_time(last_modified_time)}"
+        
+    # Derive file type from name
+    file_type = Path(display_name).suffix.upper().lstrip('.')
+
+    return DirEntry(
+        name=display_name,
+        short_name=short_name_83,
+        raw_short_name=raw_short_name,
+        size=size,
+        cluster=entry_cluster,
+        file_type=file_type,
+        index=index,
+        parent_cluster=parent_cluster,
+        is_read_only=bool(attr & 0x01),
+        is_hidden=bool(attr & 0x02),
+        is_system=bool(attr & 0x04),
+        is_dir=bool(attr & 0x10),
+        is_archive=bool(attr & 0x20),
+        attributes=attr,
+        nt_case_info=nt_case_info,
+        creation_time=creation_time,
+        creation_time_tenth=creation_time_tenth,
+        creation_date=creation_date,
+        creation_datetime_str=creation_datetime_str,
+        last_accessed_date=last_accessed_date,
+        last_accessed_str=last_accessed_str,
+        last_modified_time=last_modified_time,
+        last_modified_date=last_modified_date,
+        last_modified_datetime_str=last_modified_datetime_str)
+
+def make_dir_entry(fs, entry_data: bytes, index: int, cluster: int = None,
+                   long_name: Optional[str] = None) -> Optional[DirEntry]:
+    """
+    Builds the DirEntry read_directory() would return for a short entry,
+    without reading the directory back. Used for entries just written.
+
+    Args:
+        fs: The FAT12Image filesystem object.
+        entry_data: The raw 32-byte short entry.
+        index: The short entry's index within its directory.
+        cluster: The directory's starting cluster (None for root).
+        long_name: The long name written ahead of the entry, if any.
 
-def read_directory(fs, cluster: int = None) -> List[dict]:
+    Returns:
+        The DirEntry, or None if the entry has no name.
+    """
+    parent_cluster = cluster if cluster is not None else 0
+    if long_name is None:
+        return _parse_short_entry(fs, entry_data, index, parent_cluster, [], None)
+    checksum = calculate_lfn_checksum(entry_data[0:DIR_SHORT_NAME_LEN])
+    return _parse_short_entry(fs, entry_data, index, parent_cluster, [long_name], checksum)
+
+def read_directory(fs, cluster: int = None, fat_data: bytearray = None,
+                   raw_entries: List[tuple] = None) -> List[DirEntry]:
     """
     Reads and parses all entries in a directory, processing VFAT Long Filenames.
 
@@ -103,147 +355,133 @@ def read_directory(fs, cluster: int = None) -> List[dict]:
         fs: The FAT12Image filesystem object.
         cluster: The starting cluster of the directory to read. If None or 0,
                  the root directory is read.
+        fat_data: An optional pre-read FAT to avoid re-reading.
+        raw_entries: Optional (index, data) pairs already read from this
+                     directory by iter_directory_entries(), to parse instead
+                     of reading it again.
 
     Returns:
-        A list of dictionaries, where each dictionary represents a file or
+        A list of DirEntry records, where each one represents a file or
         subdirectory with its parsed attributes (e.g., name, size, dates,
         attributes).
     """
     entries = []
+    parent_cluster = cluster if cluster is not None else 0
     
     # LFN accumulator
     lfn_parts = []
     lfn_checksum = None
     
-    for i, entry_data in iter_directory_entries(fs, cluster):
-            
+    if raw_entries is None:
+        raw_entries = iter_directory_entries(fs, cluster, fat_data)
+    
+    for i, entry_data in raw_entries:
+        first = entry_data[0]
+        attr = entry_data[DIR_ATTR_OFFSET]
+        
         # Check if entry is end of directory
-        if entry_data[0] == 0x00:
+        if first == 0x00:
             break
-                
-        # Check if entry is free (deleted)
-        if entry_data[0] == 0xE5:
-            lfn_parts = []
-            lfn_checksum = None
-            continue
-            
-        attr = entry_data[DIR_ATTR_OFFSET]
-            
-        # Check if this is an LFN entry
-        if attr == 0x0F:
-            seq = entry_data[0]
-            checksum = entry_data[LFN_CHECKSUM_OFFSET]
-                
+        
+        if first != 0xE5 and not attr & 0x08:
+            # A regular 8.3 entry (the LFN attribute 0x0F includes 0x08)
+            entry = _parse_short_entry(fs, entry_data, i, parent_cluster, lfn_parts, lfn_checksum)
+            if entry is not None:
+                entries.append(entry)
+        
+        elif attr == 0x0F and first != 0xE5:
+            # An LFN entry: collect its text and keep the accumulator
             text = decode_lfn_text(entry_data)
-            if text is not None:
-                if seq & 0x40:
-                    # This is the last entry, start fresh
-                    lfn_parts = [text]
-                    lfn_checksum = checksum
-                else:
-                    # This is a continuation, append to the end
-                    lfn_parts.append(text)
-            else:
+            if text is None:
                 lfn_parts = []
                 lfn_checksum = None
-                
-            continue
-            
-        # Skip volume labels
-        if attr & 0x08:
-            lfn_parts = []
-            lfn_checksum = None
-            continue
-            
-        # This is a regular 8.3 entry
-        name, ext = decode_short_name(entry_data)
-            
-        if name and name[0] not in ('\x00',):
-            short_name_83 = f"{name}.{ext}" if ext else name
-                
-            # Store raw 11-byte name for robust collision detection
-            raw_short_name = decode_raw_83_name(entry_data)
-                
-            # Check if we have a valid LFN for this entry
-            long_name = None
-            if lfn_parts and lfn_checksum is not None:
-                # Verify checksum
-                short_name_bytes = entry_data[0:DIR_SHORT_NAME_LEN]
-                calculated_checksum = calculate_lfn_checksum(short_name_bytes)
-                    
-                if calculated_checksum == lfn_checksum:
-                    # LFN entries are stored in reverse order, so reverse the list
-                    long_name = ''.join(reversed(lfn_parts))
-                else:
-                    logger.warning(f"LFN checksum mismatch for {short_name_83}. Expected 0x{lfn_checksum:02X}, got 0x{calculated_checksum:02X}")
-                
-            # Use long name if available, otherwise use short name
-            display_name = long_name if long_name else short_name_83
-                
-            creation_time_tenth = entry_data[DIR_CRT_TIME_TENTH_OFFSET]
-            creation_time = struct.unpack('<H', entry_data[14:16])[0]
-            creation_date = struct.unpack('<H', entry_data[16:18])[0]
-            last_accessed_date = struct.unpack('<H', entry_data[18:20])[0]
-            last_modified_time = struct.unpack('<H', entry_data[DIR_LAST_MOD_TIME_OFFSET:DIR_LAST_MOD_TIME_OFFSET+2])[0]
-            last_modified_date = struct.unpack('<H', entry_data[24:26])[0]
-
-            if fs.fat_type == 'FAT32':
-                hi_cluster = struct.unpack('<H', entry_data[20:22])[0]
+            elif first & 0x40:
+                # This is the last entry, start fresh
+                lfn_parts = [text]
+                lfn_checksum = entry_data[LFN_CHECKSUM_OFFSET]
             else:
-                hi_cluster = 0
-
-            lo_cluster = struct.unpack('<H', entry_data[26:28])[0]
-            entry_cluster = (hi_cluster << 16) | lo_cluster
-            size = struct.unpack('<I', entry_data[28:32])[0]
-            nt_case_info = entry_data[12]
-                
-            # Decode dates and times
-            creation_datetime_str = f"{decode_fat_date(creation_date)} {decode_fat_time(creation_time)}"
-            if creation_time_tenth > 0:
-                creation_datetime_str += f".{creation_time_tenth * 10:02d}"
-                
-            last_accessed_str = decode_fat_date(last_accessed_date)
-            last_modified_datetime_str = f"{decode_fat_date(last_modified_date)} {decode_fat_time(last_modified_time)}"
-                
-            # Derive file type from name
-            file_type = Path(display_name).suffix.upper().lstrip('.')
-
-            entries.append({
-                'name': display_name,
-                'short_name': short_name_83,
-                'raw_short_name': raw_short_name,
-                'size': size,
-                'cluster': entry_cluster,
-                'file_type': file_type,
-                'index': i,
-                'parent_cluster': cluster if cluster is not None else 0,
-                'is_read_only': bool(attr & 0x01),
-                'is_hidden': bool(attr & 0x02),
-                'is_system': bool(attr & 0x04),
-                'is_dir': bool(attr & 0x10),
-                'is_archive': bool(attr & 0x20),
-                'attributes': attr,
-                'nt_case_info': nt_case_info,
-                'creation_time': creation_time,
-                'creation_time_tenth': creation_time_tenth,
-                'creation_date': creation_date,
-                'creation_datetime_str': creation_datetime_str,
-                'last_accessed_date': last_accessed_date,
-                'last_accessed_str': last_accessed_str,
-                'last_modified_time': last_modified_time,
-                'last_modified_date': last_modified_date,
-                'last_modified_datetime_str': last_modified_datetime_str,
-            })
-            
-        # Reset LFN accumulator
+                # This is a continuation, append to the end
+                lfn_parts.append(text)
+            continue
+        
+        # Every entry but an LFN fragment ends the pending long name
+        # (deleted entries and volume labels included)
         lfn_parts = []
         lfn_checksum = None
     
     return entries
 
-def get_existing_83_names_in_directory(fs, cluster: int = None) -> List[str]:
+def directory_has_name(fs, cluster: int, name: str, exclude_index: int = None,
+                       fat_data: bytearray = None, raw_entries: List[tuple] = None) -> bool:
+    """
+    Checks whether a directory already holds an entry with the given name.
+
+    Names are compared case-insensitively against the same display name
+    read_directory() would report (the long name when its checksum matches,
+    otherwise the 8.3 name), but without building entry dictionaries, and
+    the scan stops at the first match.
+
+    Args:
+        fs: The FAT12Image filesystem object.
+        cluster: The starting cluster of the directory. If None or 0, the
+                 root directory is scanned.
+        name: The name to look for.
+        exclude_index: An entry index to ignore (the entry being renamed).
+        fat_data: An optional pre-read FAT to avoid re-reading.
+        raw_entries: Optional (index, data) pairs already read from this
+                     directory by iter_directory_entries().
+
+    Returns:
+        True if another entry already uses the name.
+    """
+    target = name.lower()
+    lfn_parts = []
+    lfn_checksum = None
+
+    if raw_entries is None:
+        raw_entries = iter_directory_entries(fs, cluster, fat_data)
+
+    for i, entry_data in raw_entries:
+        first = entry_data[0]
+        attr = entry_data[DIR_ATTR_OFFSET]
+
+        if first == 0x00:
+            break
+
+        if first != 0xE5 and not attr & 0x08:
+            if i != exclude_index:
+                display_name = None
+                if lfn_parts and lfn_checksum is not None and \
+                        calculate_lfn_checksum(entry_data[0:DIR_SHORT_NAME_LEN]) == lfn_checksum:
+                    display_name = ''.join(reversed(lfn_parts))
+                if not display_name:
+                    short, ext = decode_short_name(entry_data)
+                    if short and short[0] != '\x00':
+                        display_name = f"{short}.{ext}" if ext else short
+                if display_name and display_name.lower() == target:
+                    return True
+
+        elif attr == 0x0F and first != 0xE5:
+            text = decode_lfn_text(entry_data)
+            if text is None:
+                lfn_parts = []
+                lfn_checksum = None
+            elif first & 0x40:
+                lfn_parts = [text]
+                lfn_checksum = entry_data[LFN_CHECKSUM_OFFSET]
+            else:
+                lfn_parts.append(text)
+            continue
+
+        lfn_parts = []
+        lfn_checksum = None
+
+    return False
+
+def get_existing_83_names_in_directory(fs, cluster: int = None, fat_data: bytearray = None,
+                                       raw_entries: List[tuple] = None) -> FrozenSet[str]:
     """
-    Retrieves a list of all existing 8.3 short names from a directory.
+    Retrieves the set of all existing 8.3 short names in a directory.
 
     This is used for collision detection when generating new short names. It
     returns the raw 11-byte names, converted to uppercase, to ensure
@@ -253,33 +491,54 @@ def get_existing_83_names_in_directory(fs, cluster: int = None) -> List[str]:
         fs: The FAT12Image filesystem object.
         cluster: The starting cluster of the directory. If None or 0, the root
                  directory is scanned.
+        fat_data: An optional pre-read FAT to avoid re-reading.
+        raw_entries: Optional (index, data) pairs already read from this
+                     directory by iter_directory_entries().
 
     Returns:
-        A list of uppercase, 11-character 8.3 short names.
+        A frozenset of uppercase, 11-character 8.3 short names, so collision
+        checks during name generation are constant-time lookups.
     """
-    names = []
-    for _, entry_data in iter_directory_entries(fs, cluster):
+    # A set read from disk is kept until the image is next written to, so
+    # repeated predictions for the same directory skip the scan
+    cache_key = cluster or 0
+    use_cache = raw_entries is None and fat_data is None
+    if use_cache:
+        cached = fs._existing_names_cache.get(cache_key)
+        if cached is not None and cached[0] == fs._write_generation:
+            return cached[1]
+        generation = fs._write_generation
+    
+    if raw_entries is None:
+        raw_entries = iter_directory_entries(fs, cluster, fat_data)
+    
+    names = set()
+    for _, entry_data in raw_entries:
         if entry_data[0] in (0x00, 0xE5):
             continue
         attr = entry_data[DIR_ATTR_OFFSET]
         if attr == 0x0F or (attr & 0x08):
             continue
-        names.append(decode_raw_83_name(entry_data).upper())
+        names.add(decode_raw_83_name_upper(entry_data))
+    names = frozenset(names)
+    
+    if use_cache:
+        fs._existing_names_cache[cache_key] = (generation, names)
     return names
 
 def read_raw_directory_entries(fs):
     """Read all raw directory entries from disk"""
     raw_entries = []
-    with open(fs.image_path, 'rb') as f:
-        f.seek(fs.root_start)
-        for i in range(fs.root_entries):
-            entry_data = f.read(32)
-            raw_entries.append((i, entry_data))
-            if entry_data[0] == 0x00:  # End of directory
-                break
+    data = fs._pread(fs.root_entries * 32, fs.root_start)
+    for i in range(fs.root_entries):
+        entry_data = data[i * 32:(i + 1) * 32]
+        raw_entries.append((i, entry_data))
+        if entry_data[0] == 0x00:  # End of directory
+            break
     return raw_entries
 
-def find_free_directory_entries(fs, cluster: int = None, required_slots: int = 1) -> int:
+def find_free_directory_entries(fs, cluster: int = None, required_slots: int = 1,
+                                raw_entries: List[tuple] = None) -> int:
     """
     Finds a contiguous block of free directory entries.
 
@@ -294,45 +553,38 @@ def find_free_directory_entries(fs, cluster: int = None, required_slots: int = 1
         cluster: The starting cluster of the directory. If None or 0, searches
                  the root directory.
         required_slots: The number of contiguous 32-byte entries required.
+        raw_entries: Optional (index, data) pairs for the whole directory,
+                     already read by iter_directory_entries().
 
     Returns:
         The starting index of the found block of free entries.
         Raises FAT12Error if a sufficiently large block cannot be found or allocated
         (e.g., root directory is full, or the disk is out of free clusters).
     """
-    consecutive = 0
-    start_index = -1
-    
-    # First pass: find a block of 0xE5s or the start of 0x00s
-    first_free_at_end = -1
-    
     # We must iterate the whole directory to know its size for expansion calculations
-    all_entries = list(iter_directory_entries(fs, cluster))
+    if raw_entries is None:
+        raw_entries = list(iter_directory_entries(fs, cluster))
+    all_entries = raw_entries
     
-    for i, data in all_entries:
-        if data[0] == 0x00:
-            if first_free_at_end == -1:
-                first_free_at_end = i
-            # Don't break, we are just finding the start of the end block
-            
-        elif data[0] == 0xE5:
-            if first_free_at_end == -1: # Only count 0xE5s if before the 0x00 block
-                if consecutive == 0:
-                    start_index = i
-                consecutive += 1
-                if consecutive >= required_slots:
-                    return start_index # Found a suitable block of deleted entries
-            
-        else: # Used entry
-            consecutive = 0
-            start_index = -1
+    # Only the first byte of each slot matters; gather them into one bytes
+    # object and let find() do the run searches
+    markers = bytes(data[0] for _, data in all_entries)
+    
+    # Look for a block of 0xE5s before the start of the 0x00s
+    first_free_at_end = markers.find(b'\x00')
+    search_end = first_free_at_end if first_free_at_end != -1 else len(markers)
+    start_index = markers.find(b'\xE5' * required_slots, 0, search_end)
+    if start_index != -1:
+        return start_index # Found a suitable block of deleted entries
 
     # If we're here, no large-enough 0xE5 block was found.
     # Our best candidate is the free block at the end.
     if first_free_at_end != -1:
         start_index = first_free_at_end
-    elif start_index == -1: # Directory is completely full
-        start_index = len(all_entries)
+    else:
+        # No 0x00 block: a run of deleted slots at the very end can still be
+        # extended, otherwise the directory is completely full
+        start_index = len(markers.rstrip(b'\xE5'))
 
     total_allocated_slots = len(all_entries)
     available_slots = total_allocated_slots - start_index
@@ -372,13 +624,22 @@ def find_free_directory_entries(fs, cluster: int = None, required_slots: int = 1
         
     logger.info(f"Expanding directory (cluster {cluster}) by {len(free_clusters)} clusters: {free_clusters}")
 
+    runs = [] # [first_cluster, count] for clusters adjacent on disk
     for new_cluster in free_clusters:
         fs.set_fat_entry(fat_data, curr, new_cluster)
         fs.set_fat_entry(fat_data, new_cluster, 0xFFF)
         curr = new_cluster
         
-        # Zero out the new cluster
-        fs.zero_out_cluster(new_cluster)
+        if runs and runs[-1][0] + runs[-1][1] == new_cluster:
+            runs[-1][1] += 1
+        else:
+            runs.append([new_cluster, 1])
+    
+    # Zero out the new clusters, one write per run; write_fat() syncs them
+    # together with the extended chain
+    for first, count in runs:
+        offset = fs.data_start + ((first - 2) * fs.bytes_per_cluster)
+        fs._pwrite(bytes(count * fs.bytes_per_cluster), offset)
             
     fs.write_fat(fat_data)
     
@@ -389,29 +650,48 @@ def find_free_root_entries(fs, required_slots: int) -> int:
     Find a contiguous block of free root directory entries.
     Returns the starting index, or -1 if no space is found.
     """
-    with open(fs.image_path, 'rb') as f:
-        f.seek(fs.root_start)
-        consecutive = 0
-        start_index = -1
-
-        for i in range(fs.root_entries):
-            data = f.read(32)
-            # Check for End of Dir (0x00) or Deleted (0xE5)
-            if data[0] == 0x00 or data[0] == 0xE5:
-                if consecutive == 0:
-                    start_index = i
-                consecutive += 1
-
-                if consecutive >= required_slots:
-                    return start_index
-            else:
-                # Reset counter if we hit an occupied slot
-                consecutive = 0
-                start_index = -1
+    # Only the first byte of each entry matters here. Map End of Dir (0x00)
+    # and Deleted (0xE5) slots to 1 and search for a long enough run of them.
+    markers = fs._pread(fs.root_entries * 32, fs.root_start)[0::32]
+    free_map = markers.translate(_FREE_SLOT_TABLE)
+    return free_map.find(b'\x01' * required_slots)
+
+def get_directory_clusters(fs, cluster: int, fat_data: bytearray = None) -> List[int]:
+    """
+    Lists the clusters of a subdirectory in chain order.
+
+    Callers that locate many entries of the same directory build this once
+    and pass it to get_entry_offset(), instead of walking the chain from the
+    head for every entry.
+
+    Args:
+        fs: The FAT12Image filesystem object.
+        cluster: The starting cluster of the directory.
+        fat_data: An optional pre-read FAT to avoid re-reading.
 
-    return -1
+    Returns:
+        The directory's cluster numbers, first cluster first.
 
-def get_entry_offset(fs, parent_cluster: int, index: int, fat_data: bytearray = None) -> int:
+    Raises:
+        FAT12CorruptionError: If the chain loops.
+    """
+    if fat_data is None:
+        fat_data = fs.read_fat()
+    
+    clusters = []
+    visited = set()
+    current_cluster = cluster
+    while 2 <= current_cluster < 0xFF8:
+        if current_cluster in visited:
+            logger.error(f"Loop detected in directory cluster chain at {current_cluster}")
+            raise FAT12CorruptionError(f"Loop detected in directory cluster chain at {current_cluster}")
+        visited.add(current_cluster)
+        clusters.append(current_cluster)
+        current_cluster = fs.get_fat_entry(fat_data, current_cluster)
+    return clusters
+
+def get_entry_offset(fs, parent_cluster: int, index: int, fat_data: bytearray = None,
+                     clusters: List[int] = None) -> int:
     """
     Calculates the absolute physical byte offset of a directory entry in the image.
 
@@ -425,6 +705,8 @@ def get_entry_offset(fs, parent_cluster: int, index: int, fat_data: bytearray =
                         If None or 0, assumes the root directory.
         index: The sequential index of the entry within the directory listing.
         fat_data: An optional pre-read FAT to avoid re-reading.
+        clusters: An optional cluster list from get_directory_clusters(); the
+                  entry's cluster is then looked up instead of walked to.
 
     Returns:
         The absolute byte offset of the entry from the start of the disk image.
@@ -435,13 +717,19 @@ def get_entry_offset(fs, parent_cluster: int, index: int, fat_data: bytearray =
     if parent_cluster is None or parent_cluster == 0:
         return fs.root_start + (index * 32)
     
-    if fat_data is None:
-        fat_data = fs.read_fat()
-        
     entries_per_cluster = fs.bytes_per_cluster // 32
     cluster_skip = index // entries_per_cluster
     entry_offset = index % entries_per_cluster
     
+    if clusters is not None:
+        if cluster_skip >= len(clusters):
+            logger.error(f"Directory cluster chain broken at index {index} (expected more clusters)")
+            raise FAT12CorruptionError(f"Directory cluster chain broken at index {index}")
+        return fs.data_start + ((clusters[cluster_skip] - 2) * fs.bytes_per_cluster) + (entry_offset * 32)
+    
+    if fat_data is None:
+        fat_data = fs.read_fat()
+    
     curr = parent_cluster
     for _ in range(cluster_skip):
         curr = fs.get_fat_entry(fat_data, curr)
@@ -451,8 +739,87 @@ def get_entry_offset(fs, parent_cluster: int, index: int, fat_data: bytearray =
         
     return fs.data_start + ((curr - 2) * fs.bytes_per_cluster) + (entry_offset * 32)
 
+def make_entry_offset_fn(fs, parent_cluster: int, fat_data: bytearray = None,
+                         clusters: List[int] = None) -> Callable[[int], int]:
+    """
+    Builds a function mapping entry indices of one directory to byte offsets.
+
+    The subdirectory chain is walked once and each cluster's offset kept, so
+    every lookup is constant time. Use it where many entries of the same
+    directory are located; it goes stale if the directory grows.
+
+    Args:
+        fs: The FAT12Image filesystem object.
+        parent_cluster: The starting cluster of the directory.
+                        If None or 0, assumes the root directory.
+        fat_data: An optional pre-read FAT to avoid re-reading.
+        clusters: An optional cluster list from get_directory_clusters().
+
+    Returns:
+        A function taking an entry index and returning the same offset as
+        get_entry_offset(), raising FAT12CorruptionError past the chain's end.
+    """
+    if parent_cluster is None or parent_cluster == 0:
+        root_start = fs.root_start
+        return lambda index: root_start + index * 32
+
+    if clusters is None:
+        clusters = get_directory_clusters(fs, parent_cluster, fat_data)
+    entries_per_cluster = fs.bytes_per_cluster // 32
+    cluster_offsets = [fs.data_start + (cluster - 2) * fs.bytes_per_cluster
+                       for cluster in clusters]
+
+    def entry_offset(index: int) -> int:
+        cluster_skip, slot = divmod(index, entries_per_cluster)
+        if cluster_skip >= len(cluster_offsets):
+            logger.error(f"Directory cluster chain broken at index {index} (expected more clusters)")
+            raise FAT12CorruptionError(f"Directory cluster chain broken at index {index}")
+        return cluster_offsets[cluster_skip] + slot * 32
+    return entry_offset
+
+def _slot_runs(entry_offset: Callable[[int], int], indices) -> List[list]:
+    """
+    Groups ascending directory slot indices into runs that are adjacent on disk.
+
+    Args:
+        entry_offset: A function from make_entry_offset_fn() for the directory.
+        indices: The slot indices, in ascending order.
+
+    Returns:
+        A list of [offset, [indices]] pairs, one per run.
+    """
+    runs = []
+    for i in indices:
+        offset = entry_offset(i)
+        if runs and runs[-1][0] + len(runs[-1][1]) * 32 == offset:
+            runs[-1][1].append(i)
+        else:
+            runs.append([offset, [i]])
+    return runs
+
+def _read_slots(fs, entry_offset: Callable[[int], int], start: int, stop: int) -> bytearray:
+    """
+    Reads directory slots start to stop - 1 into one buffer, with one read
+    per run of slots adjacent on disk.
+
+    Args:
+        fs: The FAT12Image filesystem object.
+        entry_offset: A function from make_entry_offset_fn() for the directory.
+        start: The index of the first slot.
+        stop: The index after the last slot.
+
+    Returns:
+        The slots' raw 32-byte entries, in index order.
+    """
+    buf = bytearray((stop - start) * 32)
+    view = memoryview(buf)
+    for offset, indices in _slot_runs(entry_offset, range(start, stop)):
+        fs._preadinto(view[:len(indices) * 32], offset)
+        view = view[len(indices) * 32:]
+    return buf
+
 def write_directory_entries(fs, parent_cluster: int, entry_index: int,
-                            lfn_entries: List[bytes], short_entry: bytes):
+                            lfn_entries: List[bytes], short_entry: bytes, sync: bool = False):
     """
     Writes a sequence of LFN entries and one short entry to the disk.
 
@@ -467,60 +834,60 @@ def write_directory_entries(fs, parent_cluster: int, entry_index: int,
         entry_index: The starting index in the directory to begin writing.
         lfn_entries: A list of raw 32-byte LFN entries to write.
         short_entry: The raw 32-byte short file name entry to write.
+        sync: If True, fsync before returning. By default the fsync is left
+              to the enclosing operation's fs.sync().
     """
-    with open(fs.image_path, 'r+b') as f:
-        if parent_cluster is None or parent_cluster == 0:
-            # Root directory
-            base_offset = fs.root_start
-            for i, lfn_entry in enumerate(lfn_entries):
-                f.seek(base_offset + ((entry_index + i) * 32))
-                f.write(lfn_entry)
-            
-            short_entry_index = entry_index + len(lfn_entries)
-            f.seek(base_offset + (short_entry_index * 32))
-            f.write(short_entry)
-            f.flush()
-            os.fsync(f.fileno())
-        else:
-            # Subdirectory - handle cluster chain
-            current_cluster = parent_cluster
-            entries_per_cluster = fs.bytes_per_cluster // 32
-            
-            # Calculate start position
-            start_cluster_idx = entry_index // entries_per_cluster
-            start_offset_in_cluster = entry_index % entries_per_cluster
-            
-            # Navigate to the correct cluster
-            fat_data = fs.read_fat()
-            for _ in range(start_cluster_idx):
+    # Entries are adjacent within a cluster (and throughout the root), so
+    # each contiguous stretch goes out as one write
+    all_entries = b''.join(lfn_entries) + bytes(short_entry)
+    
+    if parent_cluster is None or parent_cluster == 0:
+        # Root directory
+        fs._pwrite(all_entries, fs.root_start + (entry_index * 32))
+    else:
+        # Subdirectory - handle cluster chain
+        current_cluster = parent_cluster
+        entries_per_cluster = fs.bytes_per_cluster // 32
+        
+        # Calculate start position
+        start_cluster_idx = entry_index // entries_per_cluster
+        start_offset_in_cluster = entry_index % entries_per_cluster
+        
+        # Navigate to the correct cluster
+        fat_data = fs.read_fat()
+        for _ in range(start_cluster_idx):
+            current_cluster = fs.get_fat_entry(fat_data, current_cluster)
+            if current_cluster >= 0xFF8:
+                logger.error(f"Broken directory chain while writing at index {entry_index}")
+                raise FAT12CorruptionError(f"Broken directory chain while writing at index {entry_index}")
+        
+        # Write as many entries as fit in each cluster, moving along the chain
+        # for the rest. `idx_in_cluster` is where the next write starts.
+        idx_in_cluster = start_offset_in_cluster
+        written = 0
+        total = len(all_entries) // 32
+        
+        while written < total:
+            if idx_in_cluster >= entries_per_cluster:
                 current_cluster = fs.get_fat_entry(fat_data, current_cluster)
                 if current_cluster >= 0xFF8:
-                    logger.error(f"Broken directory chain while writing at index {entry_index}")
-                    raise FAT12CorruptionError(f"Broken directory chain while writing at index {entry_index}")
+                    logger.error(f"Broken directory chain while writing entry part {written}")
+                    raise FAT12CorruptionError(f"Broken directory chain while writing entry part {written}")
+                idx_in_cluster = 0 # Reset index for new cluster
             
-            # Write entries
-            all_entries = lfn_entries + [short_entry]
+            count = min(entries_per_cluster - idx_in_cluster, total - written)
+            cluster_offset = fs.data_start + ((current_cluster - 2) * fs.bytes_per_cluster)
+            fs._pwrite(all_entries[written * 32:(written + count) * 32],
+                       cluster_offset + (idx_in_cluster * 32))
+            idx_in_cluster += count
+            written += count
+    
+    if sync:
+        fs._sync()
+    else:
+        fs._mark_dirty()
 
-            # This is the index within the current cluster we are writing to.
-            # It starts at `start_offset_in_cluster` and increments.
-            idx_in_cluster = start_offset_in_cluster
-            
-            for i, entry_data in enumerate(all_entries):
-                if idx_in_cluster >= entries_per_cluster:
-                    current_cluster = fs.get_fat_entry(fat_data, current_cluster)
-                    if current_cluster >= 0xFF8:
-                        logger.error(f"Broken directory chain while writing entry part {i}")
-                        raise FAT12CorruptionError(f"Broken directory chain while writing entry part {i}")
-                    idx_in_cluster = 0 # Reset index for new cluster
-                
-                cluster_offset = fs.data_start + ((current_cluster - 2) * fs.bytes_per_cluster)
-                f.seek(cluster_offset + (idx_in_cluster * 32))
-                f.write(entry_data)
-                idx_in_cluster += 1
-            f.flush()
-            os.fsync(f.fileno())
-
-def initialize_directory(fs, dir_cluster: int, parent_cluster: int = None):
+def initialize_directory(fs, dir_cluster: int, parent_cluster: int = None, sync: bool = False):
     """
     Initializes a new directory cluster with the special '.' and '..' entries.
 
@@ -534,45 +901,33 @@ def initialize_directory(fs, dir_cluster: int, parent_cluster: int = None):
         dir_cluster: The cluster number of the new directory to initialize.
         parent_cluster: The cluster number of the parent directory.
                         If None or 0, the parent is the root directory.
+        sync: If True, fsync before returning. By default the fsync is left
+              to the enclosing operation's fs.sync().
     """
     now = datetime.datetime.now()
     creation_time = encode_fat_time(now)
     creation_date = encode_fat_date(now)
     
+    # Build the whole cluster in one zeroed buffer and pack both entries into it
+    cluster_data = bytearray(fs.bytes_per_cluster)
+    
     # Create . entry
-    dot_entry = bytearray(32)
-    dot_entry[0:DIR_SHORT_NAME_LEN] = b'.          '
-    dot_entry[DIR_ATTR_OFFSET] = 0x10
-    dot_entry[14:16] = struct.pack('<H', creation_time)
-    dot_entry[16:18] = struct.pack('<H', creation_date)
-    dot_entry[18:20] = struct.pack('<H', creation_date)
-    dot_entry[DIR_LAST_MOD_TIME_OFFSET:DIR_LAST_MOD_TIME_OFFSET+2] = struct.pack('<H', creation_time)
-    dot_entry[24:26] = struct.pack('<H', creation_date)
-    dot_entry[26:28] = struct.pack('<H', dir_cluster)
-    dot_entry[28:32] = struct.pack('<I', 0)
+    _DIR_ENTRY_STRUCT.pack_into(
+        cluster_data, 0, b'.          ', 0x10, 0, 0, creation_time, creation_date,
+        creation_date, 0, creation_time, creation_date, dir_cluster, 0)
     
     # Create .. entry
-    dotdot_entry = bytearray(32)
-    dotdot_entry[0:DIR_SHORT_NAME_LEN] = b'..         '
-    dotdot_entry[DIR_ATTR_OFFSET] = 0x10
-    dotdot_entry[14:16] = struct.pack('<H', creation_time)
-    dotdot_entry[16:18] = struct.pack('<H', creation_date)
-    dotdot_entry[18:20] = struct.pack('<H', creation_date)
-    dotdot_entry[DIR_LAST_MOD_TIME_OFFSET:DIR_LAST_MOD_TIME_OFFSET+2] = struct.pack('<H', creation_time)
-    dotdot_entry[24:26] = struct.pack('<H', creation_date)
     parent_clus = parent_cluster if parent_cluster is not None else 0
-    dotdot_entry[26:28] = struct.pack('<H', parent_clus)
-    dotdot_entry[28:32] = struct.pack('<I', 0)
-    
-    with open(fs.image_path, 'r+b') as f:
-        cluster_offset = fs.data_start + ((dir_cluster - 2) * fs.bytes_per_cluster)
-        f.seek(cluster_offset)
-        f.write(dot_entry)
-        f.write(dotdot_entry)
-        remaining = fs.bytes_per_cluster - 64
-        f.write(b'\x00' * remaining)
-        f.flush()
-        os.fsync(f.fileno())
+    _DIR_ENTRY_STRUCT.pack_into(
+        cluster_data, 32, b'..         ', 0x10, 0, 0, creation_time, creation_date,
+        creation_date, 0, creation_time, creation_date, parent_clus, 0)
+    
+    cluster_offset = fs.data_start + ((dir_cluster - 2) * fs.bytes_per_cluster)
+    fs._pwrite(cluster_data, cluster_offset)
+    if sync:
+        fs._sync()
+    else:
+        fs._mark_dirty()
 
 def create_directory(fs, dir_name: str, parent_cluster: int = None, use_numeric_tail: bool = True):
     """
@@ -596,13 +951,16 @@ def create_directory(fs, dir_name: str, parent_cluster: int = None, use_numeric_
     Raises:
         FAT12Error: If directory exists, disk is full, or other FS errors.
     """
+    # Read the parent directory once; the collision check, short name
+    # generation and free slot search all work from the same entries
+    raw_entries = list(iter_directory_entries(fs, parent_cluster))
+
     # Check for LFN collision
-    entries = read_directory(fs, parent_cluster)
-    if any(e['name'].lower() == dir_name.lower() for e in entries):
+    if directory_has_name(fs, parent_cluster, dir_name, raw_entries=raw_entries):
         logger.warning(f"Directory creation failed: '{dir_name}' already exists")
         raise FAT12Error(f"Directory '{dir_name}' already exists")
 
-    existing_names = get_existing_83_names_in_directory(fs, parent_cluster)
+    existing_names = get_existing_83_names_in_directory(fs, parent_cluster, raw_entries=raw_entries)
     short_name_83 = generate_83_name(dir_name, existing_names, use_numeric_tail)
     short_name_bytes = short_name_83.encode('ascii')[:DIR_SHORT_NAME_LEN]
     
@@ -621,21 +979,21 @@ def create_directory(fs, dir_name: str, parent_cluster: int = None, use_numeric_
         raise FAT12Error("Disk full (no free clusters)")
     dir_cluster = free_clusters[0]
     
-    entry_index = find_free_directory_entries(fs, parent_cluster, total_entries)
+    entry_index = find_free_directory_entries(fs, parent_cluster, total_entries, raw_entries)
         
     fat_data = fs.read_fat()
     fs.set_fat_entry(fat_data, dir_cluster, 0xFFF)
     fs.write_fat(fat_data)
     
-    entry = bytearray(32)
-    entry[0:11] = short_name_bytes
-    entry[DIR_ATTR_OFFSET] = 0x10
-    entry[26:28] = struct.pack('<H', dir_cluster)
+    # Directory entry: name, directory attribute and starting cluster
+    entry = _DIR_ENTRY_STRUCT.pack(short_name_bytes, 0x10, 0, 0, 0, 0, 0, 0, 0, 0, dir_cluster, 0)
     
     write_directory_entries(fs, parent_cluster, entry_index, lfn_entries, entry)
     initialize_directory(fs, dir_cluster, parent_cluster)
+    fs.sync()
 
-def delete_directory_entry(fs, parent_cluster: int, entry_index: int):
+def delete_directory_entry(fs, parent_cluster: int, entry_index: int, fat_data: bytearray = None,
+                           clusters: List[int] = None, sync: bool = False):
     """
     Marks a directory entry and its associated LFN entries as deleted.
 
@@ -647,44 +1005,82 @@ def delete_directory_entry(fs, parent_cluster: int, entry_index: int):
         fs: The FAT12Image filesystem object.
         parent_cluster: The cluster of the directory containing the entry.
         entry_index: The index of the short filename entry to delete.
+        fat_data: An optional pre-read FAT to avoid re-reading.
+        clusters: An optional cluster list of the parent directory from
+                  get_directory_clusters().
+        sync: If True, fsync before returning. By default the fsync is left
+              to the enclosing operation's fs.sync().
 
     Raises:
         FAT12Error: If the entry cannot be found or written.
     """
-    # Only read FAT if we are in a subdirectory
-    fat_data = None
-    if parent_cluster is not None and parent_cluster != 0:
-        fat_data = fs.read_fat()
-        
-    with open(fs.image_path, 'r+b') as f:
-        # Mark the short entry as deleted
-        offset = get_entry_offset(fs, parent_cluster, entry_index, fat_data)
-        f.seek(offset)
-        f.write(b'\xE5')
-        
-        # Look backwards for LFN entries
-        index = entry_index - 1
-        while index >= 0:
-            offset = get_entry_offset(fs, parent_cluster, index, fat_data)
-            f.seek(offset)
-            entry_data = f.read(32)
-            
-            if entry_data and entry_data[DIR_ATTR_OFFSET] == 0x0F:
-                f.seek(offset)
-                f.write(b'\xE5')
-                index -= 1
-            else:
-                break
-        
-        f.flush()
-        os.fsync(f.fileno())
+    # Only walk the FAT if we are in a subdirectory; each slot is then
+    # located directly
+    entry_offset = make_entry_offset_fn(fs, parent_cluster, fat_data, clusters)
+
+    # Read the entry with the slots its LFN entries can occupy in one pass,
+    # then count the LFN attributes (0x0F) right before it
+    window_start = max(0, entry_index - _MAX_LFN_SLOTS)
+    window = _read_slots(fs, entry_offset, window_start, entry_index + 1)
+    attrs = window[DIR_ATTR_OFFSET:-32:32]
+    first_index = entry_index - (len(attrs) - len(attrs.rstrip(b'\x0F')))
+
+    # Mark the short entry and its LFN entries as deleted, one write per run
+    for offset, indices in _slot_runs(entry_offset, range(first_index, entry_index + 1)):
+        start = (indices[0] - window_start) * 32
+        run = window[start:start + len(indices) * 32]
+        run[0::32] = b'\xE5' * len(indices)
+        fs._pwrite(run, offset)
+
+    if sync:
+        fs._sync()
+    else:
+        fs._mark_dirty()
+
+def delete_directory_entries(fs, parent_cluster: int, start_index: int, count: int,
+                             sync: bool = False):
+    """
+    Marks a run of consecutive directory slots as deleted.
 
-def free_cluster_chain(fs, start_cluster: int):
-    """Frees a chain of clusters starting from start_cluster."""
+    Unlike delete_directory_entry(), this does not look for LFN entries
+    belonging to the run; it is meant for releasing slots that were reserved
+    but never filled. Slots that are contiguous on disk are overwritten with
+    a single write.
+
+    Args:
+        fs: The FAT12Image filesystem object.
+        parent_cluster: The cluster of the directory containing the slots.
+        start_index: The index of the first slot.
+        count: The number of slots to mark as deleted.
+        sync: If True, fsync before returning. By default the fsync is left
+              to the enclosing operation's fs.sync().
+    """
+    if count <= 0:
+        return
+
+    entry_offset = make_entry_offset_fn(fs, parent_cluster)
+    for offset, indices in _slot_runs(entry_offset, range(start_index, start_index + count)):
+        marker = bytearray(len(indices) * 32)
+        marker[0::32] = b'\xE5' * len(indices)
+        fs._pwrite(marker, offset)
+    if sync:
+        fs._sync()
+    else:
+        fs._mark_dirty()
+
+def free_cluster_chain(fs, start_cluster: int, fat_data: bytearray = None):
+    """
+    Frees a chain of clusters starting from start_cluster.
+
+    If fat_data is given, the chain is freed in that FAT and writing it back
+    is left to the caller; otherwise the FAT is read and written here.
+    """
     if start_cluster < 2:
         return
         
-    fat_data = fs.read_fat()
+    write_back = fat_data is None
+    if write_back:
+        fat_data = fs.read_fat()
     current_cluster = start_cluster
     visited = set()
     
@@ -698,9 +1094,11 @@ def free_cluster_chain(fs, start_cluster: int):
         fs.set_fat_entry(fat_data, current_cluster, 0)
         current_cluster = next_cluster
     
-    fs.write_fat(fat_data)
+    if write_back:
+        fs.write_fat(fat_data)
 
-def delete_directory(fs, entry: dict, recursive: bool = False):
+def delete_directory(fs, entry: dict, recursive: bool = False, fat_data: bytearray = None,
+                     parent_clusters: List[int] = None):
     """
     Deletes a directory.
 
@@ -714,6 +1112,11 @@ def delete_directory(fs, entry: dict, recursive: bool = False):
         entry: The dictionary representing the directory to delete.
         recursive: If True, allows deletion of non-empty directories by
                    deleting their contents first.
+        fat_data: FAT being updated by an enclosing recursive delete. The
+                  outermost call reads the FAT once, frees every chain in it
+                  and writes it back once at the end.
+        parent_clusters: Cluster list of the containing directory, passed
+                         down by an enclosing recursive delete.
 
     Raises:
         FAT12Error: If directory is not empty (and recursive=False) or other FS errors.
@@ -722,8 +1125,12 @@ def delete_directory(fs, entry: dict, recursive: bool = False):
     if not entry.get('is_dir', False):
         raise FAT12Error(f"Entry '{entry.get('name')}' is not a directory")
     
+    outermost = fat_data is None
+    if outermost:
+        fat_data = fs.read_fat()
+    
     # Read directory contents (skip . and ..)
-    dir_entries = read_directory(fs, entry['cluster'])
+    dir_entries = read_directory(fs, entry['cluster'], fat_data)
     real_entries = [e for e in dir_entries if e['name'] not in ('.', '..')]
     
     # Check if directory is empty
@@ -731,24 +1138,44 @@ def delete_directory(fs, entry: dict, recursive: bool = False):
         logger.warning(f"Refusing to delete non-empty directory '{entry['name']}' (recursive=False)")
         raise FAT12Error(f"Directory '{entry['name']}' is not empty")
     
-    # If recursive, delete all contents first
-    if recursive and len(real_entries) > 0:
-        for sub_entry in real_entries:
-            if sub_entry['is_dir']:
-                delete_directory(fs, sub_entry, recursive=True)
-            else:
-                delete_entry(fs, sub_entry)
-    
-    # Delete the directory entry itself and free clusters
-    delete_entry(fs, entry)
+    try:
+        # If recursive, delete all contents first. The directory's chain is
+        # walked once and shared by every child's entry deletion.
+        if recursive and len(real_entries) > 0:
+            clusters = get_directory_clusters(fs, entry['cluster'], fat_data)
+            for sub_entry in real_entries:
+                if sub_entry['is_dir']:
+                    delete_directory(fs, sub_entry, recursive=True, fat_data=fat_data,
+                                     parent_clusters=clusters)
+                else:
+                    delete_entry(fs, sub_entry, fat_data, clusters)
+
+        # Delete the directory entry itself and free clusters
+        delete_entry(fs, entry, fat_data, parent_clusters)
+    finally:
+        # Entries are marked deleted on disk as the walk goes; write the
+        # clusters freed so far even if it stops partway, so none leak
+        if outermost:
+            fs.write_fat(fat_data)
+            fs.sync()
+
+def delete_entry(fs, entry: dict, fat_data: bytearray = None, parent_clusters: List[int] = None):
+    """
+    Delete a directory entry (file or directory) and free its clusters.
 
-def delete_entry(fs, entry: dict):
-    """Delete a directory entry (file or directory) and free its clusters"""
+    If fat_data is given, the clusters are freed in it and the caller writes
+    it back; otherwise the FAT is updated on disk here. parent_clusters is an
+    optional cluster list of the containing directory.
+    """
     # Mark entry as deleted
-    delete_directory_entry(fs, entry.get('parent_cluster'), entry['index'])
+    delete_directory_entry(fs, entry.get('parent_cluster'), entry['index'], fat_data,
+                           parent_clusters)
     
     # Free clusters in FAT
-    free_cluster_chain(fs, entry['cluster'])
+    free_cluster_chain(fs, entry['cluster'], fat_data)
+    
+    if fat_data is None:
+        fs.sync()
 
 def rename_entry(fs, entry: dict, new_name: str, use_numeric_tail: bool = False):
     """
@@ -778,28 +1205,29 @@ def rename_entry(fs, entry: dict, new_name: str, use_numeric_tail: bool = False)
     parent_cluster = None if parent_cluster == 0 else parent_cluster
     
     # Check for LFN collision with other files
-    entries = read_directory(fs, parent_cluster)
-    if any(e['name'].lower() == new_name.lower() and e['index'] != entry['index'] for e in entries):
+    if directory_has_name(fs, parent_cluster, new_name, exclude_index=entry['index']):
         logger.warning(f"Rename failed: '{new_name}' already exists")
         raise FAT12Error(f"Entry '{new_name}' already exists")
         
     existing_names = get_existing_83_names_in_directory(fs, parent_cluster)
+    # Walk a subdirectory's chain once; every slot is then located directly
+    entry_offset = make_entry_offset_fn(fs, parent_cluster)
 
-    with open(fs.image_path, 'rb') as f:
-        f.seek(get_entry_offset(fs, parent_cluster, entry['index']))
-        current_raw = f.read(DIR_SHORT_NAME_LEN)
-        current_name_11 = decode_raw_83_name(current_raw).upper()
+    # Every read and write below goes through fs's positional I/O on its
+    # open descriptor, so the image is never reopened and nothing seeks.
 
-    if current_name_11 in existing_names:
-        existing_names.remove(current_name_11)
+    # Read original metadata (Cluster, Size, Dates) to preserve it. The
+    # entry's own 8.3 name may be reused, so it is not a collision.
+    original_entry_data = bytearray(32)
+    fs._preadinto(original_entry_data, entry_offset(entry['index']))
+    existing_names = existing_names - {decode_raw_83_name_upper(original_entry_data)}
 
     # Generate and format new 8.3 name (11 bytes raw)
     short_name_11 = generate_83_name(new_name, existing_names, use_numeric_tail)
-    
-    try:
-        raw_short_name = short_name_11.encode('ascii')[:DIR_SHORT_NAME_LEN]
-    except UnicodeEncodeError:
-        raw_short_name = short_name_11.encode('ascii', 'ignore').ljust(DIR_SHORT_NAME_LEN, b' ')[:DIR_SHORT_NAME_LEN]
+
+    # generate_83_name yields 11 ASCII characters; should anything else get
+    # through it is dropped and the field padded back to 11 bytes
+    raw_short_name = short_name_11.encode('ascii', 'ignore')[:DIR_SHORT_NAME_LEN].ljust(DIR_SHORT_NAME_LEN, b' ')
 
     # Generate LFN entries if needed
     base = short_name_11[:8].strip()
@@ -813,30 +1241,27 @@ def rename_entry(fs, entry: dict, new_name: str, use_numeric_tail: bool = False)
 
     total_new_slots = len(new_lfn_entries) + 1
 
-    # Analyze Current Location
-    old_lfn_indices = []
-    idx = entry['index'] - 1
-    fat_data = fs.read_fat()
-    
-    with open(fs.image_path, 'rb') as f:
-        while idx >= 0:
-            offset = get_entry_offset(fs, parent_cluster, idx, fat_data)
-            f.seek(offset)
-            data = f.read(32)
-            if data[DIR_ATTR_OFFSET] == 0x0F: # Attribute 0x0F is LFN
-                old_lfn_indices.append(idx)
-                idx -= 1
-            else:
-                break
+    # Fast path: a plain 8.3 name replacing one with no LFN slots only
+    # changes the 11 name bytes of the entry itself
+    if not needs_lfn and (entry['index'] == 0 or fs._pread(
+            1, entry_offset(entry['index'] - 1) + DIR_ATTR_OFFSET)[0] != 0x0F):
+        logger.debug(f"Rename '{entry['name']}' -> '{new_name}': Short name only")
+        fs._pwrite(raw_short_name, entry_offset(entry['index']))
+        fs._sync()
+        return
 
-    current_start_index = old_lfn_indices[-1] if old_lfn_indices else entry['index']
-    total_old_slots = len(old_lfn_indices) + 1
+    # Analyze Current Location: the entry's LFN slots sit right before
+    # it, so read that window in one go and count the LFN attributes (0x0F)
+    # at its end
+    window_start = max(0, entry['index'] - _MAX_LFN_SLOTS)
+    window = _read_slots(fs, entry_offset, window_start, entry['index'])
+
+    attrs = window[DIR_ATTR_OFFSET::32]
+    old_lfn_count = len(attrs) - len(attrs.rstrip(b'\x0F'))
+
+    current_start_index = entry['index'] - old_lfn_count
+    total_old_slots = old_lfn_count + 1
 
-    # Read original metadata (Cluster, Size, Dates) to preserve it
-    with open(fs.image_path, 'rb') as f:
-        f.seek(get_entry_offset(fs, parent_cluster, entry['index'], fat_data))
-        original_entry_data = bytearray(f.read(32))
-    
     # Determine Write Location
     write_start_index = -1
     slots_to_delete = []
@@ -855,34 +1280,34 @@ def rename_entry(fs, entry: dict, new_name: str, use_numeric_tail: bool = False)
         # We are moving, so delete ALL old slots
         slots_to_delete = range(current_start_index, current_start_index + total_old_slots)
 
-    # Execute Write
-    with open(fs.image_path, 'r+b') as f:
-        # Mark old/unused slots as deleted (0xE5)
-        for i in slots_to_delete:
-            offset = get_entry_offset(fs, parent_cluster, i, fat_data)
-            f.seek(offset)
-            f.write(b'\xE5')
-        f.flush()
-        os.fsync(f.fileno())
-
-        # Write New LFN Entries
-        for i, lfn_data in enumerate(new_lfn_entries):
-            offset = get_entry_offset(fs, parent_cluster, write_start_index + i, fat_data)
-            f.seek(offset)
-            f.write(lfn_data)
-        f.flush()
-        os.fsync(f.fileno())
-
-        # Write New Short Entry
-        new_short_entry = original_entry_data
-        new_short_entry[0:DIR_SHORT_NAME_LEN] = raw_short_name # Update 8.3 name
-
-        short_entry_idx = write_start_index + len(new_lfn_entries)
-        offset = get_entry_offset(fs, parent_cluster, short_entry_idx, fat_data)
-        f.seek(offset)
-        f.write(new_short_entry)
-        f.flush()
-        os.fsync(f.fileno())
+        # Finding room may have expanded the directory
+        if parent_cluster:
+            entry_offset = make_entry_offset_fn(fs, parent_cluster)
+
+    # Stage the new LFN entries and the short entry by directory index
+    new_short_entry = original_entry_data
+    new_short_entry[0:DIR_SHORT_NAME_LEN] = raw_short_name # Update 8.3 name
+    short_entry_idx = write_start_index + len(new_lfn_entries)
+    new_slots = dict(enumerate(new_lfn_entries + [new_short_entry], write_start_index))
+
+    # Group every touched slot into runs that are adjacent on disk
+    runs = _slot_runs(entry_offset, sorted(set(slots_to_delete) | new_slots.keys()))
+    # The run holding the short entry goes last; it is what makes the new
+    # name visible
+    runs.sort(key=lambda run: short_entry_idx in run[1])
+
+    # Execute Write: each run is read, patched in memory and written back
+    # whole, and a single fsync covers the rename
+    for offset, indices in runs:
+        buf = bytearray(len(indices) * 32)
+        fs._preadinto(buf, offset)
+        for k, i in enumerate(indices):
+            if i in new_slots:
+                buf[k * 32:(k + 1) * 32] = new_slots[i]
+            else:
+                buf[k * 32] = 0xE5 # Mark old/unused slot as deleted
+        fs._pwrite(buf, offset)
+    fs._sync()
 
 def predict_short_name(fs, long_name: str, use_numeric_tail: bool = False, parent_cluster: int = None) -> str:
     """
@@ -905,24 +1330,36 @@ def predict_short_name(fs, long_name: str, use_numeric_tail: bool = False, paren
     return generate_83_name(long_name, existing_names, use_numeric_tail)
 
 def find_entry_by_83_name(fs, target_83_name: str) -> Optional[dict]:
-    """Find a directory entry by its 11-character 8.3 name (no dot)"""
+    """
+    Find a root directory entry by its 11-character 8.3 name (no dot).
+
+    The root is indexed by name on first use and the index is reused until
+    the image is written to again. Each call returns its own copy of the
+    entry, so callers may modify it without touching the index.
+    """
     # target_83_name should be 11 chars, space padded, uppercase
     target = target_83_name.upper().ljust(11)[:11]
     
-    entries = read_directory(fs, None)
-    for entry in entries:
-        # Compare against the raw 11-byte name stored in the entry
-        raw_name = entry.get('raw_short_name')
-        if raw_name and raw_name.upper() == target:
-            return entry
-    return None
+    cached = fs._short_name_index
+    if cached is None or cached[0] != fs._write_generation:
+        index = {}
+        for entry in read_directory(fs, None):
+            # Key on the uppercased raw 11-byte name of the entry; the first
+            # entry with a given name wins, as with a linear search
+            raw_name = entry.raw_short_name.upper()
+            if raw_name:
+                index.setdefault(raw_name, entry)
+        cached = fs._short_name_index = (fs._write_generation, index)
+    entry = cached[1].get(target)
+    return entry.copy() if entry is not None else None
 
 def set_entry_attributes(fs, entry: dict, is_read_only: bool = None, 
                        is_hidden: bool = None, is_system: bool = None, 
-                       is_archive: bool = None):
+                       is_archive: bool = None) -> bool:
     """
     Modify file attributes for a directory entry.
     Reads current attributes from disk to ensure bits like Directory (0x10) are preserved.
+    Nothing is written when the requested flags already match.
     
     Args:
         fs: The FAT12Image filesystem object.
@@ -931,52 +1368,43 @@ def set_entry_attributes(fs, entry: dict, is_read_only: bool = None,
         is_hidden: Set hidden flag (None = no change)
         is_system: Set system flag (None = no change)
         is_archive: Set archive flag (None = no change)
-        
+
+    Returns:
+        True if the attributes changed, False if they were already as requested.
+
     Raises:
         FAT12Error: If entry cannot be found or read.
     """
-    with open(fs.image_path, 'r+b') as f:
-        parent_cluster = entry.get('parent_cluster')
-        offset = get_entry_offset(fs, parent_cluster, entry['index'])
-        # Read current attributes from disk
-        f.seek(offset + DIR_ATTR_OFFSET)
-        current_attr_bytes = f.read(1)
-        if len(current_attr_bytes) != 1:
-            raise FAT12Error("Failed to read attributes from disk")
-        
-        current_attr = current_attr_bytes[0]
-        new_attr = current_attr
-        
-        # Modify flags as requested (only if not None)
-        if is_read_only is not None:
-            if is_read_only: new_attr |= 0x01
-            else: new_attr &= ~0x01
-        if is_hidden is not None:
-            if is_hidden: new_attr |= 0x02
-            else: new_attr &= ~0x02
-        if is_system is not None:
-            if is_system: new_attr |= 0x04
-            else: new_attr &= ~0x04
-        if is_archive is not None:
-            if is_archive: new_attr |= 0x20
-            else: new_attr &= ~0x20
-        
-        # Write back if changed
-        if new_attr != current_attr:
-            # Log specific changes
-            changes = []
-            if is_read_only is not None and (current_attr & 0x01) != (new_attr & 0x01):
-                changes.append("+RO" if new_attr & 0x01 else "-RO")
-            if is_hidden is not None and (current_attr & 0x02) != (new_attr & 0x02):
-                changes.append("+HID" if new_attr & 0x02 else "-HID")
-            if is_system is not None and (current_attr & 0x04) != (new_attr & 0x04):
-                changes.append("+SYS" if new_attr & 0x04 else "-SYS")
-            if is_archive is not None and (current_attr & 0x20) != (new_attr & 0x20):
-                changes.append("+ARC" if new_attr & 0x20 else "-ARC")
-            
-            logger.info(f"Updated attributes for '{entry.get('name', '?')}': {', '.join(changes)}")
-            
-            f.seek(offset + DIR_ATTR_OFFSET)
-            f.write(bytes([new_attr]))
-            f.flush()
-            os.fsync(f.fileno())
\ No newline at end of file
+    parent_cluster = entry.get('parent_cluster')
+    offset = get_entry_offset(fs, parent_cluster, entry['index'])
+    # Read current attributes from disk
+    entry_data = fs._pread(32, offset)
+    if len(entry_data) != 32:
+        raise FAT12Error("Failed to read attributes from disk")
+
+    current_attr = _DIR_ENTRY_STRUCT.unpack_from(entry_data)[1]
+
+    # Flags left as None keep their bit; the rest are cleared then set
+    mask = value = 0
+    for flag, bit in ((is_read_only, 0x01), (is_hidden, 0x02),
+                      (is_system, 0x04), (is_archive, 0x20)):
+        if flag is not None:
+            mask |= bit
+            if flag:
+                value |= bit
+    new_attr = (current_attr & ~mask) | value
+
+    # Write back if changed
+    changed = current_attr ^ new_attr
+    if not changed:
+        return False
+
+    # Log specific changes
+    changes = [("+" if new_attr & bit else "-") + label
+               for bit, label in _ATTR_LABELS if changed & bit]
+
+    logger.info(f"Updated attributes for '{entry.get('name', '?')}': {', '.join(changes)}")
+
+    fs._pwrite(bytes([new_attr]), offset + DIR_ATTR_OFFSET)
+    fs._sync()
+    return True
\ No newline at end of file
@@ -9,11 +9,17 @@ Core functionality for reading/writing FAT12 floppy disk images with VFAT long f
 """
 
 import os
+import stat
 import struct
 import datetime
-import random
 import logging
-from typing import List, Optional
+from functools import lru_cache
+from array import array
+from collections import deque
+from contextlib import contextmanager
+from itertools import groupby
+from operator import itemgetter
+from typing import FrozenSet, List, Optional
 
 from .vfat_utils import (encode_fat_time, encode_fat_date,
                         generate_83_name, create_lfn_entries, 
@@ -21,16 +27,88 @@ from .vfat_utils import (encode_fat_time, encode_fat_date,
                         DIR_SHORT_NAME_LEN, DIR_LAST_MOD_TIME_OFFSET)
 
 from .directory import (
-    read_directory, get_existing_83_names_in_directory,
+    iter_directory_entries, read_directory, make_dir_entry, get_existing_83_names_in_directory,
     find_free_directory_entries, write_directory_entries,
-    create_directory, delete_directory, delete_directory_entry,
-    get_entry_offset, predict_short_name, rename_entry,
+    create_directory, delete_directory, delete_directory_entry, delete_directory_entries,
+    get_entry_offset, get_directory_clusters, predict_short_name, rename_entry,
     read_raw_directory_entries, find_free_root_entries, delete_entry,
-    find_entry_by_83_name, set_entry_attributes, FAT12Error, FAT12CorruptionError
+    find_entry_by_83_name, set_entry_attributes, DirEntry, FAT12Error, FAT12CorruptionError
 )
 
 logger = logging.getLogger(__name__)
 
+# Boot sector layouts: BPB from offset 0 (after the 3-byte jump), Extended BPB from offset 36
+_BPB_STRUCT = struct.Struct('<3x8sHBHBHHBHHHI')
+_EBPB_STRUCT = struct.Struct('<BBBI11s8s')
+
+# Directory entry bytes 11-25: attributes, NT case flags, creation tenth/time/date,
+# last access date, high cluster, last modified time/date
+_ENTRY_METADATA_STRUCT = struct.Struct('<BBBHHHHHH')
+
+class _BootSectorField:
+    """
+    Class-level stand-in for a field parsed from the boot sector.
+
+    Parsing stores the real value on the instance, which then shadows this
+    descriptor, so only reads made before the boot sector of a lazily opened
+    image is loaded go through here.
+    """
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        instance._ensure_boot_sector_loaded()
+        try:
+            return instance.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(f"'{owner.__name__}' object has no attribute '{self.name}'") from None
+
+# Shared zero buffer for clearing clusters, large enough for any floppy cluster size
+_ZERO_CLUSTER = bytes(4096)
+
+# Pulls the per-format geometry out of a FORMATS entry in boot sector field order
+_FORMAT_FIELDS = itemgetter('sectors_per_cluster', 'reserved_sectors', 'root_entries',
+                            'total_sectors', 'media_descriptor', 'sectors_per_fat',
+                            'sectors_per_track', 'heads', 'hidden_sectors')
+
+@lru_cache(maxsize=None)
+def _blank_fat(media_descriptor: int, size: int) -> bytes:
+    """Return an empty FAT: media descriptor and end-of-chain marker, all clusters free."""
+    fat_data = bytearray(size)
+    fat_data[0] = media_descriptor
+    fat_data[1] = 0xFF
+    fat_data[2] = 0xFF
+    return bytes(fat_data)
+
+# Writes never change the image's size, so flushing its data is enough
+# where the platform can skip the inode metadata (Windows and macOS cannot)
+_datasync = getattr(os, 'fdatasync', os.fsync)
+
+def _pread_at(fd: int, size: int, offset: int) -> bytes:
+    """Read up to size bytes from fd at offset."""
+    if hasattr(os, 'pread'):
+        return os.pread(fd, size, offset)
+    # Windows has no pread
+    os.lseek(fd, offset, os.SEEK_SET)
+    return os.read(fd, size)
+
+def _pwrite_all(fd: int, data, offset: int):
+    """Write all of data to fd at offset."""
+    view = memoryview(data)
+    if hasattr(os, 'pwrite'):
+        while view:
+            written = os.pwrite(fd, view, offset)
+            view = view[written:]
+            offset += written
+    else:
+        # Windows has no pwrite
+        os.lseek(fd, offset, os.SEEK_SET)
+        while view:
+            view = view[os.write(fd, view):]
+
 class FAT12Image:
     """Handler for FAT12 floppy disk images"""
     
@@ -41,6 +119,13 @@ class FAT12Image:
     CLUSTER_EOF = 'EOF'
     CLUSTER_USED = 'USED'
 
+    # Single FAT values with a dedicated status; 0xFF8-0xFFF is EOF, the rest USED
+    _SPECIAL_CLUSTER_VALUES = {
+        0x000: CLUSTER_FREE,
+        0x001: CLUSTER_RESERVED,
+        0xFF7: CLUSTER_BAD,
+    }
+
     # Supported Floppy Formats
     FORMATS = {
         '1.44MB': {
@@ -153,10 +238,186 @@ class FAT12Image:
         }
     }
 
-    def __init__(self, image_path: str):
+    # Fields set by _parse_boot_sector(); on a lazily opened image the first
+    # read of any of them loads the boot sector
+    bytes_per_sector = _BootSectorField()
+    sectors_per_cluster = _BootSectorField()
+    reserved_sectors = _BootSectorField()
+    num_fats = _BootSectorField()
+    root_entries = _BootSectorField()
+    total_sectors = _BootSectorField()
+    media_descriptor = _BootSectorField()
+    sectors_per_fat = _BootSectorField()
+    sectors_per_track = _BootSectorField()
+    number_of_heads = _BootSectorField()
+    hidden_sectors = _BootSectorField()
+    _oem_name_raw = _BootSectorField()
+    drive_number = _BootSectorField()
+    reserved_ebpb = _BootSectorField()
+    boot_signature = _BootSectorField()
+    volume_id = _BootSectorField()
+    _volume_label_raw = _BootSectorField()
+    _fs_type_label_raw = _BootSectorField()
+    fat_start = _BootSectorField()
+    root_start = _BootSectorField()
+    root_size = _BootSectorField()
+    data_start = _BootSectorField()
+    bytes_per_cluster = _BootSectorField()
+    total_data_sectors = _BootSectorField()
+    total_clusters = _BootSectorField()
+    fat_type = _BootSectorField()
+    _fat_entry_count = _BootSectorField()
+    _format_name = _BootSectorField()
+
+    def __init__(self, image_path: str, lazy: bool = False):
+        """
+        Open a floppy image.
+
+        The image file stays open until close() is called; use the image as
+        a context manager to close it automatically.
+
+        Args:
+            image_path: Path to the image file.
+            lazy: If True, defer reading the boot sector until one of its
+                fields is first accessed.
+        """
         self.image_path = image_path
         logger.debug(f"Initializing FAT12Image with {image_path}")
-        self.load_boot_sector()
+        # In-memory copy of the first FAT, populated on first read_fat()
+        self._fat_cache: Optional[bytearray] = None
+        # Allocation hint: no cluster below this one is free in the FAT on
+        # disk. Searches start here; FAT writes that free a lower cluster
+        # move it back
+        self._next_free_hint = 2
+        # Image file descriptor, opened on first use and kept until close()
+        self._fd: Optional[int] = None
+        # Set when a write's fsync was deferred to the end of the operation
+        self._unsynced_writes = False
+        # Nesting depth of begin_batch(); while positive every fsync is
+        # deferred to the end of the outermost batch
+        self._batch_depth = 0
+        # Bumped on every write to the image; a cache of directory contents
+        # built under an older generation is stale
+        self._write_generation = 0
+        # Root directory 8.3 name index for find_entry_by_83_name():
+        # (generation, {upper raw name: entry})
+        self._short_name_index = None
+        # Per-directory 8.3 name sets for collision checks:
+        # {directory cluster: (generation, frozenset)}
+        self._existing_names_cache = {}
+        # Free space in bytes for get_free_space(): (generation, bytes)
+        self._free_space_cache = None
+        self._boot_sector_loaded = False
+        if not lazy:
+            try:
+                self.load_boot_sector()
+            except Exception:
+                self.close()
+                raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the image file descriptor. It is reopened on next access."""
+        fd = self._fd
+        if fd is not None:
+            self._fd = None
+            os.close(fd)
+
+    def _get_fd(self) -> int:
+        """Return the image file descriptor, opening it on first use."""
+        if self._fd is None:
+            flags = getattr(os, 'O_BINARY', 0)
+            try:
+                self._fd = os.open(self.image_path, os.O_RDWR | flags)
+            except PermissionError:
+                # Read-only images can still be browsed
+                self._fd = os.open(self.image_path, os.O_RDONLY | flags)
+        return self._fd
+
+    def _pread(self, size: int, offset: int) -> bytes:
+        """Read up to size bytes at offset without moving a shared file position."""
+        return _pread_at(self._get_fd(), size, offset)
+
+    def _preadinto(self, buf, offset: int) -> int:
+        """Read into a writable buffer at offset. Returns the number of bytes read."""
+        if hasattr(os, 'preadv'):
+            return os.preadv(self._get_fd(), [buf], offset)
+        chunk = self._pread(len(buf), offset)
+        buf[:len(chunk)] = chunk
+        return len(chunk)
+
+    def _pwrite(self, data, offset: int):
+        """Write all of data at offset."""
+        self._write_generation += 1
+        _pwrite_all(self._get_fd(), data, offset)
+
+    def _sync(self):
+        """Flush pending writes on the image file descriptor to disk."""
+        if self._batch_depth:
+            self._unsynced_writes = True
+            return
+        self._unsynced_writes = False
+        _datasync(self._get_fd())
+
+    def _mark_dirty(self):
+        """Record a write whose fsync is left to the enclosing operation's sync()."""
+        self._unsynced_writes = True
+
+    def sync(self):
+        """
+        Flush writes deferred by directory helpers to disk with one fsync.
+
+        Directory operations call this once when they finish instead of
+        syncing after every entry they touch. Does nothing if no write is
+        pending.
+        """
+        if self._unsynced_writes:
+            self._sync()
+
+    @property
+    def write_generation(self) -> int:
+        """
+        A counter bumped by every write to the image.
+
+        Data read from the image is still current while this value is
+        unchanged, so callers can key their own caches on it.
+        """
+        return self._write_generation
+
+    def begin_batch(self):
+        """
+        Start a batch of operations that share a single fsync.
+
+        Until the matching end_batch(), operations skip their own fsync.
+        Batches nest; only the outermost end_batch() syncs.
+        """
+        self._batch_depth += 1
+
+    def end_batch(self):
+        """End a batch started by begin_batch(), syncing if it was the outermost."""
+        if self._batch_depth == 0:
+            raise RuntimeError("end_batch() called without begin_batch()")
+        self._batch_depth -= 1
+        if self._batch_depth == 0:
+            self.sync()
+
+    @contextmanager
+    def batch(self):
+        """
+        Context manager running its block as one batch (see begin_batch()).
+
+        The image is synced when the block exits, even if it raised.
+        """
+        self.begin_batch()
+        try:
+            yield self
+        finally:
+            self.end_batch()
         
     def load_boot_sector(self):
         """
@@ -165,43 +426,42 @@ class FAT12Image:
         Extracts the BIOS Parameter Block (BPB) and Extended BPB fields to initialize
         filesystem parameters like sector size, cluster size, FAT location, and root directory location.
         """
-        with open(self.image_path, 'rb') as f:
-            boot_sector = f.read(512)
-            
+        # Set first so fields read back during parsing don't re-enter the loader
+        self._boot_sector_loaded = True
+        try:
+            self._parse_boot_sector(self._pread(512, 0))
+        except Exception:
+            self._boot_sector_loaded = False
+            raise
+
+    def _ensure_boot_sector_loaded(self):
+        """Load the boot sector of a lazily opened image if it is not loaded yet."""
+        if not self._boot_sector_loaded:
+            self.load_boot_sector()
+
+    def _parse_boot_sector(self, boot_sector: bytes):
+        """Populate the filesystem parameters from the raw boot sector."""
         if len(boot_sector) < 512:
             logger.critical(f"Image file too small: {len(boot_sector)} bytes")
             raise FAT12Error("Image file too small to contain boot sector")
 
         try:
             # Parse BPB (BIOS Parameter Block)
-            self.oem_name = boot_sector[3:11].decode('ascii', errors='ignore').rstrip()
-            self.bytes_per_sector = struct.unpack('<H', boot_sector[11:13])[0]
-            self.sectors_per_cluster = boot_sector[13]
-            self.reserved_sectors = struct.unpack('<H', boot_sector[14:16])[0]
-            self.num_fats = boot_sector[16]
-            self.root_entries = struct.unpack('<H', boot_sector[17:19])[0]
-            total_sectors_short = struct.unpack('<H', boot_sector[19:21])[0]
-
-            self.media_descriptor = boot_sector[21]
-
-            self.sectors_per_fat = struct.unpack('<H', boot_sector[22:24])[0]
-
-            self.sectors_per_track = struct.unpack('<H', boot_sector[24:26])[0]
-            self.number_of_heads = struct.unpack('<H', boot_sector[26:28])[0]
-            self.hidden_sectors = struct.unpack('<I', boot_sector[28:32])[0]
+            (self._oem_name_raw, self.bytes_per_sector, self.sectors_per_cluster,
+             self.reserved_sectors, self.num_fats, self.root_entries,
+             total_sectors_short, self.media_descriptor, self.sectors_per_fat,
+             self.sectors_per_track, self.number_of_heads,
+             self.hidden_sectors) = _BPB_STRUCT.unpack_from(boot_sector, 0)
 
             if total_sectors_short != 0:
                 self.total_sectors = total_sectors_short
             else:
-                self.total_sectors = struct.unpack('<I', boot_sector[32:36])[0]
+                self.total_sectors = struct.unpack_from('<I', boot_sector, 32)[0]
 
             # Parse Extended BPB
-            self.drive_number = boot_sector[36]
-            self.reserved_ebpb = boot_sector[37]
-            self.boot_signature = boot_sector[38]
-            self.volume_id = struct.unpack('<I', boot_sector[39:43])[0]
-            self.volume_label = boot_sector[43:54].decode('ascii', errors='ignore').rstrip()
-            self.fs_type_label = boot_sector[54:62].decode('ascii', errors='ignore').rstrip()
+            (self.drive_number, self.reserved_ebpb, self.boot_signature,
+             self.volume_id, self._volume_label_raw,
+             self._fs_type_label_raw) = _EBPB_STRUCT.unpack_from(boot_sector, 36)
         except struct.error as e:
             logger.critical(f"Failed to parse boot sector: {e}")
             raise FAT12Error(f"Invalid boot sector format: {e}")
@@ -226,9 +486,29 @@ class FAT12Image:
             self.fat_type = 'FAT16'
         else:
             self.fat_type = 'FAT32'
+
+        # Geometry-derived values are fixed once the boot sector is loaded
+        self._fat_entry_count = (self.sectors_per_fat * self.bytes_per_sector * 8) // 12
+        self._format_name = self._detect_format_name()
         
         logger.debug(f"Loaded boot sector: {self.fat_type}, {self.total_sectors} sectors, {self.bytes_per_cluster} bytes/cluster")
 
+    # Text fields of the boot sector are kept raw and decoded on access
+    @property
+    def oem_name(self) -> str:
+        """OEM name from the BPB (e.g. 'MSDOS5.0')."""
+        return self._oem_name_raw.decode('ascii', errors='ignore').rstrip()
+
+    @property
+    def volume_label(self) -> str:
+        """Volume label from the Extended BPB."""
+        return self._volume_label_raw.decode('ascii', errors='ignore').rstrip()
+
+    @property
+    def fs_type_label(self) -> str:
+        """File system type label from the Extended BPB (e.g. 'FAT12')."""
+        return self._fs_type_label_raw.decode('ascii', errors='ignore').rstrip()
+
     def get_total_capacity(self) -> int:
         """
         Get total disk capacity in bytes.
@@ -240,6 +520,10 @@ class FAT12Image:
 
     def get_format_name(self) -> str:
         """Get the friendly format name (e.g. '1.44M') based on geometry"""
+        return self._format_name
+
+    def _detect_format_name(self) -> str:
+        """Match the loaded geometry against FORMATS, falling back to the capacity."""
         for key, fmt in self.FORMATS.items():
             if fmt['total_sectors'] == self.total_sectors:
                 return key
@@ -258,8 +542,7 @@ class FAT12Image:
         Returns:
             The number of 12-bit entries that fit in the FAT sectors.
         """
-        fat_size_bytes = self.sectors_per_fat * self.bytes_per_sector
-        return (fat_size_bytes * 8) // 12
+        return self._fat_entry_count
 
     def get_total_cluster_count(self) -> int:
         """
@@ -268,16 +551,25 @@ class FAT12Image:
         Returns:
             The count limited by FAT12 specification (max 4084) or FAT size.
         """
-        return min(self.get_fat_entry_count(), 4084)
+        return min(self._fat_entry_count, 4084)
 
     def get_free_space(self) -> int:
         """
         Get free space in bytes.
 
+        The count is kept until the image is written to again, so repeated
+        calls (the status bar after every refresh) scan the FAT once.
+
         Returns:
             Number of free clusters multiplied by bytes per cluster.
         """
-        return len(self.find_free_clusters()) * self.bytes_per_cluster
+        cached = self._free_space_cache
+        if cached is None or cached[0] != self._write_generation:
+            entries = self._decode_fat12(self.read_fat())
+            end = min(self.total_clusters + 2, len(entries))
+            free = entries[2:end].count(0) * self.bytes_per_cluster
+            cached = self._free_space_cache = (self._write_generation, free)
+        return cached[1]
 
     def calculate_size_on_disk(self, size_bytes: int) -> int:
         """
@@ -308,16 +600,10 @@ class FAT12Image:
         Returns:
             One of the CLUSTER_* constants (FREE, RESERVED, BAD, EOF, USED).
         """
-        if value == 0x000:
-            return self.CLUSTER_FREE
-        elif value == 0x001:
-            return self.CLUSTER_RESERVED
-        elif value == 0xFF7:
-            return self.CLUSTER_BAD
-        elif value >= 0xFF8:
-            return self.CLUSTER_EOF
-        else:
-            return self.CLUSTER_USED
+        status = self._SPECIAL_CLUSTER_VALUES.get(value)
+        if status is not None:
+            return status
+        return self.CLUSTER_EOF if value >= 0xFF8 else self.CLUSTER_USED
 
     def predict_short_name(self, long_name: str, use_numeric_tail: bool = False, parent_cluster: int = None) -> str:
         """
@@ -349,52 +635,113 @@ class FAT12Image:
         """
         Read the FAT table.
 
+        The FAT is loaded from disk once and then served from an in-memory cache
+        that is kept in sync by write_fat() and format_disk().
+
         Returns:
             A bytearray containing the raw FAT data from the first FAT copy.
+            Callers receive their own copy and may modify it freely.
         """
-        with open(self.image_path, 'rb') as f:
-            f.seek(self.fat_start)
-            return bytearray(f.read(self.sectors_per_fat * self.bytes_per_sector))
+        if self._fat_cache is None:
+            fat_size = self.sectors_per_fat * self.bytes_per_sector
+            self._fat_cache = bytearray(self._pread(fat_size, self.fat_start))
+        return bytearray(self._fat_cache)
+
+    def _invalidate_fat_cache(self):
+        """Drop the cached FAT so the next read_fat() reloads it from disk."""
+        self._fat_cache = None
+        self._next_free_hint = 2
     
-    def write_fat(self, fat_data: bytearray):
+    def write_fat(self, fat_data: bytearray, verify: bool = False):
         """
-        Write FAT table to both FAT copies and verify.
+        Write FAT table to all FAT copies.
 
         Args:
             fat_data: The bytearray containing the complete FAT data.
+            verify: If True, read every copy back after writing and compare it
+                against fat_data. Off by default since it doubles the FAT I/O.
 
         Raises:
-            FAT12Error: If verification fails after writing.
+            FAT12Error: If verification is requested and fails after writing.
         """
-        with open(self.image_path, 'r+b') as f:
-            for i in range(self.num_fats):
-                offset = self.fat_start + (i * self.sectors_per_fat * self.bytes_per_sector)
-                f.seek(offset)
-                f.write(fat_data)
-            f.flush()
-            os.fsync(f.fileno())
-            
-            # Verify writes
+        self._lower_hint_for_write(fat_data, 0, len(fat_data))
+        for i in range(self.num_fats):
+            offset = self.fat_start + (i * self.sectors_per_fat * self.bytes_per_sector)
+            self._pwrite(fat_data, offset)
+        self._sync()
+        
+        if verify:
             for i in range(self.num_fats):
                 offset = self.fat_start + (i * self.sectors_per_fat * self.bytes_per_sector)
-                f.seek(offset)
-                read_data = f.read(len(fat_data))
+                read_data = self._pread(len(fat_data), offset)
                 if read_data != fat_data:
+                    self._invalidate_fat_cache()
                     logger.critical(f"FAT write verification failed for FAT #{i+1}")
                     raise FAT12Error(f"FAT write verification failed for FAT #{i+1}")
 
+        self._fat_cache = bytearray(fat_data)
+
+    def write_fat_range(self, fat_data: bytearray, start: int, end: int):
+        """
+        Write only the bytes fat_data[start:end] to all FAT copies.
+
+        Used when a caller knows which part of the FAT it changed, so the rest
+        of the table is not rewritten. Changes outside the range are ignored.
+
+        Args:
+            fat_data: The bytearray containing the complete FAT data.
+            start: First byte offset within the FAT to write.
+            end: Byte offset within the FAT to stop at (exclusive).
+        """
+        start = max(start, 0)
+        end = min(end, len(fat_data))
+        if start >= end:
+            return
+
+        self._lower_hint_for_write(fat_data, start, end)
+        dirty = memoryview(fat_data)[start:end]
+        fat_size = self.sectors_per_fat * self.bytes_per_sector
+        for i in range(self.num_fats):
+            self._pwrite(dirty, self.fat_start + (i * fat_size) + start)
+        self._sync()
+
+        if self._fat_cache is not None:
+            self._fat_cache[start:end] = dirty
+
+    def _lower_hint_for_write(self, fat_data: bytearray, start: int, end: int):
+        """
+        Move the allocation hint back before fat_data[start:end] is written
+        if that write leaves a cluster below the hint free.
+
+        The bytes under the hint are compared against the cached FAT first,
+        so writes that only touch clusters at or above it cost nothing.
+        """
+        hint = self._next_free_hint
+        # An odd hint's entry shares its first byte with the entry before it
+        stop = min(end, hint + (hint // 2) + (hint & 1))
+        if start >= stop:
+            return
+        cache = self._fat_cache
+        if cache is not None and fat_data[start:stop] == cache[start:stop]:
+            return
+        entries = self._decode_fat12(fat_data[:stop])
+        lo = max((start * 2) // 3, 2)
+        if 0 in entries[lo:hint]:
+            self._next_free_hint = entries.index(0, lo, hint)
+
     def zero_out_cluster(self, cluster: int):
         """Writes zeros to an entire cluster on disk."""
         logger.debug(f"Zeroing out cluster {cluster}")
         if cluster < 2:
             logger.warning(f"Attempted to zero out invalid cluster {cluster}")
             return
-        with open(self.image_path, 'r+b') as f:
-            offset = self.data_start + ((cluster - 2) * self.bytes_per_cluster)
-            f.seek(offset)
-            f.write(b'\x00' * self.bytes_per_cluster)
-            f.flush()
-            os.fsync(f.fileno())
+        offset = self.data_start + ((cluster - 2) * self.bytes_per_cluster)
+        if self.bytes_per_cluster <= len(_ZERO_CLUSTER):
+            zeros = memoryview(_ZERO_CLUSTER)[:self.bytes_per_cluster]
+        else:
+            zeros = bytes(self.bytes_per_cluster)
+        self._pwrite(zeros, offset)
+        self._sync()
     
     def get_fat_entry(self, fat_data: bytearray, cluster: int) -> int:
         """
@@ -415,7 +762,7 @@ class FAT12Image:
             logger.warning(f"Attempted to read FAT entry for out-of-bounds cluster {cluster}")
             return 0xFFF # Return EOF to stop chain traversal
             
-        value = struct.unpack('<H', fat_data[offset:offset+2])[0]
+        value = fat_data[offset] | (fat_data[offset + 1] << 8)
         
         if cluster & 1:
             return value >> 4
@@ -439,16 +786,40 @@ class FAT12Image:
             logger.warning(f"Attempted to write FAT entry for out-of-bounds cluster {cluster}")
             return
             
-        current = struct.unpack('<H', fat_data[offset:offset+2])[0]
+        current = fat_data[offset] | (fat_data[offset + 1] << 8)
         
         if cluster & 1:
             new_value = (current & 0x000F) | (value << 4)
         else:
             new_value = (current & 0xF000) | (value & 0xFFF)
         
-        fat_data[offset:offset+2] = struct.pack('<H', new_value)
+        fat_data[offset] = new_value & 0xFF
+        fat_data[offset + 1] = (new_value >> 8) & 0xFF
+
+    @staticmethod
+    def _decode_fat12(fat_data: bytearray) -> List[int]:
+        """
+        Unpack every 12-bit entry in the FAT in one pass.
+
+        Each 3-byte group holds two entries, so the even and odd entries are
+        decoded from strided slices of the buffer and interleaved, avoiding a
+        get_fat_entry() call per cluster.
+
+        Args:
+            fat_data: The FAT bytearray.
+
+        Returns:
+            List of entry values indexed by cluster number.
+        """
+        lo, mid, hi = fat_data[0::3], fat_data[1::3], fat_data[2::3]
+        even = [a | ((b & 0x0F) << 8) for a, b in zip(lo, mid)]
+        odd = [(b >> 4) | (c << 4) for b, c in zip(mid, hi)]
+        entries = [0] * (len(even) + len(odd))
+        entries[0::2] = even
+        entries[1::2] = odd
+        return entries
     
-    def read_directory(self, cluster: int = None) -> List[dict]:
+    def read_directory(self, cluster: int = None) -> List[DirEntry]:
         """
         Read directory entries from root (None) or a specific cluster.
 
@@ -456,18 +827,18 @@ class FAT12Image:
             cluster: The starting cluster of the directory (None for root).
 
         Returns:
-            List of parsed directory entry dictionaries.
+            List of parsed DirEntry records.
         """
         return read_directory(self, cluster)
 
-    def read_root_directory(self) -> List[dict]:
+    def read_root_directory(self) -> List[DirEntry]:
         """
         Read root directory entries.
 
         Wrapper for read_directory(None).
 
         Returns:
-            List of parsed directory entry dictionaries from root.
+            List of parsed DirEntry records from root.
         """
         return self.read_directory(None)
     
@@ -484,29 +855,66 @@ class FAT12Image:
         """
         Find free clusters in the FAT.
 
+        When a count is given the scan starts at the allocation hint, skipping
+        the used prefix of the disk, and returns the lowest free clusters in
+        ascending order. Looking clusters up does not reserve them: the hint
+        only moves up to the first free cluster found in the written FAT, so
+        a caller that fails before writing the FAT leaves nothing behind.
+
         Args:
             count: Number of clusters to find. If None, finds all.
 
         Returns:
             List of free cluster indices.
         """
-        fat_data = self.read_fat()
-        free_clusters = []
-        
-        for cluster in range(2, self.total_clusters + 2):
-            if self.get_fat_entry(fat_data, cluster) == 0:
-                free_clusters.append(cluster)
-                if count is not None and len(free_clusters) >= count:
-                    break
-        
-        return free_clusters
+        entries = self._decode_fat12(self.read_fat())
+        end = min(self.total_clusters + 2, len(entries))
+        if count is None:
+            return [cluster for cluster in range(2, end) if entries[cluster] == 0]
+
+        # list.index() does the search for each free entry in C
+        lo = min(max(self._next_free_hint, 2), end)
+        free = []
+        while len(free) < count:
+            try:
+                cluster = entries.index(0, lo, end)
+            except ValueError:
+                break
+            free.append(cluster)
+            lo = cluster + 1
+        # Everything between the old hint and the first free cluster is in use
+        if free:
+            self._next_free_hint = free[0]
+        elif count > 0:
+            self._next_free_hint = end
+        return free
     
-    def get_existing_83_names(self) -> List[str]:
+    def find_free_run(self, count: int) -> Optional[int]:
+        """
+        Find a run of consecutive free clusters.
+
+        Args:
+            count: Length of the run.
+
+        Returns:
+            The first cluster of the lowest run of count free clusters,
+            or None if the free space is too fragmented (or too small).
         """
-        Get list of all existing 8.3 names in the root directory.
+        if count <= 0:
+            return None
+        entries = self._decode_fat12(self.read_fat())
+        end = min(self.total_clusters + 2, len(entries))
+        # One byte per cluster (1 = free) so the run search is a substring search
+        free_map = bytes(entry == 0 for entry in entries[:end])
+        start = free_map.find(b'\x01' * count, 2)
+        return start if start != -1 else None
+
+    def get_existing_83_names(self) -> FrozenSet[str]:
+        """
+        Get all existing 8.3 names in the root directory.
 
         Returns:
-            List of 11-byte name strings (no dot).
+            Frozenset of 11-byte name strings (no dot).
         """
         return get_existing_83_names_in_directory(self, None)
     
@@ -516,15 +924,16 @@ class FAT12Image:
         Used to visualize which file occupies which clusters.
         """
         mapping = {}
-        fat_data = self.read_fat()
+        fat_entries = self._decode_fat12(self.read_fat())
+        num_entries = len(fat_entries)
         
         # Queue for traversal: (cluster, path_prefix)
         # Use None for root
-        queue = [(None, "")]
+        queue = deque([(None, "")])
         processed_dirs = set()
         
         while queue:
-            dir_cluster, path_prefix = queue.pop(0)
+            dir_cluster, path_prefix = queue.popleft()
             
             # Avoid processing the same directory cluster twice (loops)
             if dir_cluster is not None:
@@ -553,7 +962,8 @@ class FAT12Image:
                             raise FAT12CorruptionError(f"Loop detected in file cluster chain for '{full_name}' at cluster {curr}")
                         visited_chain.add(curr)
                         mapping[curr] = full_name
-                        curr = self.get_fat_entry(fat_data, curr)
+                        # Clusters past the end of the FAT read as EOF
+                        curr = fat_entries[curr] if curr < num_entries else 0xFFF
                 
                 # If directory, add to queue
                 if entry['is_dir']:
@@ -566,7 +976,8 @@ class FAT12Image:
         Get the full chain of clusters containing the specified cluster.
         Traverses backwards to find the start, then forwards to the end.
         """
-        fat_data = self.read_fat()
+        fat_entries = self._decode_fat12(self.read_fat())
+        num_entries = len(fat_entries)
         # Calculate max cluster based on data area size
         max_cluster = self.total_clusters + 2
         
@@ -575,26 +986,25 @@ class FAT12Image:
             return [cluster]
         
         # 1. Find the start of the chain
-        # Scan FAT for any entry pointing to 'current' until we find the head
+        # Build a reverse index (next -> previous) in a single pass over the FAT,
+        # keeping the lowest-numbered parent if entries are cross-linked
+        prev = array('H', bytes(2 * max_cluster))
+        for c in range(min(max_cluster, num_entries) - 1, 1, -1):
+            nxt = fat_entries[c]
+            if 2 <= nxt < max_cluster:
+                prev[nxt] = c
+
+        # Walk the reverse index back to the head
         current = cluster
         visited_backwards = {current}
 
-        while True:
-            parent = None
-            for c in range(2, max_cluster):
-                if self.get_fat_entry(fat_data, c) == current:
-                    parent = c
-                    break
-            
-            if parent is not None:
-                if parent in visited_backwards:
-                    # Loop detected in backward traversal
-                    raise FAT12CorruptionError(f"Loop detected in FAT chain (backward traversal) at cluster {parent}")
-                visited_backwards.add(parent)
-                current = parent
-            else:
-                # No parent found, 'current' is the start
-                break
+        while current < max_cluster and prev[current]:
+            parent = prev[current]
+            if parent in visited_backwards:
+                # Loop detected in backward traversal
+                raise FAT12CorruptionError(f"Loop detected in FAT chain (backward traversal) at cluster {parent}")
+            visited_backwards.add(parent)
+            current = parent
                 
         # 2. Traverse forward from start
         chain = []
@@ -608,14 +1018,16 @@ class FAT12Image:
                 raise FAT12CorruptionError(f"Loop detected in cluster chain at {curr}")
             visited.add(curr)
             chain.append(curr)
-            curr = self.get_fat_entry(fat_data, curr)
+            # Clusters past the end of the FAT read as EOF
+            curr = fat_entries[curr] if curr < num_entries else 0xFFF
             
         return chain
 
     def write_file_to_image(self, filename: str, data: bytes, 
                            use_numeric_tail: bool = False, 
                            modification_dt: Optional[datetime.datetime] = None,
-                           parent_cluster: int = None):
+                           parent_cluster: int = None,
+                           contiguous: bool = False):
         """Write a file to the disk image with VFAT long filename support
         
         Args:
@@ -624,14 +1036,24 @@ class FAT12Image:
             use_numeric_tail: Whether to use numeric tails for 8.3 name generation
             modification_dt: Optional modification datetime (defaults to now)
             parent_cluster: Cluster of the parent directory (None for root)
+            contiguous: Place the data in one unbroken run of clusters when
+                such a run exists, instead of filling the first free clusters
+
+        Returns:
+            The new file's DirEntry, as read_directory() would return it.
             
         Raises:
             FAT12Error: If disk is full or other FS errors.
         """
         logger.info(f"Writing file '{filename}' ({len(data)} bytes)")
         
+        # Read the parent directory once for both the name collision check
+        # and the free slot search
+        raw_entries = list(iter_directory_entries(self, parent_cluster))
+        
         # Get existing 8.3 names to avoid collisions
-        existing_83_names = get_existing_83_names_in_directory(self, parent_cluster)
+        existing_83_names = get_existing_83_names_in_directory(self, parent_cluster,
+                                                               raw_entries=raw_entries)
         
         # Generate 8.3 name
         short_name_83 = generate_83_name(filename, existing_83_names, use_numeric_tail)
@@ -654,20 +1076,25 @@ class FAT12Image:
         
         # Find free directory entries first. This is critical, as it may expand the directory
         # and consume a free cluster, updating the FAT in the process.
-        entry_index = find_free_directory_entries(self, parent_cluster, total_entries_needed)
+        entry_index = find_free_directory_entries(self, parent_cluster, total_entries_needed,
+                                                  raw_entries)
             
         # Now that the directory is settled, find clusters for the file's data.
         free_clusters = []
         if len(data) > 0:
             clusters_needed = (len(data) + self.bytes_per_cluster - 1) // self.bytes_per_cluster
-            free_clusters = self.find_free_clusters(clusters_needed)
+            run_start = self.find_free_run(clusters_needed) if contiguous else None
+            if run_start is not None:
+                free_clusters = list(range(run_start, run_start + clusters_needed))
+            else:
+                free_clusters = self.find_free_clusters(clusters_needed)
             if len(free_clusters) < clusters_needed:
                 logger.warning(f"Disk full: needed {clusters_needed} clusters for data, found {len(free_clusters)}")
                 # Attempt to roll back by deleting the directory entries we were about to write
                 try:
                     # This is a best-effort cleanup
-                    for i in range(total_entries_needed):
-                        delete_directory_entry(self, parent_cluster, entry_index + i)
+                    delete_directory_entries(self, parent_cluster, entry_index, total_entries_needed,
+                                             sync=True)
                 except Exception as e:
                     logger.error(f"Failed to roll back directory entry allocation during disk full error: {e}")
                 raise FAT12Error("Disk full (not enough free clusters for file data)")
@@ -679,12 +1106,15 @@ class FAT12Image:
         
         # Set date/time (current)
         now = datetime.datetime.now()
-        mod_dt = modification_dt if modification_dt is not None else now
-
         creation_time = encode_fat_time(now)
         creation_date = encode_fat_date(now)
-        modified_time = encode_fat_time(mod_dt)
-        modified_date = encode_fat_date(mod_dt)
+
+        if modification_dt is None:
+            # Common case: the file is stamped with the same instant twice
+            modified_time, modified_date = creation_time, creation_date
+        else:
+            modified_time = encode_fat_time(modification_dt)
+            modified_date = encode_fat_date(modification_dt)
         
         entry[DIR_CRT_TIME_TENTH_OFFSET] = 0  # Creation time tenth
         entry[14:16] = struct.pack('<H', creation_time)
@@ -705,39 +1135,55 @@ class FAT12Image:
         
         # Write file data to clusters (if not empty)
         if len(data) > 0:
-            offset = 0
             fat_data = self.read_fat()
             
-            with open(self.image_path, 'r+b') as f:
-                for i, cluster in enumerate(free_clusters):
-                    # Write data
-                    cluster_offset = self.data_start + ((cluster - 2) * self.bytes_per_cluster)
-                    f.seek(cluster_offset)
-                    chunk = data[offset:offset + self.bytes_per_cluster]
-                    f.write(chunk)
-                    offset += len(chunk)
-                    
-                    # Update FAT
-                    if i < len(free_clusters) - 1:
-                        self.set_fat_entry(fat_data, cluster, free_clusters[i + 1])
-                    else:
-                        self.set_fat_entry(fat_data, cluster, 0xFFF)  # End of file
-                
-                f.flush()
-                os.fsync(f.fileno())
+            # Group clusters into runs that are contiguous on disk so each run
+            # is written with a single seek/write
+            runs = []
+            run_start, run_len = free_clusters[0], 1
+            for prev, cur in zip(free_clusters, free_clusters[1:]):
+                if cur == prev + 1:
+                    run_len += 1
+                else:
+                    runs.append((run_start, run_len))
+                    run_start, run_len = cur, 1
+            runs.append((run_start, run_len))
+            
+            data_view = memoryview(data)
+            offset = 0
+            for run_start, run_len in runs:
+                run_bytes = run_len * self.bytes_per_cluster
+                self._pwrite(data_view[offset:offset + run_bytes],
+                             self.data_start + ((run_start - 2) * self.bytes_per_cluster))
+                offset += run_bytes
+            
+            # Update FAT
+            for i, cluster in enumerate(free_clusters):
+                if i < len(free_clusters) - 1:
+                    self.set_fat_entry(fat_data, cluster, free_clusters[i + 1])
+                else:
+                    self.set_fat_entry(fat_data, cluster, 0xFFF)  # End of file
+            
+            self._sync()
             
-            # Write FAT
-            self.write_fat(fat_data)
+            # Write only the part of the FAT holding the new chain
+            first, last = min(free_clusters), max(free_clusters)
+            self.write_fat_range(fat_data, first + (first // 2), last + (last // 2) + 2)
+        
+        self.sync()
 
-    def get_existing_83_names_in_directory(self, cluster: int = None) -> List[str]:
+        return make_dir_entry(self, entry, entry_index + len(lfn_entries), parent_cluster,
+                              filename if needs_lfn else None)
+
+    def get_existing_83_names_in_directory(self, cluster: int = None) -> FrozenSet[str]:
         """
-        Get list of all existing 8.3 names in a directory.
+        Get all existing 8.3 names in a directory.
 
         Args:
             cluster: The directory cluster (None for root).
 
         Returns:
-            List of 11-byte name strings.
+            Frozenset of 11-byte name strings.
         """
         return get_existing_83_names_in_directory(self, cluster)
 
@@ -805,9 +1251,9 @@ class FAT12Image:
             parent_cluster: The directory cluster.
             entry_index: The index of the entry to delete.
         """
-        delete_directory_entry(self, parent_cluster, entry_index)
+        delete_directory_entry(self, parent_cluster, entry_index, sync=True)
 
-    def extract_file(self, entry: dict) -> bytes:
+    def extract_file(self, entry: dict, image_data: Optional[bytes] = None) -> bytes:
         """
         Extract file data from the image.
 
@@ -815,6 +1261,9 @@ class FAT12Image:
 
         Args:
             entry: The file's directory entry dictionary.
+            image_data: Optional contents of the whole image, read up front by
+                callers extracting many files; clusters are copied out of it
+                instead of being read from disk one at a time.
 
         Returns:
             The file content as bytes.
@@ -823,35 +1272,65 @@ class FAT12Image:
             FAT12CorruptionError: If the cluster chain is broken or loops.
         """
         logger.debug(f"Extracting file '{entry.get('name')}' (Size: {entry.get('size')})")
-        data = bytearray()
+        size = entry['size']
+        
+        if entry['cluster'] < 2:
+            return bytes()
         
-        with open(self.image_path, 'rb') as f:
-            if entry['cluster'] < 2:
-                return bytes()
+        # Decode the FAT once and walk the chain by indexing, rather than
+        # unpacking a 12-bit entry per cluster
+        fat_entries = self._decode_fat12(self.read_fat())
+        bytes_per_cluster = self.bytes_per_cluster
+        clusters_needed = (size + bytes_per_cluster - 1) // bytes_per_cluster
+        current_cluster = entry['cluster']
+        visited = set()
+        
+        # Collect the chain as runs of consecutive clusters: [first, count]
+        runs = []
+        while current_cluster < 0xFF8 and len(visited) < clusters_needed:
+            if current_cluster in visited:
+                raise FAT12CorruptionError(f"Loop detected in file cluster chain at {current_cluster}")
+            visited.add(current_cluster)
             
-            fat_data = self.read_fat()
-            current_cluster = entry['cluster']
-            remaining = entry['size']
-            visited = set()
+            if runs and current_cluster == runs[-1][0] + runs[-1][1]:
+                runs[-1][1] += 1
+            else:
+                runs.append([current_cluster, 1])
             
-            while current_cluster < 0xFF8 and remaining > 0:
-                if current_cluster in visited:
-                    raise FAT12CorruptionError(f"Loop detected in file cluster chain at {current_cluster}")
-                visited.add(current_cluster)
-
-                cluster_offset = self.data_start + ((current_cluster - 2) * self.bytes_per_cluster)
-                f.seek(cluster_offset)
-                
-                to_read = min(self.bytes_per_cluster, remaining)
-                data.extend(f.read(to_read))
-                remaining -= to_read
-                
-                current_cluster = self.get_fat_entry(fat_data, current_cluster)
+            if current_cluster < len(fat_entries):
+                current_cluster = fat_entries[current_cluster]
+            else:
+                logger.warning(f"Attempted to read FAT entry for out-of-bounds cluster {current_cluster}")
+                current_cluster = 0xFFF
+        
+        if len(runs) == 1 and image_data is None:
+            # Contiguous file: a single read returns the finished bytes
+            data = self._pread(min(size, runs[0][1] * bytes_per_cluster),
+                               self.data_start + (runs[0][0] - 2) * bytes_per_cluster)
+            written = len(data)
+        else:
+            data = bytearray(size)
+            view = memoryview(data)
+            source = memoryview(image_data) if image_data is not None else None
+            written = 0
+            
+            for first, count in runs:
+                run_offset = self.data_start + ((first - 2) * bytes_per_cluster)
+                to_read = min(count * bytes_per_cluster, size - written)
+                if source is not None:
+                    chunk = source[run_offset:run_offset + to_read]
+                    n = len(chunk)
+                    view[written:written + n] = chunk
+                else:
+                    n = self._preadinto(view[written:written + to_read], run_offset)
+                written += n
+                if n < to_read:
+                    break  # Ran off the end of the image
         
-        if len(data) < entry['size']:
-            raise FAT12CorruptionError(f"File '{entry['name']}' truncated: Expected {entry['size']} bytes, got {len(data)}")
+        if written < size:
+            raise FAT12CorruptionError(f"File '{entry['name']}' truncated: Expected {size} bytes, got {written}")
         
-        return bytes(data[:entry['size']])
+        return bytes(data)
     
     @staticmethod
     def create_empty_image(filepath: str, format_key: str = '1.44MB', oem_name: str = 'MSDOS5.0'):
@@ -866,81 +1345,60 @@ class FAT12Image:
         if format_key not in FAT12Image.FORMATS:
             raise ValueError(f"Unknown format: {format_key}")
             
-        fmt = FAT12Image.FORMATS[format_key]
-        
         bytes_per_sector = 512
-        sectors_per_cluster = fmt['sectors_per_cluster']
-        reserved_sectors = fmt['reserved_sectors']
         num_fats = 2
-        root_entries = fmt['root_entries']
-        total_sectors = fmt['total_sectors']
-        media_descriptor = fmt['media_descriptor']
-        sectors_per_fat = fmt['sectors_per_fat']
-        sectors_per_track = fmt['sectors_per_track']
-        heads = fmt['heads']
-        hidden_sectors = fmt['hidden_sectors']
+        (sectors_per_cluster, reserved_sectors, root_entries, total_sectors,
+         media_descriptor, sectors_per_fat, sectors_per_track, heads,
+         hidden_sectors) = _FORMAT_FIELDS(FAT12Image.FORMATS[format_key])
         
         total_size = total_sectors * bytes_per_sector
         
         with open(filepath, 'wb') as f:
-            f.write(b'\x00' * total_size)
-            f.seek(0)
+            # Size the file without writing the zeros; the filesystem fills
+            # the extended range with zeros (sparsely where supported)
+            f.truncate(total_size)
             
             boot_sector = bytearray(512)
-            boot_sector[0:3] = b'\xEB\x3C\x90'
             
             # OEM Name (8 bytes, space padded)
             oem_bytes = oem_name.encode('ascii', 'replace')[:8].ljust(8, b' ')
-            boot_sector[3:11] = oem_bytes
-            boot_sector[11:13] = bytes_per_sector.to_bytes(2, 'little')
-            boot_sector[13] = sectors_per_cluster
-            boot_sector[14:16] = reserved_sectors.to_bytes(2, 'little')
-            boot_sector[16] = num_fats
-            boot_sector[17:19] = root_entries.to_bytes(2, 'little')
             
+            # Large volumes store the sector count in the 32-bit field at offset 32
             if total_sectors < 65536:
-                boot_sector[19:21] = total_sectors.to_bytes(2, 'little')
-                boot_sector[32:36] = (0).to_bytes(4, 'little')
+                total_sectors_short, total_sectors_large = total_sectors, 0
             else:
-                boot_sector[19:21] = (0).to_bytes(2, 'little')
-                boot_sector[32:36] = total_sectors.to_bytes(4, 'little')
-
-            boot_sector[21] = media_descriptor
-            boot_sector[22:24] = sectors_per_fat.to_bytes(2, 'little')
-            boot_sector[24:26] = sectors_per_track.to_bytes(2, 'little')
-            boot_sector[26:28] = heads.to_bytes(2, 'little')
-            boot_sector[28:32] = hidden_sectors.to_bytes(4, 'little')
+                total_sectors_short, total_sectors_large = 0, total_sectors
+
+            _BPB_STRUCT.pack_into(
+                boot_sector, 0, oem_bytes, bytes_per_sector, sectors_per_cluster,
+                reserved_sectors, num_fats, root_entries, total_sectors_short,
+                media_descriptor, sectors_per_fat, sectors_per_track, heads,
+                hidden_sectors)
+            struct.pack_into('<I', boot_sector, 32, total_sectors_large)
+            boot_sector[0:3] = b'\xEB\x3C\x90'
             
-            # Extended BPB
-            boot_sector[36] = 0x00 # Drive number
-            boot_sector[37] = 0x00 # Reserved
-            boot_sector[38] = 0x29 # Boot signature
-            # Volume ID (random)
-            vol_id = random.getrandbits(32)
-            boot_sector[39:43] = vol_id.to_bytes(4, 'little')
-            boot_sector[43:54] = b'NO NAME    ' # Volume Label
-            boot_sector[54:62] = b'FAT12   '    # FS Type
+            # Extended BPB: drive number, reserved, boot signature, random volume ID,
+            # volume label, FS type
+            vol_id = int.from_bytes(os.urandom(4), 'little')
+            _EBPB_STRUCT.pack_into(boot_sector, 36, 0x00, 0x00, 0x29, vol_id,
+                                   b'NO NAME    ', b'FAT12   ')
             
             boot_sector[510:512] = b'\x55\xAA'
             
-            f.write(boot_sector)
-            
             fat_start = reserved_sectors * bytes_per_sector
             fat_size = sectors_per_fat * bytes_per_sector
             
-            fat_data = bytearray(fat_size)
-            fat_data[0] = media_descriptor
-            fat_data[1] = 0xFF
-            fat_data[2] = 0xFF
+            fat_data = _blank_fat(media_descriptor, fat_size)
             
-            for i in range(num_fats):
-                f.seek(fat_start + (i * fat_size))
-                f.write(fat_data)
+            # The boot sector, remaining reserved sectors and FAT copies are
+            # contiguous, so write them out in a single call
+            system_area = boot_sector.ljust(fat_start, b'\x00') + fat_data * num_fats
+            _pwrite_all(f.fileno(), system_area, 0)
     
 
     def set_entry_attributes(self, entry: dict, is_read_only: bool = None, 
                            is_hidden: bool = None, is_system: bool = None, 
-                           is_archive: bool = None):
+                           is_archive: bool = None) -> bool:
         """
         Modify file attributes for a directory entry.
         
@@ -950,63 +1408,72 @@ class FAT12Image:
             is_hidden: Set hidden flag (None = no change)
             is_system: Set system flag (None = no change)
             is_archive: Set archive flag (None = no change)
-            
+
+        Returns:
+            True if the attributes changed, False if nothing needed writing.
+
         Raises:
             FAT12Error: If entry cannot be found.
         """
-        set_entry_attributes(self, entry, is_read_only, is_hidden, is_system, is_archive)
+        return set_entry_attributes(self, entry, is_read_only, is_hidden, is_system, is_archive)
 
-    def format_disk(self, full_format: bool = False):
+    def format_disk(self, full_format: bool = False, verify: bool = False):
         """Format the disk - erase all files and reset FAT to clean state
         
         Args:
             full_format: If True, also zero out the data area (slower but more secure)
+            verify: If True, read the FAT copies back after writing and compare
+                them against the blank FAT. Off by default, as for write_fat().
+
+        Raises:
+            FAT12Error: If verification is requested and fails.
         """
         logger.info(f"Formatting disk (Full: {full_format})")
         
-        with open(self.image_path, 'r+b') as f:
-            # Clear root directory
-            f.seek(self.root_start)
-            f.write(b'\x00' * self.root_size)
-            
-            # Reset FAT - keep media descriptor, clear everything else
-            fat_data = bytearray(self.sectors_per_fat * self.bytes_per_sector)
-            fat_data[0] = self.media_descriptor
-            fat_data[1] = 0xFF
-            fat_data[2] = 0xFF
-            
-            # Write to all FAT copies
-            for i in range(self.num_fats):
-                offset = self.fat_start + (i * self.sectors_per_fat * self.bytes_per_sector)
-                f.seek(offset)
-                f.write(fat_data)
-            f.flush()
-            os.fsync(f.fileno())
-            
-            # Verify FAT writes
+        # Reset FAT - keep media descriptor, clear everything else
+        fat_size = self.sectors_per_fat * self.bytes_per_sector
+        fat_data = _blank_fat(self.media_descriptor, fat_size)
+        
+        # The FAT copies and the root directory are adjacent on disk, so all
+        # FAT copies and the cleared root directory go out in a single write
+        fats_size = self.num_fats * fat_size
+        self._pwrite(fat_data * self.num_fats + bytes(self.root_size), self.fat_start)
+        self._sync()
+        
+        if verify:
+            written = self._pread(fats_size, self.fat_start)
             for i in range(self.num_fats):
-                offset = self.fat_start + (i * self.sectors_per_fat * self.bytes_per_sector)
-                f.seek(offset)
-                if f.read(len(fat_data)) != fat_data:
+                if written[i * fat_size:(i + 1) * fat_size] != fat_data:
+                    self._invalidate_fat_cache()
                     raise FAT12Error(f"Format verification failed: FAT #{i+1} mismatch")
+        self._fat_cache = bytearray(fat_data)
+        self._next_free_hint = 2
+        
+        # If full format, clear data area
+        if full_format:
+            fd = self._get_fd()
+            # Calculate data size
+            total_size = self.total_sectors * self.bytes_per_sector
+            data_size = total_size - self.data_start
             
-            # If full format, clear data area
-            if full_format:
-                f.seek(self.data_start)
-                # Calculate data size
-                total_size = self.total_sectors * self.bytes_per_sector
-                data_size = total_size - self.data_start
-                
-                # Write in chunks
+            st = os.fstat(fd)
+            if stat.S_ISREG(st.st_mode) and st.st_size == total_size:
+                # Cut the data area off and extend the file again: the
+                # filesystem drops the old blocks and the range reads as zeros
+                os.ftruncate(fd, self.data_start)
+                os.ftruncate(fd, total_size)
+            else:
+                # Devices, or images with trailing data: write the zeros
                 chunk_size = 65536
-                zeros = b'\x00' * chunk_size
+                zeros = bytes(chunk_size)
+                offset = self.data_start
                 remaining = data_size
                 while remaining > 0:
                     write_size = min(remaining, chunk_size)
-                    f.write(zeros[:write_size])
+                    self._pwrite(memoryview(zeros)[:write_size], offset)
+                    offset += write_size
                     remaining -= write_size
-                f.flush()
-                os.fsync(f.fileno())
+            self._sync()
 
     def defragment_filesystem(self):
         """
@@ -1020,19 +1487,27 @@ class FAT12Image:
         all_items = [] # List of (parent_path_tuple, entry_dict)
         files_data = {} # Map id(entry) -> bytes
         
-        def collect(cluster, parent_path):
-            entries = self.read_directory(cluster)
-            for entry in entries:
+        # Read the image once and cut every file out of that copy
+        image_data = self._pread(self.total_sectors * self.bytes_per_sector, 0)
+        
+        # Walk the tree breadth-first with an explicit queue, so deeply
+        # nested images can't hit the recursion limit
+        pending = deque([(None, ())])
+        seen_dirs = set()
+        while pending:
+            cluster, parent_path = pending.popleft()
+            if cluster in seen_dirs:
+                raise FAT12CorruptionError(f"Directory cluster {cluster} is reachable twice; aborting defragmentation")
+            seen_dirs.add(cluster)
+            for entry in self.read_directory(cluster):
                 if entry['name'] in ('.', '..'): continue
                 
                 all_items.append( (parent_path, entry) )
                 
                 if entry['is_dir']:
-                    collect(entry['cluster'], parent_path + (entry['name'],))
+                    pending.append((entry['cluster'], parent_path + (entry['name'],)))
                 else:
-                    files_data[id(entry)] = self.extract_file(entry)
-        
-        collect(None, ())
+                    files_data[id(entry)] = self.extract_file(entry, image_data)
         
         logger.info(f"Collected {len(all_items)} items. Formatting disk...")
         # 2. Format (Quick format preserves BPB but clears FAT/Root)
@@ -1042,46 +1517,59 @@ class FAT12Image:
         # Map path tuple to cluster ID. Root is None.
         path_to_cluster = { (): None }
         
-        # Sort by path length (parents first) then name (alphabetical sort)
-        all_items.sort(key=lambda x: (len(x[0]), x[1]['name']))
+        # Sort by path length (parents first), then group siblings together
+        # and restore each group in name (alphabetical) order
+        all_items.sort(key=lambda x: (len(x[0]), x[0], x[1]['name']))
+        
+        def block_of(offset):
+            # Root directory entries share one block; otherwise, their cluster
+            if offset < self.data_start:
+                return -1
+            return (offset - self.data_start) // self.bytes_per_cluster
         
         logger.info("Restoring files and directories...")
-        for parent_path, entry in all_items:
+        for parent_path, group in groupby(all_items, key=itemgetter(0)):
             parent_cluster = path_to_cluster[parent_path]
+            siblings = [entry for _, entry in group]
             
-            if entry['is_dir']:
-                self.create_directory(entry['name'], parent_cluster, use_numeric_tail=True)
-                    
-                # Find the new cluster
-                new_entries = self.read_directory(parent_cluster)
-                new_entry = next(e for e in new_entries if e['name'] == entry['name'])
-                path_to_cluster[parent_path + (entry['name'],)] = new_entry['cluster']
-                target_entry = new_entry
-            else:
-                data = files_data[id(entry)]
-                self.write_file_to_image(entry['name'], data, use_numeric_tail=True, parent_cluster=parent_cluster)
-                
-                # Find the new entry to patch metadata
-                new_entries = self.read_directory(parent_cluster)
-                target_entry = next(e for e in new_entries if e['name'] == entry['name'])
-
-            # Patch Metadata (Attributes & Timestamps) directly
-            with open(self.image_path, 'r+b') as f:
-                offset = get_entry_offset(self, parent_cluster, target_entry['index'])
-                
-                # Attributes (Offset 11)
-                f.seek(offset + DIR_ATTR_OFFSET)
-                f.write(bytes([entry['attributes']]))
-                
-                # Timestamps (Offset 13-26)
-                f.seek(offset + DIR_CRT_TIME_TENTH_OFFSET)
-                f.write(struct.pack('B', entry['creation_time_tenth']))
-                f.write(struct.pack('<H', entry['creation_time']))
-                f.write(struct.pack('<H', entry['creation_date']))
-                f.write(struct.pack('<H', entry['last_accessed_date']))
-                # Skip High Cluster (2 bytes at 20)
-                f.seek(offset + DIR_LAST_MOD_TIME_OFFSET)
-                f.write(struct.pack('<H', entry['last_modified_time']))
-                f.write(struct.pack('<H', entry['last_modified_date']))
+            for entry in siblings:
+                if entry['is_dir']:
+                    self.create_directory(entry['name'], parent_cluster, use_numeric_tail=True)
+                else:
+                    data = files_data[id(entry)]
+                    self.write_file_to_image(entry['name'], data, use_numeric_tail=True,
+                                             parent_cluster=parent_cluster, contiguous=True)
+            
+            # Read the restored directory once and look the new entries up by name
+            new_entries = {e['name']: e for e in self.read_directory(parent_cluster)}
+            
+            clusters = get_directory_clusters(self, parent_cluster) if parent_cluster else None
+            patches = {} # Map entry offset -> original entry
+            for entry in siblings:
+                target_entry = new_entries[entry['name']]
+                if entry['is_dir']:
+                    path_to_cluster[parent_path + (entry['name'],)] = target_entry['cluster']
+                offset = get_entry_offset(self, parent_cluster, target_entry['index'], clusters=clusters)
+                patches[offset] = entry
+            
+            # Patch Metadata (Attributes & Timestamps) directly. Entries held in
+            # the same cluster (or the root directory) are patched in one read
+            # of the span covering them and written back with one write
+            for _, offsets in groupby(sorted(patches), key=block_of):
+                offsets = list(offsets)
+                span_start = offsets[0]
+                raw = bytearray(self._pread(offsets[-1] + 32 - span_start, span_start))
+                for offset in offsets:
+                    entry = patches[offset]
+                    pos = offset + DIR_ATTR_OFFSET - span_start
+                    # Keep the new entry's NT case flags and high cluster
+                    current = _ENTRY_METADATA_STRUCT.unpack_from(raw, pos)
+                    _ENTRY_METADATA_STRUCT.pack_into(
+                        raw, pos, entry['attributes'], current[1],
+                        entry['creation_time_tenth'], entry['creation_time'],
+                        entry['creation_date'], entry['last_accessed_date'], current[6],
+                        entry['last_modified_time'], entry['last_modified_date'])
+                self._pwrite(raw, span_start)
         
+        self._sync()
         logger.info("Defragmentation complete")
@@ -1,11 +1,11 @@
 # Copyright (c) 2026 Stephen P Smith
 # MIT License
 
-import struct
 import datetime
 import logging
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Collection, List, Tuple, Optional
 
 # Standard Directory Entry Constants (32 bytes)
 DIR_ATTR_OFFSET = 11             # Offset to Attribute byte
@@ -19,9 +19,16 @@ LFN_CHECKSUM_OFFSET = 13         # Offset to Checksum
 
 logger = logging.getLogger(__name__)
 
+# bytes.translate() table folding ASCII a-z to A-Z, for comparing raw 8.3
+# names case-insensitively without a str round-trip
+_UPPER_83_TABLE = bytes(c - 0x20 if 0x61 <= c <= 0x7A else c for c in range(256))
+
+@lru_cache(maxsize=4096)
 def decode_fat_time(time_value: int) -> str:
     """Decode FAT time format to HH:MM:SS string
 
+    Results are cached; files copied together share timestamps.
+
     Bits 15-11: Hours (0-23)
     Bits 10-5: Minutes (0-59)
     Bits 4-0: Seconds/2 (0-29, multiply by 2 to get actual seconds)
@@ -32,9 +39,12 @@ def decode_fat_time(time_value: int) -> str:
     return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
 
 
+@lru_cache(maxsize=4096)
 def decode_fat_date(date_value: int) -> str:
     """Decode FAT date format to YYYY-MM-DD string
 
+    Results are cached; files copied together share timestamps.
+
     Bits 15-9: Year (0 = 1980, 127 = 2107)
     Bits 8-5: Month (1-12)
     Bits 4-0: Day (1-31)
@@ -120,7 +130,7 @@ def is_valid_83_char(char: str) -> bool:
 
 
 def generate_83_name(
-    long_name: str, existing_names: List[str] = None, use_numeric_tail: bool = False
+    long_name: str, existing_names: Collection[str] = None, use_numeric_tail: bool = False
 ) -> str:
     """Generate a valid 8.3 filename from a long filename (Windows-compatible behavior)
 
@@ -134,14 +144,15 @@ def generate_83_name(
 
     Args:
         long_name: The original long filename
-        existing_names: List of existing 8.3 names to avoid collisions (11-byte format)
+        existing_names: Existing 8.3 names to avoid collisions (11-byte format).
+            Pass a set when there are many; each candidate is tested against it.
         use_numeric_tail: Whether to use numeric tails (~1, ~2, etc.) for uniqueness
 
     Returns:
         Valid 8.3 filename (11 bytes, no dot)
     """
     if existing_names is None:
-        existing_names = []
+        existing_names = frozenset()
 
     # Split name and extension
     path_obj = Path(long_name)
@@ -237,12 +248,20 @@ def generate_83_name(
 def calculate_lfn_checksum(short_name: bytes) -> int:
     """Calculate checksum for LFN entries
 
+    Results are cached per name; a directory's names are checked again on
+    every read.
+
     Args:
         short_name: 11-byte short filename (8.3 format, no dot)
 
     Returns:
         Checksum byte
     """
+    return _lfn_checksum(bytes(short_name))
+
+
+@lru_cache(maxsize=1024)
+def _lfn_checksum(short_name: bytes) -> int:
     checksum = 0
     for byte in short_name:
         checksum = ((checksum >> 1) | (checksum << 7)) & 0xFF
@@ -338,7 +357,7 @@ def parse_raw_lfn_entry(entry_data: bytes) -> dict:
     seq_num = seq & 0x1F
     checksum = entry_data[LFN_CHECKSUM_OFFSET]
     lfn_type = entry_data[12]
-    first_cluster = struct.unpack('<H', entry_data[26:28])[0]
+    first_cluster = int.from_bytes(entry_data[26:28], 'little')
     attr = entry_data[LFN_ATTR_OFFSET]
     
     chars1 = entry_data[1:11]
@@ -389,6 +408,25 @@ def decode_raw_83_name(entry_data: bytes, errors: str = 'replace') -> str:
     return bytes(raw).decode('ascii', errors=errors)
 
 
+def decode_raw_83_name_upper(entry_data: bytes) -> str:
+    """
+    Decode raw 11-byte 8.3 name in uppercase, for collision detection.
+
+    Same result as decode_raw_83_name(entry_data).upper(), but the case is
+    folded on the bytes with a translation table before decoding.
+
+    Args:
+        entry_data: Raw entry bytes (first 11 bytes used).
+
+    Returns:
+        Decoded uppercase string.
+    """
+    raw = entry_data[0:DIR_SHORT_NAME_LEN].translate(_UPPER_83_TABLE)
+    if raw[0] == 0x05:
+        raw = b'\xE5' + raw[1:]
+    return raw.decode('ascii', errors='replace')
+
+
 def parse_raw_short_entry(entry_data: bytes) -> dict:
     """
     Parse a raw 32-byte short (8.3) entry into a dictionary of fields.
@@ -404,14 +442,14 @@ def parse_raw_short_entry(entry_data: bytes) -> dict:
     attributes = entry_data[DIR_ATTR_OFFSET]
     reserved = entry_data[12]
     creation_time_tenth = entry_data[DIR_CRT_TIME_TENTH_OFFSET]
-    creation_time = struct.unpack('<H', entry_data[14:16])[0]
-    creation_date = struct.unpack('<H', entry_data[16:18])[0]
-    last_access_date = struct.unpack('<H', entry_data[18:20])[0]
-    first_cluster_high = struct.unpack('<H', entry_data[20:22])[0]
-    last_modified_time = struct.unpack('<H', entry_data[DIR_LAST_MOD_TIME_OFFSET:DIR_LAST_MOD_TIME_OFFSET+2])[0]
-    last_modified_date = struct.unpack('<H', entry_data[24:26])[0]
-    first_cluster_low = struct.unpack('<H', entry_data[26:28])[0]
-    file_size = struct.unpack('<I', entry_data[28:32])[0]
+    creation_time = int.from_bytes(entry_data[14:16], 'little')
+    creation_date = int.from_bytes(entry_data[16:18], 'little')
+    last_access_date = int.from_bytes(entry_data[18:20], 'little')
+    first_cluster_high = int.from_bytes(entry_data[20:22], 'little')
+    last_modified_time = int.from_bytes(entry_data[DIR_LAST_MOD_TIME_OFFSET:DIR_LAST_MOD_TIME_OFFSET+2], 'little')
+    last_modified_date = int.from_bytes(entry_data[24:26], 'little')
+    first_cluster_low = int.from_bytes(entry_data[26:28], 'little')
+    file_size = int.from_bytes(entry_data[28:32], 'little')
     
     # Decode attribute flags
     attr_flags = []
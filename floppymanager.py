@@ -25,11 +25,11 @@ from PySide6.QtWidgets import (
     QDialog, QToolBar, QStyle, QHeaderView, QLineEdit
 )
 from PySide6.QtCore import Qt, QSettings, QTimer, QSize, QMimeData, QUrl
-from PySide6.QtGui import QIcon, QAction, QKeySequence, QActionGroup, QPalette, QColor, QPainter, QPixmap 
+from PySide6.QtGui import QIcon, QAction, QKeySequence, QActionGroup, QPalette, QColor, QPainter, QPixmap, QShortcut
 
 from fat12_backend.handler import FAT12Image
 from fat12_backend.directory import FAT12Error, FAT12CorruptionError
-from fat12_backend.vfat_utils import format_83_name, decode_fat_datetime
+from fat12_backend.vfat_utils import format_83_name, decode_fat_datetime, generate_83_name
 
 from gui.components import (
     BootSectorViewer, DirectoryViewer, FATViewer, FileAttributesDialog,
@@ -84,6 +84,8 @@ class FloppyManagerWindow(QMainWindow):
         self.image_path = image_path
         self.image = None
         self.log_viewer = None
+        # Last root listing read: (image, write generation, entries)
+        self._root_cache = None
         
         # Initialize clipboard manager
         self.clipboard_mgr = ClipboardManager(self.logger)
@@ -166,6 +168,9 @@ class FloppyManagerWindow(QMainWindow):
 
         # Configure tree
         self.table.setAlternatingRowColors(True)
+        # Every row is one line of text with a 16px icon; with uniform heights
+        # the view lays out rows without measuring each item
+        self.table.setUniformRowHeights(True)
         self.table.setSortingEnabled(True)
         # Disable all automatic edit triggers - we'll handle this manually
         self.table.setEditTriggers(QTreeWidget.EditTrigger.NoEditTriggers)
@@ -189,8 +194,9 @@ class FloppyManagerWindow(QMainWindow):
         header = self.table.header()
         header.setStretchLastSection(False)
         header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        # Sized once per refresh rather than re-measured on every insert
         for i in range(1, 6):
-            header.setSectionResizeMode(i, QHeaderView.ResizeMode.ResizeToContents)
+            header.setSectionResizeMode(i, QHeaderView.ResizeMode.Interactive)
 
         # Handle clicks for rename
         self.table.clicked.connect(self.on_table_clicked)
@@ -214,8 +220,15 @@ class FloppyManagerWindow(QMainWindow):
         
         self.status_bar.showMessage("Ready | Tip: Drag and drop files to add them to the floppy")
 
-        # Keyboard shortcuts
-        self.table.keyPressEvent = self.table_key_press
+        # Keyboard shortcuts. They only fire while the tree has focus (not
+        # its rename editor); every other key keeps Qt's own handling.
+        # Alt+Return is the Properties menu action's shortcut.
+        for key, slot in ((Qt.Key.Key_Delete, self.delete_selected),
+                          (Qt.Key.Key_Backspace, self.delete_selected),
+                          (Qt.Key.Key_Escape, self.cancel_cut)):
+            shortcut = QShortcut(QKeySequence(key), self.table)
+            shortcut.setContext(Qt.ShortcutContext.WidgetShortcut)
+            shortcut.activated.connect(slot)
 
     def create_toolbar(self):
         """Create the main toolbar with professional styling"""
@@ -610,22 +623,17 @@ class FloppyManagerWindow(QMainWindow):
         """Apply the specified theme to the application"""
         app = QApplication.instance()
         
+        # No application stylesheet is ever set, so only the palette changes
         if theme_mode == 'dark':
             # Dark theme
-            app.setStyleSheet("")
-            
-            palette = get_dark_palette()
-            app.setPalette(palette)
+            app.setPalette(get_dark_palette())
             
             # Update toolbar for dark mode
             self.update_toolbar_style('dark')
             
         else:  # light (default)
             # Light theme
-            app.setStyleSheet("")
-            
-            palette = get_light_palette()
-            app.setPalette(palette)
+            app.setPalette(get_light_palette())
             
             # Update toolbar for light mode
             self.update_toolbar_style('light')
@@ -709,23 +717,13 @@ class FloppyManagerWindow(QMainWindow):
         
         self.status_bar.showMessage("Settings reset to defaults")
 
-    def table_key_press(self, event):
-        """Handle keyboard events in the table"""
-        if event.key() in (Qt.Key.Key_Delete, Qt.Key.Key_Backspace):
-            self.delete_selected()
-        elif event.key() == Qt.Key.Key_Return and event.modifiers() == Qt.KeyboardModifier.AltModifier:
-            # Alt+Return opens properties dialog
-            self.edit_file_attributes()
-        elif event.key() == Qt.Key.Key_Escape:
-            # Cancel cut operation
-            if self._cut_entries:
-                self._cut_entries = []
-                self.refresh_file_list()
-                self.status_bar.showMessage("Cut operation cancelled")
-            self.table.clearSelection()
-        else:
-            # Call the original keyPressEvent
-            QTreeWidget.keyPressEvent(self.table, event)
+    def cancel_cut(self):
+        """Cancel a pending cut operation and clear the selection (Escape)"""
+        if self._cut_entries:
+            self._cut_entries = []
+            self.refresh_file_list()
+            self.status_bar.showMessage("Cut operation cancelled")
+        self.table.clearSelection()
 
     def load_image(self, filepath: str):
         """Load a floppy disk image"""
@@ -735,6 +733,9 @@ class FloppyManagerWindow(QMainWindow):
             self.clipboard_mgr.cleanup()
             QApplication.clipboard().clear()
         
+        if self.image:
+            self.image.close()
+
         try:
             self.image = FAT12Image(filepath)
             self.image_path = filepath
@@ -757,19 +758,10 @@ class FloppyManagerWindow(QMainWindow):
         """Handle search text changes"""
         self.refresh_file_list()
 
-    def _is_entry_cut(self, entry):
-        """Check if an entry is in the cut list"""
-        for cut_entry in self._cut_entries:
-            # Compare parent cluster and name
-            p1 = cut_entry.get('parent_cluster')
-            if p1 == 0: p1 = None
-            p2 = entry.get('parent_cluster')
-            if p2 == 0: p2 = None
-            
-            if p1 == p2 and cut_entry.get('name') == entry.get('name'):
-                return True
-        return False
-    
+    def _cut_entry_key(self, entry):
+        """Key identifying an entry in the cut list: (normalized parent cluster, name)"""
+        return (self._normalize_parent_cluster(entry.get('parent_cluster')), entry.get('name'))
+
     def _normalize_parent_cluster(self, parent_cluster):
         """Normalize parent cluster: convert 0 or None to None for consistency"""
         if parent_cluster is None or parent_cluster == 0:
@@ -843,6 +835,30 @@ class FloppyManagerWindow(QMainWindow):
                 sort_col = header.sortIndicatorSection()
                 ascending = (header.sortIndicatorOrder() == Qt.SortOrder.AscendingOrder)
 
+                # Pre-sort entries to match current table sort state
+                # This prevents visual jumping/flickering when sorting is re-enabled
+                def get_sort_key(e):
+                    # Primary: Directories first (0) vs Files (1)
+                    type_group = 0 if e['is_dir'] else 1
+                    
+                    # Secondary: Column data
+                    val = ""
+                    if sort_col == 0: val = e['name'].lower()
+                    elif sort_col == 1: val = e['short_name'].lower()
+                    elif sort_col == 2: val = (e['last_modified_date'] << 16) + e['last_modified_time']
+                    elif sort_col == 3: val = e['file_type'].lower()
+                    elif sort_col == 4: val = e['size']
+                    elif sort_col == 5: val = e['attributes']
+                    else: val = e['name'].lower()
+                    
+                    return (type_group, val)
+
+                # Key the cut list once rather than rescanning it per entry
+                cut_keys = {self._cut_entry_key(e) for e in self._cut_entries}
+
+                # Every filename cell gets the same flags; compute them once
+                editable_flags = SortableTreeWidgetItem().flags() | Qt.ItemFlag.ItemIsEditable
+
                 # Iterative approach to prevent stack overflow and segfaults
                 # Stack contains tuples: (parent_item, cluster_id)
                 # Start with Root (cluster None)
@@ -861,29 +877,16 @@ class FloppyManagerWindow(QMainWindow):
                     visited_dirs.add(cluster_key)
 
                     entries = self.image.read_directory(cluster)
+                    if cluster is None:
+                        self._root_cache = (self.image, self.image.write_generation, list(entries))
                     
-                    # Pre-sort entries to match current table sort state
-                    # This prevents visual jumping/flickering when sorting is re-enabled
-                    def get_sort_key(e):
-                        # Primary: Directories first (0) vs Files (1)
-                        type_group = 0 if e['is_dir'] else 1
-                        
-                        # Secondary: Column data
-                        val = ""
-                        if sort_col == 0: val = e['name'].lower()
-                        elif sort_col == 1: val = e['short_name'].lower()
-                        elif sort_col == 2: val = (e['last_modified_date'] << 16) + e['last_modified_time']
-                        elif sort_col == 3: val = e['file_type'].lower()
-                        elif sort_col == 4: val = e['size']
-                        elif sort_col == 5: val = e['attributes']
-                        else: val = e['name'].lower()
-                        
-                        return (type_group, val)
-
                     entries.sort(key=get_sort_key)
                     if not ascending:
                         entries.reverse()
-                    
+
+                    # Items are built detached and added to the tree in one
+                    # call per directory
+                    items = []
                     for entry in entries:
                         if entry['name'] in ('.', '..'): continue
                         
@@ -900,17 +903,15 @@ class FloppyManagerWindow(QMainWindow):
                         entry['parent_cluster'] = cluster
 
                         # Create item
-                        if parent_item:
-                            item = SortableTreeWidgetItem(parent_item)
-                        else:
-                            item = SortableTreeWidgetItem(self.table)
+                        item = SortableTreeWidgetItem()
+                        items.append(item)
                         
                         # Store entry data
                         item.setData(0, Qt.ItemDataRole.UserRole, entry)
 
                         # Filename (0)
                         item.setText(0, entry['name'])
-                        item.setFlags(item.flags() | Qt.ItemFlag.ItemIsEditable)
+                        item.setFlags(editable_flags)
                         
                         # Short Name (1)
                         item.setText(1, entry['short_name'])
@@ -940,6 +941,7 @@ class FloppyManagerWindow(QMainWindow):
                         else:
                             item.setText(4, f"{entry['size']:,} bytes")
                             item.setData(4, Qt.ItemDataRole.UserRole, entry['size'])
+                        item.setTextAlignment(4, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
 
                         # Attr (5)
                         attr_str = ""
@@ -966,7 +968,7 @@ class FloppyManagerWindow(QMainWindow):
                         item.setIcon(0, self.icon_provider.get_icon(entry))
                         
                         # Check if cut
-                        if self._is_entry_cut(entry):
+                        if cut_keys and self._cut_entry_key(entry) in cut_keys:
                             self._dim_item(item, True)
                         
                         if entry['is_dir']:
@@ -974,6 +976,11 @@ class FloppyManagerWindow(QMainWindow):
                         else:
                             file_count += 1
 
+                    if parent_item:
+                        parent_item.addChildren(items)
+                    else:
+                        self.table.addTopLevelItems(items)
+
                 fmt_name = self.image.get_format_name()
                 self.info_label.setText(f"{fmt_name} | {file_count} files | {self.image.get_free_space():,} bytes free")
                 self.status_bar.showMessage(f"Loaded {file_count} files")
@@ -986,6 +993,8 @@ class FloppyManagerWindow(QMainWindow):
         finally:
             # Re-enable sorting immediately (no timer) to prevent flicker
             self.table.setSortingEnabled(True)
+            for i in range(1, 6):
+                self.table.resizeColumnToContents(i)
             self.table.setUpdatesEnabled(True)
             self.table.blockSignals(False)
 
@@ -1078,93 +1087,110 @@ class FloppyManagerWindow(QMainWindow):
         success_count = 0
         fail_count = 0
 
-        for filepath in filenames:
-            path_obj = Path(filepath)
-            original_name = path_obj.name
-            try:
-                with open(filepath, 'rb') as f:
-                    data = f.read()
+        # Index the target directory once. Files added below go into the
+        # index as they are written, so no file re-reads the directory.
+        existing_83 = set(self.image.get_existing_83_names_in_directory(parent_cluster))
+        by_name, by_short = self._index_directory(parent_cluster)
 
-                # Get modification time
+        # One fsync covers every file added
+        with self.image.batch():
+            for filepath in filenames:
+                path_obj = Path(filepath)
+                original_name = path_obj.name
                 try:
-                    stat = path_obj.stat()
-                    modification_dt = datetime.fromtimestamp(stat.st_mtime)
-                except Exception:
-                    modification_dt = None
-
-                # Predict the 8.3 name that will be used
-                short_name_83 = self.image.predict_short_name(original_name, self.use_numeric_tail, parent_cluster)
-                
-                # Format 8.3 name for display (add dot back)
-                short_display = format_83_name(short_name_83)
+                    # Get modification time
+                    try:
+                        stat = path_obj.stat()
+                        modification_dt = datetime.fromtimestamp(stat.st_mtime)
+                    except Exception:
+                        modification_dt = None
 
-                # Check if file already exists
-                # Check in the specific directory
-                entries = self.image.read_directory(parent_cluster)
+                    # Predict the 8.3 name that will be used
+                    short_name_83 = generate_83_name(original_name, existing_83, self.use_numeric_tail)
                 
-                # Check for LFN collision (case-insensitive) first
-                collision_entry = next((e for e in entries if e['name'].lower() == original_name.lower()), None)
-
-                if not collision_entry:
-                    # Check for Short Name collision if no LFN collision found
-                    collision_entry = next((e for e in entries if e['short_name'].upper() == short_name_83), None)
-
-                if collision_entry:
-                    if rename_on_collision:
-                        # Generate new name to avoid collision (e.g. "File - Copy.txt")
-                        name_parts = os.path.splitext(original_name)
-                        base_name = f"{name_parts[0]} - Copy"
-                        extension = name_parts[1]
+                    # Format 8.3 name for display (add dot back)
+                    short_display = format_83_name(short_name_83)
+
+                    # Check if file already exists
+                    # Check for LFN collision (case-insensitive) first
+                    collision_entry = by_name.get(original_name.lower())
+
+                    if not collision_entry:
+                        # Check for Short Name collision if no LFN collision found
+                        collision_entry = by_short.get(short_name_83)
+
+                    if collision_entry:
+                        if rename_on_collision:
+                            # Generate new name to avoid collision (e.g. "File - Copy.txt")
+                            name_parts = os.path.splitext(original_name)
+                            base_name = f"{name_parts[0]} - Copy"
+                            extension = name_parts[1]
                         
-                        new_name = f"{base_name}{extension}"
+                            new_name = f"{base_name}{extension}"
                         
-                        # Check for collisions with new name
-                        existing_names_lfn = {e['name'].lower() for e in entries}
+                            # Check for collisions with new name
+                            counter = 2
+                            while new_name.lower() in by_name:
+                                new_name = f"{base_name} ({counter}){extension}"
+                                counter += 1
                         
-                        counter = 2
-                        while new_name.lower() in existing_names_lfn:
-                            new_name = f"{base_name} ({counter}){extension}"
-                            counter += 1
-                        
-                        original_name = new_name
-                        # Do not delete existing file, we are creating a copy
-                    else:
-                        if self.confirm_replace:
-                            msg = f"The file '{original_name}' will be saved with 8.3 name '{short_display}', which already exists"
-                            if collision_entry['name'] != collision_entry['short_name']:
-                                msg += f" (long name: '{collision_entry['name']}')"
-                            msg += ".\n\nDo you want to replace it?"
+                            original_name = new_name
+                            short_name_83 = generate_83_name(original_name, existing_83, self.use_numeric_tail)
+                            # Do not delete existing file, we are creating a copy
+                        else:
+                            if self.confirm_replace:
+                                msg = f"The file '{original_name}' will be saved with 8.3 name '{short_display}', which already exists"
+                                if collision_entry['name'] != collision_entry['short_name']:
+                                    msg += f" (long name: '{collision_entry['name']}')"
+                                msg += ".\n\nDo you want to replace it?"
                             
-                            response = QMessageBox.question(
-                                self,
-                                "File Exists",
-                                msg,
-                                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
-                            )
-                            if response == QMessageBox.StandardButton.No:
-                                continue
+                                response = QMessageBox.question(
+                                    self,
+                                    "File Exists",
+                                    msg,
+                                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+                                )
+                                if response == QMessageBox.StandardButton.No:
+                                    continue
+
+                            # Delete the existing file
+                            self.image.delete_file(collision_entry)
+                            by_name.pop(collision_entry['name'].lower(), None)
+                            raw_name = collision_entry['raw_short_name'].upper()
+                            by_short.pop(raw_name, None)
+                            existing_83.discard(raw_name)
+                            # The new file may now take the freed 8.3 name
+                            short_name_83 = generate_83_name(original_name, existing_83, self.use_numeric_tail)
+
+                    # Read the file only once it is certain to be written,
+                    # so no contents are held while a prompt is open
+                    data = path_obj.read_bytes()
+
+                    # Write the new file
+                    new_entry = self.image.write_file_to_image(original_name, data, self.use_numeric_tail, modification_dt, parent_cluster)
+                    del data
+                    success_count += 1
 
-                        # Delete the existing file
-                        self.image.delete_file(collision_entry)
+                    # Record its entry in the index under the 8.3 name it was given
+                    raw_name = new_entry['raw_short_name'].upper()
+                    by_name.setdefault(new_entry['name'].lower(), new_entry)
+                    by_short.setdefault(raw_name, new_entry)
+                    existing_83.add(raw_name)
 
-                # Write the new file
-                self.image.write_file_to_image(original_name, data, self.use_numeric_tail, modification_dt, parent_cluster)
-                success_count += 1
-
-            except FAT12CorruptionError as e:
-                fail_count += 1
-                self.logger.error(f"Corruption error writing {original_name}: {e}")
-                QMessageBox.critical(self, "Filesystem Corruption", f"Cannot write {Path(filepath).name}:\n{e}")
+                except FAT12CorruptionError as e:
+                    fail_count += 1
+                    self.logger.error(f"Corruption error writing {original_name}: {e}")
+                    QMessageBox.critical(self, "Filesystem Corruption", f"Cannot write {Path(filepath).name}:\n{e}")
 
-            except FAT12Error as e:
-                fail_count += 1
-                self.logger.warning(f"FAT12 error writing {original_name}: {e}")
-                QMessageBox.warning(self, "Error", f"Failed to write {Path(filepath).name}: {e}")
+                except FAT12Error as e:
+                    fail_count += 1
+                    self.logger.warning(f"FAT12 error writing {original_name}: {e}")
+                    QMessageBox.warning(self, "Error", f"Failed to write {Path(filepath).name}: {e}")
 
-            except Exception as e:
-                fail_count += 1
-                self.logger.error(f"Unexpected error writing {original_name}: {e}", exc_info=True)
-                QMessageBox.critical(self, "Error", f"Failed to add {Path(filepath).name}: {e}")
+                except Exception as e:
+                    fail_count += 1
+                    self.logger.error(f"Unexpected error writing {original_name}: {e}", exc_info=True)
+                    QMessageBox.critical(self, "Error", f"Failed to add {Path(filepath).name}: {e}")
 
         if refresh:
             self.refresh_file_list()
@@ -1177,6 +1203,15 @@ class FloppyManagerWindow(QMainWindow):
             
         return success_count
 
+    def _index_directory(self, parent_cluster):
+        """Index a directory's entries by lowercase long name and by 11-character 8.3 name"""
+        by_name, by_short = {}, {}
+        for entry in self.image.read_directory(parent_cluster):
+            # The first entry with a name wins, as with a linear search
+            by_name.setdefault(entry['name'].lower(), entry)
+            by_short.setdefault(entry['raw_short_name'].upper(), entry)
+        return by_name, by_short
+
     def create_new_folder(self):
         """Create a new directory"""
         if not self.image:
@@ -1294,13 +1329,21 @@ class FloppyManagerWindow(QMainWindow):
             self.status_bar.showMessage(f"Extracted {success_count} file(s) to {save_dir}")
             QMessageBox.information(self, "Success", f"Extracted {success_count} file(s)")
 
+    def _root_entries(self):
+        """Root directory entries, re-read only if the image was written since the last read"""
+        cached = self._root_cache
+        if cached is None or cached[0] is not self.image or cached[1] != self.image.write_generation:
+            cached = self._root_cache = (self.image, self.image.write_generation,
+                                         self.image.read_root_directory())
+        return cached[2]
+
     def extract_all(self):
         """Extract all files"""
         if not self.image:
             QMessageBox.information(self, "No Image Loaded", "No image loaded.")
             return
 
-        entries = self.image.read_root_directory()
+        entries = self._root_entries()
         files_to_extract = [e for e in entries if not e['is_dir']]
 
         if not files_to_extract:
@@ -1349,7 +1392,7 @@ class FloppyManagerWindow(QMainWindow):
             QMessageBox.information(self, "No Image Loaded", "No image loaded.")
             return
 
-        entries = self.image.read_root_directory()
+        entries = self._root_entries()
         files_to_extract = [e for e in entries if not e['is_dir']]
 
         if not files_to_extract:
@@ -1456,24 +1499,26 @@ class FloppyManagerWindow(QMainWindow):
                 return
 
         # Proceed with deletion
-        for entry in items_to_delete:
-            if entry.get('is_dir'):
-                try:
-                    self.image.delete_directory(entry, recursive=True)
-                    success_count += 1
-                except FAT12CorruptionError as e:
-                    self.logger.error(f"Corruption deleting directory {entry['name']}: {e}")
-                    QMessageBox.critical(self, "Filesystem Corruption", f"Cannot delete directory {entry['name']}:\n{e}")
-                except FAT12Error as e:
-                    self.logger.warning(f"Failed to delete directory {entry['name']}: {e}")
-                    QMessageBox.critical(self, "Error", f"Failed to delete directory {entry['name']}: {e}")
-            else:
-                try:
-                    self.image.delete_file(entry)
-                    success_count += 1
-                except FAT12Error as e:
-                    self.logger.warning(f"Failed to delete file {entry['name']}: {e}")
-                    QMessageBox.critical(self, "Error", f"Failed to delete {entry['name']}: {e}")
+        # One fsync covers every item deleted
+        with self.image.batch():
+            for entry in items_to_delete:
+                if entry.get('is_dir'):
+                    try:
+                        self.image.delete_directory(entry, recursive=True)
+                        success_count += 1
+                    except FAT12CorruptionError as e:
+                        self.logger.error(f"Corruption deleting directory {entry['name']}: {e}")
+                        QMessageBox.critical(self, "Filesystem Corruption", f"Cannot delete directory {entry['name']}:\n{e}")
+                    except FAT12Error as e:
+                        self.logger.warning(f"Failed to delete directory {entry['name']}: {e}")
+                        QMessageBox.critical(self, "Error", f"Failed to delete directory {entry['name']}: {e}")
+                else:
+                    try:
+                        self.image.delete_file(entry)
+                        success_count += 1
+                    except FAT12Error as e:
+                        self.logger.warning(f"Failed to delete file {entry['name']}: {e}")
+                        QMessageBox.critical(self, "Error", f"Failed to delete {entry['name']}: {e}")
 
         self.refresh_file_list()
 
@@ -1936,6 +1981,7 @@ class FloppyManagerWindow(QMainWindow):
     def close_image(self):
         """Close the currently open image"""
         if self.image:
+            self.image.close()
             self.image = None
             self.image_path = None
             self.setWindowTitle("FloppyManager")
@@ -1984,6 +2030,7 @@ class FloppyManagerWindow(QMainWindow):
         # Cleanup temp dir
         self._cleanup_temp_dir()
 
+        self.close_image()
         event.accept()
 
     def on_selection_changed(self):
@@ -2110,15 +2157,19 @@ class FloppyManagerWindow(QMainWindow):
             
             # Update the attributes
             try:
-                self.image.set_entry_attributes(
+                changed = self.image.set_entry_attributes(
                     entry,
                     is_read_only=attrs['is_read_only'],
                     is_hidden=attrs['is_hidden'],
                     is_system=attrs['is_system'],
                     is_archive=attrs['is_archive']
                 )
-                self.status_bar.showMessage(f"Attributes updated for {entry['name']}", 3000)
-                self.refresh_file_list()
+                if changed:
+                    self.status_bar.showMessage(f"Attributes updated for {entry['name']}", 3000)
+                    self.refresh_file_list()
+                else:
+                    # Nothing was written, so the listing is still current
+                    self.status_bar.showMessage(f"Attributes unchanged for {entry['name']}", 3000)
             except FAT12Error as e:
                 QMessageBox.critical(
                     self,
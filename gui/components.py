@@ -905,8 +905,9 @@ class SortableTreeWidgetItem(QTreeWidgetItem):
         other_data = other.data(column, Qt.ItemDataRole.UserRole)
         
         if my_data is not None and other_data is not None:
-            # For column 0 (Filename), UserRole is the entry dict. Fall back to text sorting.
-            if not isinstance(my_data, dict):
+            # For column 0 (Filename), UserRole is the entry itself rather
+            # than a sort key. Fall back to text sorting.
+            if column != 0:
                 return my_data < other_data
             
         # Fallback to default text-based sorting for the column
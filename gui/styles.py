@@ -3,8 +3,14 @@
 # Copyright (c) 2026 Stephen P Smith
 # MIT License
 
+from functools import lru_cache
+
 from PySide6.QtGui import QPalette, QColor
 
+# Palettes are built once and shared; QApplication.setPalette() copies them,
+# so callers must not modify the returned objects
+
+@lru_cache(maxsize=None)
 def get_dark_palette():
     palette = QPalette()
     palette.setColor(QPalette.ColorRole.Window, QColor(53, 53, 53))
@@ -31,6 +37,7 @@ def get_dark_palette():
     palette.setColor(QPalette.ColorGroup.Disabled, QPalette.ColorRole.HighlightedText, disabled_color)
     return palette
 
+@lru_cache(maxsize=None)
 def get_light_palette():
     palette = QPalette()
     palette.setColor(QPalette.ColorRole.Window, QColor(240, 240, 240))
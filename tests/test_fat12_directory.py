@@ -3,12 +3,18 @@
 # Copyright (c) 2026 Stephen P Smith
 # MIT License
 
+import json
 import pytest
+from dataclasses import fields
+from unittest.mock import patch
+import fat12_backend.directory
 from fat12_backend.handler import FAT12Image
 from fat12_backend.directory import (
-    iter_directory_entries, get_entry_offset, 
+    iter_directory_entries, directory_has_name, get_entry_offset, get_directory_clusters,
+    make_entry_offset_fn,
     get_existing_83_names_in_directory, find_free_directory_entries,
-    free_cluster_chain, FAT12Error, FAT12CorruptionError
+    free_cluster_chain, delete_directory_entries, find_free_root_entries,
+    DirEntry, FAT12Error, FAT12CorruptionError
 )
 
 # =============================================================================
@@ -20,7 +26,8 @@ def handler(tmp_path):
     """Create a fresh FAT12 image for testing"""
     img_path = tmp_path / "test_dir.img"
     FAT12Image.create_empty_image(str(img_path))
-    return FAT12Image(str(img_path))
+    with FAT12Image(str(img_path)) as image:
+        yield image
 
 
 @pytest.fixture
@@ -108,6 +115,39 @@ class TestDirectoryCreation:
         assert child is not None
         assert child['is_dir']
 
+    def test_create_directory_reads_parent_once(self, handler):
+        handler.create_directory("PARENT")
+        parent = next(e for e in handler.read_root_directory() if e['name'] == "PARENT")
+        handler.write_file_to_image("Child Directory2", b"data", parent_cluster=parent['cluster'])
+
+        with patch('fat12_backend.directory.iter_directory_entries',
+                   wraps=iter_directory_entries) as mock_iter:
+            handler.create_directory("Child Directory", parent_cluster=parent['cluster'])
+        mock_iter.assert_called_once()
+
+        # The one scan still sees the existing alias and a free slot
+        with FAT12Image(handler.image_path) as image:
+            entries = {e['name']: e for e in image.read_directory(parent['cluster'])}
+            child = entries["Child Directory"]
+            assert child['is_dir']
+            assert child['short_name'] != entries["Child Directory2"]['short_name']
+            assert child['index'] > entries["Child Directory2"]['index']
+            assert [e['name'] for e in image.read_directory(child['cluster'])][:2] == ['.', '..']
+
+    def test_directory_has_name(self, handler):
+        handler.write_file_to_image("Long File Name.txt", b"data")
+        handler.write_file_to_image("SHORT.TXT", b"data")
+        entry = next(e for e in handler.read_root_directory() if e['name'] == "Long File Name.txt")
+
+        assert directory_has_name(handler, None, "long file name.TXT")
+        assert directory_has_name(handler, None, "short.txt")
+        assert not directory_has_name(handler, None, "missing.txt")
+        # The short alias of an entry with a long name is not its display name
+        assert not directory_has_name(handler, None, entry['short_name'])
+        # The entry being renamed does not collide with itself
+        assert not directory_has_name(handler, None, "Long File Name.txt",
+                                      exclude_index=entry['index'])
+
 
 class TestDirectoryDeletion:
     def test_delete_empty_directory(self, handler):
@@ -141,6 +181,67 @@ class TestDirectoryDeletion:
         assert not any(e['name'] == "RECURSIVE" for e in entries)
 
 
+    def test_delete_recursive_writes_fat_once(self, handler):
+        handler.create_directory("TOP")
+        top = next(e for e in handler.read_root_directory() if e['name'] == "TOP")
+        handler.create_directory("NESTED", top['cluster'])
+        nested = next(e for e in handler.read_directory(top['cluster']) if e['name'] == "NESTED")
+        for i in range(3):
+            handler.write_file_to_image(f"F{i}.BIN", b"x" * 1500, parent_cluster=nested['cluster'])
+        handler.write_file_to_image("TOP.BIN", b"y" * 600, parent_cluster=top['cluster'])
+        used = [cluster for cluster in range(2, handler.total_clusters + 2)
+                if handler.get_fat_entry(handler.read_fat(), cluster) != 0]
+
+        with patch.object(handler, 'write_fat', wraps=handler.write_fat) as mock_write_fat:
+            handler.delete_directory(top, recursive=True)
+        mock_write_fat.assert_called_once()
+
+        with FAT12Image(handler.image_path) as image:
+            fat = image.read_fat()
+            assert all(image.get_fat_entry(fat, cluster) == 0 for cluster in used)
+            assert image.read_root_directory() == []
+
+    def test_delete_recursive_failure_frees_deleted_entries(self, handler):
+        handler.create_directory("SUB")
+        sub = next(e for e in handler.read_root_directory() if e['name'] == "SUB")
+        handler.write_file_to_image("A.BIN", b"a" * 1500, parent_cluster=sub['cluster'])
+        handler.write_file_to_image("B.BIN", b"b" * 1500, parent_cluster=sub['cluster'])
+        chains = {e['name']: handler.get_cluster_chain(e['cluster'])
+                  for e in handler.read_directory(sub['cluster'])
+                  if e['name'] in ("A.BIN", "B.BIN")}
+
+        # Fail on the second child, after the first is already deleted on disk
+        real_delete = fat12_backend.directory.delete_directory_entry
+        calls = []
+        def fail_second(*args, **kwargs):
+            calls.append(args)
+            if len(calls) == 2:
+                raise OSError("write failed")
+            return real_delete(*args, **kwargs)
+
+        with patch('fat12_backend.directory.delete_directory_entry', side_effect=fail_second):
+            with pytest.raises(OSError):
+                handler.delete_directory(sub, recursive=True)
+
+        with FAT12Image(handler.image_path) as image:
+            fat = image.read_fat()
+            names = {e['name'] for e in image.read_directory(sub['cluster'])}
+            assert "A.BIN" not in names and "B.BIN" in names
+            assert all(image.get_fat_entry(fat, cluster) == 0 for cluster in chains["A.BIN"])
+            assert image.get_cluster_chain(chains["B.BIN"][0]) == chains["B.BIN"]
+
+    def test_delete_recursive_syncs_once(self, handler):
+        handler.create_directory("TOP")
+        top = next(e for e in handler.read_root_directory() if e['name'] == "TOP")
+        for i in range(4):
+            handler.write_file_to_image(f"F{i}.BIN", b"x" * 600, parent_cluster=top['cluster'])
+
+        with patch.object(handler, '_sync', wraps=handler._sync) as mock_sync:
+            handler.delete_directory(top, recursive=True)
+        mock_sync.assert_called_once()
+        assert not handler._unsynced_writes
+        assert handler.read_root_directory() == []
+
 class TestFileOperationsInDirectory:
     def test_write_file_to_subdir(self, handler):
         handler.create_directory("DOCS")
@@ -167,6 +268,28 @@ class TestFileOperationsInDirectory:
         sub_entries = handler.read_directory(trash['cluster'])
         assert not any(e['name'] == "JUNK.TXT" for e in sub_entries)
 
+    def test_delete_long_name_across_clusters(self, handler):
+        handler.create_directory("TRASH")
+        trash = next(e for e in handler.read_root_directory() if e['name'] == "TRASH")
+        # '.', '..' and 11 files put the LFN slots at 13-15, the short entry at 16
+        for i in range(11):
+            handler.write_file_to_image(f"F{i}.TXT", b"", parent_cluster=trash['cluster'])
+        handler.write_file_to_image("A Long Name Across Clusters.txt", b"x",
+                                    parent_cluster=trash['cluster'])
+        junk = handler.read_directory(trash['cluster'])[-1]
+        assert junk['index'] == 16
+
+        with patch.object(handler, '_pwrite', wraps=handler._pwrite) as mock_write:
+            handler.delete_file(junk)
+        # The directory's two clusters are adjacent, so one write marks all
+        # four slots
+        slot_writes = [c for c in mock_write.call_args_list if c.args[1] >= handler.data_start]
+        assert len(slot_writes) == 1
+
+        raw = dict(iter_directory_entries(handler, trash['cluster']))
+        assert [raw[i][0] for i in range(12, 17)] == [ord('F'), 0xE5, 0xE5, 0xE5, 0xE5]
+        assert [e['name'] for e in handler.read_directory(trash['cluster'])][-1] == "F10.TXT"
+
 
 # =============================================================================
 # DIRECTORY INTERNALS
@@ -195,6 +318,17 @@ class TestIterDirectoryEntries:
         assert idx == 1
         assert data[:5] == b"FILE2"
 
+    def test_iter_root_skips_fat(self, handler):
+        """Test that the root directory is read without touching the FAT"""
+        handler.write_file_to_image("FILE1.TXT", b"1")
+        with patch.object(handler, 'read_fat', wraps=handler.read_fat) as mock_read_fat:
+            slots = list(iter_directory_entries(handler, None))
+            entries = handler.read_root_directory()
+        mock_read_fat.assert_not_called()
+        assert [index for index, _ in slots] == list(range(handler.root_entries))
+        assert slots[0][1][:11] == b"FILE1   TXT"
+        assert [e['name'] for e in entries] == ["FILE1.TXT"]
+
     def test_iter_subdirectory_chain(self, handler):
         """Test iterating over a subdirectory that spans multiple clusters"""
         handler.create_directory("SUBDIR")
@@ -218,6 +352,92 @@ class TestIterDirectoryEntries:
         indices = [e[0] for e in entries]
         assert indices == list(range(32))
 
+    def test_iter_subdirectory_reads_adjacent_clusters_together(self, handler):
+        """Test that each run of adjacent clusters is read with one pread"""
+        handler.create_directory("RUNS")
+        cluster = next(e for e in handler.read_root_directory() if e['name'] == "RUNS")['cluster']
+
+        # Chain: cluster, cluster+1, then a hop to cluster+3
+        fat = handler.read_fat()
+        handler.set_fat_entry(fat, cluster, cluster + 1)
+        handler.set_fat_entry(fat, cluster + 1, cluster + 3)
+        handler.set_fat_entry(fat, cluster + 3, 0xFFF)
+        handler.write_fat(fat)
+
+        # Tag the first slot of each cluster so the order read back is visible
+        for tag, c in ((b"SECOND", cluster + 1), (b"SKIPPED", cluster + 2), (b"THIRD", cluster + 3)):
+            offset = handler.data_start + (c - 2) * handler.bytes_per_cluster
+            handler._pwrite(tag.ljust(11), offset)
+
+        with patch.object(handler, '_pread', wraps=handler._pread) as mock_pread:
+            entries = list(iter_directory_entries(handler, cluster))
+        assert mock_pread.call_count == 2
+        assert [index for index, _ in entries] == list(range(48))
+        assert entries[16][1][:11] == b"SECOND".ljust(11)
+        assert entries[32][1][:11] == b"THIRD".ljust(11)
+
+    def test_iter_subdirectory_loop_after_entries(self, handler):
+        """Test that entries before a chain loop are still yielded"""
+        handler.create_directory("LOOP")
+        cluster = next(e for e in handler.read_root_directory() if e['name'] == "LOOP")['cluster']
+        fat = handler.read_fat()
+        handler.set_fat_entry(fat, cluster, cluster)
+        handler.write_fat(fat)
+
+        entries = iter_directory_entries(handler, cluster)
+        index, data = next(entries)
+        assert index == 0 and data[:11] == b".          "
+        with pytest.raises(FAT12CorruptionError):
+            list(entries)
+
+
+class TestDirEntry:
+    def test_dict_style_access(self, handler):
+        handler.write_file_to_image("NOTE.TXT", b"content")
+        entry = handler.read_root_directory()[0]
+
+        assert isinstance(entry, DirEntry)
+        assert entry['name'] == entry.name == "NOTE.TXT"
+        assert entry.get('size') == 7
+        assert entry.get('missing', 'default') == 'default'
+        assert 'is_dir' in entry and 'missing' not in entry
+        assert entry.keys()[0] == 'name'
+        with pytest.raises(KeyError):
+            entry['keys']
+
+        entry['parent_cluster'] = 5
+        assert entry.parent_cluster == 5
+        with pytest.raises(KeyError):
+            entry['missing'] = 1
+
+    def test_keys_match_fields(self, handler):
+        handler.write_file_to_image("NOTE.TXT", b"content")
+        entry = handler.read_root_directory()[0]
+
+        # The hand-written slots and the declared fields must agree
+        assert entry.keys() == [f.name for f in fields(DirEntry)]
+        assert list(entry) == entry.keys()
+        assert entry.values() == [getattr(entry, key) for key in entry.keys()]
+
+    def test_to_dict_copy_and_update(self, handler):
+        handler.write_file_to_image("NOTE.TXT", b"content")
+        entry = handler.read_root_directory()[0]
+
+        as_dict = entry.to_dict()
+        assert type(as_dict) is dict
+        assert json.loads(json.dumps(as_dict))['name'] == "NOTE.TXT"
+        assert dict(entry.items()) == as_dict
+
+        copied = entry.copy()
+        copied['parent_cluster'] = 9
+        assert copied == DirEntry(**{**as_dict, 'parent_cluster': 9})
+        assert entry['parent_cluster'] == as_dict['parent_cluster']
+
+        entry.update({'size': 1}, cluster=3)
+        assert (entry['size'], entry['cluster']) == (1, 3)
+        with pytest.raises(KeyError):
+            entry.update(missing=1)
+
 
 class TestDirectoryInternals:
     def test_get_entry_offset_root(self, handler):
@@ -248,6 +468,35 @@ class TestDirectoryInternals:
         with pytest.raises(FAT12CorruptionError):
             get_entry_offset(handler, cluster, 16)
 
+    def test_get_entry_offset_with_cluster_list(self, handler):
+        """Test that looking entries up in a cluster list matches walking the chain"""
+        handler.create_directory("LIST")
+        sub = next(e for e in handler.read_root_directory() if e['name'] == "LIST")
+        find_free_directory_entries(handler, sub['cluster'], 40)
+        
+        clusters = get_directory_clusters(handler, sub['cluster'])
+        assert clusters == handler.get_cluster_chain(sub['cluster'])
+        assert len(clusters) == 3
+        for index in (0, 15, 16, 47):
+            assert (get_entry_offset(handler, sub['cluster'], index, clusters=clusters) ==
+                    get_entry_offset(handler, sub['cluster'], index))
+        with pytest.raises(FAT12CorruptionError):
+            get_entry_offset(handler, sub['cluster'], 48, clusters=clusters)
+
+    def test_make_entry_offset_fn(self, handler):
+        """Test that the offset function matches get_entry_offset"""
+        assert make_entry_offset_fn(handler, None)(5) == get_entry_offset(handler, None, 5)
+
+        handler.create_directory("FN")
+        sub = next(e for e in handler.read_root_directory() if e['name'] == "FN")
+        find_free_directory_entries(handler, sub['cluster'], 40)
+
+        entry_offset = make_entry_offset_fn(handler, sub['cluster'])
+        for index in (0, 15, 16, 47):
+            assert entry_offset(index) == get_entry_offset(handler, sub['cluster'], index)
+        with pytest.raises(FAT12CorruptionError):
+            entry_offset(48)
+
     def test_get_existing_names(self, handler):
         """Test retrieving existing 8.3 names"""
         handler.write_file_to_image("FILE1.TXT", b"")
@@ -274,6 +523,20 @@ class TestDirectoryInternals:
         idx = find_free_directory_entries(handler, 0, 1)
         assert idx == 1
 
+    def test_find_free_root_entries_runs(self, handler):
+        """Test that root slot search needs a long enough run of free slots"""
+        for name in ("A.TXT", "B.TXT", "C.TXT", "D.TXT"):
+            handler.write_file_to_image(name, b"")
+        entries = {e['name']: e for e in handler.read_root_directory()}
+        handler.delete_file(entries["B.TXT"])
+        handler.delete_file(entries["C.TXT"])
+        
+        assert find_free_root_entries(handler, 1) == 1
+        assert find_free_root_entries(handler, 2) == 1
+        # Three free slots in a row only exist after D.TXT
+        assert find_free_root_entries(handler, 3) == 4
+        assert find_free_root_entries(handler, handler.root_entries) == -1
+
     def test_find_free_entries_expansion(self, handler):
         """Test that finding entries triggers expansion calculation logic"""
         # Note: Actual expansion happens inside find_free_directory_entries if we call it
@@ -295,6 +558,60 @@ class TestDirectoryInternals:
         chain = handler.get_cluster_chain(sub['cluster'])
         assert len(chain) == 2
 
+    def test_find_free_entries_expansion_zeroes_new_clusters(self, handler):
+        """Test that a multi-cluster expansion clears stale data in every new cluster"""
+        handler.create_directory("GROW")
+        sub = next(e for e in handler.read_root_directory() if e['name'] == "GROW")
+        
+        # Leave junk in the clusters the expansion will take
+        stale = handler.find_free_clusters(2)
+        for cluster in stale:
+            offset = handler.data_start + (cluster - 2) * handler.bytes_per_cluster
+            handler._pwrite(b"\xAA" * handler.bytes_per_cluster, offset)
+        
+        # 14 free slots remain in the first cluster; 40 needs two more clusters
+        idx = find_free_directory_entries(handler, sub['cluster'], 40)
+        assert idx == 2
+        
+        chain = handler.get_cluster_chain(sub['cluster'])
+        assert chain[1:] == stale
+        for cluster in stale:
+            offset = handler.data_start + (cluster - 2) * handler.bytes_per_cluster
+            assert not any(handler._pread(handler.bytes_per_cluster, offset))
+
+    def test_write_entries_spanning_clusters(self, handler):
+        """Test that an LFN sequence straddling a cluster boundary reads back intact"""
+        handler.create_directory("SPAN")
+        sub = next(e for e in handler.read_root_directory() if e['name'] == "SPAN")
+        for i in range(12):
+            handler.write_file_to_image(f"F{i}.TXT", b"", parent_cluster=sub['cluster'])
+        
+        # Two slots are left in the first cluster; this name needs three LFN slots plus one
+        long_name = "A rather long file name that spans.txt"
+        handler.write_file_to_image(long_name, b"payload", parent_cluster=sub['cluster'])
+        
+        entry = next(e for e in handler.read_directory(sub['cluster']) if e['name'] == long_name)
+        assert entry['index'] == 17
+        assert handler.extract_file(entry) == b"payload"
+
+    def test_delete_directory_entries_spanning_clusters(self, handler):
+        """Test marking a run of slots deleted across a cluster boundary"""
+        handler.create_directory("SPAN")
+        sub = next(e for e in handler.read_root_directory() if e['name'] == "SPAN")
+        for i in range(12):
+            handler.write_file_to_image(f"F{i}.TXT", b"", parent_cluster=sub['cluster'])
+
+        # Slots 14 and 15 end the first cluster, 16 and 17 start the new one
+        idx = find_free_directory_entries(handler, sub['cluster'], 4)
+        assert idx == 14
+        delete_directory_entries(handler, sub['cluster'], idx, 4)
+
+        slots = dict(iter_directory_entries(handler, sub['cluster']))
+        assert [slots[i][0] for i in range(14, 18)] == [0xE5] * 4
+        assert slots[18][0] == 0x00
+        names = [e['name'] for e in handler.read_directory(sub['cluster']) if e['name'] not in ('.', '..')]
+        assert len(names) == 12
+
 
 class TestFreeClusterChain:
     def test_free_simple_chain(self, handler):
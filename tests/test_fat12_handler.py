@@ -1,16 +1,20 @@
 import pytest
 import datetime
 import struct
+import os
 from unittest.mock import patch
-from fat12_backend.handler import FAT12Image
+from fat12_backend.handler import FAT12Image, _BootSectorField
 from fat12_backend.vfat_utils import decode_fat_date, decode_fat_time, calculate_lfn_checksum
-from fat12_backend.directory import FAT12Error, FAT12CorruptionError
+from fat12_backend.directory import (FAT12Error, FAT12CorruptionError, get_entry_offset,
+                                     get_directory_clusters, read_directory,
+                                     iter_directory_entries)
 
 @pytest.fixture
 def handler(tmp_path):
     img_path = tmp_path / "test.img"
     FAT12Image.create_empty_image(str(img_path))
-    return FAT12Image(str(img_path))
+    with FAT12Image(str(img_path)) as image:
+        yield image
 
 class TestInitialization:
     def test_fat12_bit_packing(self, handler):
@@ -42,6 +46,15 @@ class TestInitialization:
         assert handler.get_fat_entry(fat_buffer, 2) == 0x000
         assert handler.get_fat_entry(fat_buffer, 3) == 0xFFF
 
+    def test_decode_fat12_matches_get_fat_entry(self, handler):
+        fat_buffer = bytearray(16)
+        for cluster, value in enumerate([0xF0F, 0xFFF, 0x003, 0xABC, 0x000, 0x123, 0xFF7, 0x800, 0x00F, 0xFF8]):
+            handler.set_fat_entry(fat_buffer, cluster, value)
+
+        entries = handler._decode_fat12(fat_buffer)
+        assert len(entries) == 10
+        assert entries == [handler.get_fat_entry(fat_buffer, c) for c in range(10)]
+
     def test_boot_sector_initialization(self, handler):
         # Verify the OEM Name from the snippet
         assert "MSDOS5.0" in handler.oem_name
@@ -80,8 +93,8 @@ class TestInitialization:
             f.seek(19); f.write(struct.pack('<H', 5000)) # Total sectors (small) -> ~5000 clusters
             f.seek(22); f.write(struct.pack('<H', 9))   # Sectors per FAT
             
-        handler = FAT12Image(str(img_path_16))
-        assert handler.fat_type == 'FAT16'
+        with FAT12Image(str(img_path_16)) as image:
+            assert image.fat_type == 'FAT16'
 
         # Test FAT32 detection
         img_path_32 = tmp_path / "test_fat32.img"
@@ -98,8 +111,45 @@ class TestInitialization:
             f.seek(32); f.write(struct.pack('<I', 70000)) # Total sectors (large) -> ~70000 clusters
             f.seek(22); f.write(struct.pack('<H', 9))
             
-        handler = FAT12Image(str(img_path_32))
-        assert handler.fat_type == 'FAT32'
+        with FAT12Image(str(img_path_32)) as image:
+            assert image.fat_type == 'FAT32'
+
+    def test_lazy_boot_sector(self, tmp_path):
+        img_path = tmp_path / "lazy.img"
+        FAT12Image.create_empty_image(str(img_path))
+
+        with patch.object(FAT12Image, '_pread', side_effect=AssertionError("Image read eagerly")):
+            image = FAT12Image(str(img_path), lazy=True)
+        with image:
+            assert image.image_path == str(img_path)
+
+            # First access to a boot sector field loads it
+            assert image.total_sectors == 2880
+            assert image.get_format_name() == '1.44MB'
+            with pytest.raises(AttributeError):
+                image.no_such_attribute
+
+    def test_failed_open_closes_image(self, tmp_path):
+        img_path = tmp_path / "short.img"
+        img_path.write_bytes(b"\x00" * 100)
+        with patch('fat12_backend.handler.os.close', wraps=os.close) as mock_close:
+            with pytest.raises(FAT12Error):
+                FAT12Image(str(img_path))
+        mock_close.assert_called_once()
+
+    def test_lazy_unknown_attribute_does_not_read(self, tmp_path):
+        with FAT12Image(str(tmp_path / "missing.img"), lazy=True) as image:
+            assert not hasattr(image, 'no_such_attr')
+            with pytest.raises(FileNotFoundError):
+                image.total_sectors
+
+    def test_lazy_fields_match_parsed_fields(self, handler):
+        # Every attribute the parser sets must be declared as a lazy field
+        declared = {name for name, value in vars(FAT12Image).items()
+                    if isinstance(value, _BootSectorField)}
+        with FAT12Image(handler.image_path, lazy=True) as lazy:
+            unparsed = set(vars(lazy))
+        assert set(vars(handler)) - unparsed - {'_boot_sector_loaded'} == declared
 
 class TestClusterManagement:
     def test_find_free_clusters(self, handler):
@@ -126,6 +176,133 @@ class TestClusterManagement:
         assert 20 not in all_free
         assert 2 in all_free
 
+    def test_allocation_hint(self, handler):
+        handler.write_file_to_image("a.bin", b"A" * 1024)
+        handler.create_directory("SUB")
+        sub = next(e for e in handler.read_root_directory() if e['name'] == "SUB")
+        assert sub['cluster'] == 4
+
+        # The hint only moves up to the first cluster a search found free
+        assert handler._next_free_hint == 4
+        assert handler.find_free_clusters(2) == [5, 6]
+        assert handler._next_free_hint == 5
+
+        # Freeing a cluster below the hint moves it back
+        fat = handler.read_fat()
+        handler.set_fat_entry(fat, 2, 0)
+        handler.write_fat(fat)
+        assert handler._next_free_hint == 2
+        assert handler.find_free_clusters(2) == [2, 5]
+
+    def test_failed_allocation_after_free(self, handler):
+        # Fill the disk, then free cluster 2 with a FAT built by hand
+        fat = handler.read_fat()
+        for cluster in range(2, handler.total_clusters + 2):
+            handler.set_fat_entry(fat, cluster, 0xFFF)
+        handler.write_fat(fat)
+        fat[3] = 0
+        fat[4] &= 0xF0
+        handler.write_fat(fat)
+        assert handler._next_free_hint == 2
+
+        # Too little space: nothing is allocated and cluster 2 stays reachable
+        with pytest.raises(FAT12Error):
+            handler.write_file_to_image("BIG.BIN", b"B" * 4096)
+        assert handler._next_free_hint == 2
+        assert handler.find_free_clusters(1) == [2]
+
+    def test_failed_mkdir_keeps_clusters_free(self, handler):
+        for i in range(handler.root_entries):
+            handler.write_file_to_image(f"F{i}.TXT", b"")
+
+        # Each attempt looks up a cluster before finding the root full
+        for _ in range(3):
+            with pytest.raises(FAT12Error):
+                handler.create_directory("SUB")
+        assert handler.find_free_clusters(2) == [2, 3]
+
+        handler.delete_file(handler.read_root_directory()[0])
+        handler.create_directory("SUB")
+        sub = next(e for e in handler.read_root_directory() if e['name'] == "SUB")
+        assert sub['cluster'] == 2
+        handler.write_file_to_image("B.BIN", b"B" * 1024, parent_cluster=sub['cluster'])
+        b = next(e for e in handler.read_directory(sub['cluster']) if e['name'] == "B.BIN")
+        assert handler.get_cluster_chain(b['cluster']) == [3, 4]
+
+    def test_fat_cache(self, handler):
+        # Cached FAT is served without reading the image again
+        handler.read_fat()
+        with patch.object(handler, '_pread', side_effect=AssertionError("FAT re-read from disk")):
+            fat = handler.read_fat()
+
+        # Callers get a private copy
+        handler.set_fat_entry(fat, 5, 0xFFF)
+        assert handler.get_fat_entry(handler.read_fat(), 5) == 0
+
+        # write_fat refreshes the cache
+        handler.write_fat(fat)
+        assert handler.get_fat_entry(handler.read_fat(), 5) == 0xFFF
+
+        # External modifications are picked up after invalidation
+        offset = handler.fat_start + 5 + (5 // 2)
+        with open(handler.image_path, 'r+b') as f:
+            f.seek(offset)
+            f.write(b'\x00\x00')
+        assert handler.get_fat_entry(handler.read_fat(), 5) == 0xFFF
+        handler._invalidate_fat_cache()
+        assert handler.get_fat_entry(handler.read_fat(), 5) == 0
+
+    def test_positional_io_fallback(self, handler, monkeypatch):
+        # Platforms without pread/pwrite/preadv (Windows) seek on the shared descriptor
+        for name in ('pread', 'pwrite', 'preadv'):
+            monkeypatch.delattr(os, name, raising=False)
+
+        handler.write_file_to_image("file.bin", b"X" * 1500)
+        handler._invalidate_fat_cache()
+        entry = handler.read_root_directory()[0]
+        assert handler.extract_file(entry) == b"X" * 1500
+
+    def test_close_reopens_on_demand(self, handler):
+        handler.write_file_to_image("a.txt", b"data")
+        handler.close()
+        assert handler._fd is None
+        handler.close()  # Idempotent
+
+        with handler:
+            handler._invalidate_fat_cache()
+            assert handler.extract_file(handler.read_root_directory()[0]) == b"data"
+        assert handler._fd is None
+
+    def test_write_fat_range(self, handler):
+        fat = handler.read_fat()
+        handler.set_fat_entry(fat, 2, 0xFFF)
+        handler.set_fat_entry(fat, 100, 0xFFF)
+        # Only cluster 100's bytes are in range
+        handler.write_fat_range(fat, 150, 152)
+
+        handler._invalidate_fat_cache()
+        on_disk = handler.read_fat()
+        assert handler.get_fat_entry(on_disk, 100) == 0xFFF
+        assert handler.get_fat_entry(on_disk, 2) == 0
+
+        # Every FAT copy is updated
+        fat_size = handler.sectors_per_fat * handler.bytes_per_sector
+        with open(handler.image_path, 'rb') as f:
+            f.seek(handler.fat_start + fat_size)
+            assert f.read(fat_size) == on_disk
+
+    def test_write_fat_verify(self, handler):
+        fat = handler.read_fat()
+        handler.set_fat_entry(fat, 2, 0xFFF)
+        handler.write_fat(fat, verify=True)
+        assert handler.get_fat_entry(handler.read_fat(), 2) == 0xFFF
+
+        # A mismatching read-back is only detected when verification is requested
+        with patch.object(handler, '_pread', return_value=b'bad'):
+            handler.write_fat(fat)
+            with pytest.raises(FAT12Error):
+                handler.write_fat(fat, verify=True)
+
     def test_disk_full_data_area(self, handler):
         # Manually fill the FAT to simulate full disk
         fat_data = handler.read_fat()
@@ -156,6 +333,33 @@ class TestClusterManagement:
         fat = handler.read_fat()
         assert handler.get_fat_entry(fat, 2) == 0
 
+    def test_format_disk_verify(self, handler):
+        handler.format_disk(verify=True)
+        assert handler.find_free_clusters(1) == [2]
+
+        # A mismatching read-back is only detected when verification is requested
+        with patch.object(handler, '_pread', return_value=b'bad'):
+            handler.format_disk()
+            with pytest.raises(FAT12Error, match="Format verification failed"):
+                handler.format_disk(verify=True)
+
+    @pytest.mark.parametrize("trailing", [b"", b"TRAILER"])
+    def test_full_format_zeroes_data_area(self, handler, trailing):
+        handler.write_file_to_image("file1.txt", b"A" * 2048)
+        with open(handler.image_path, 'ab') as f:
+            f.write(trailing)
+        total_size = handler.total_sectors * handler.bytes_per_sector
+
+        handler.format_disk(full_format=True)
+
+        with open(handler.image_path, 'rb') as f:
+            image = f.read()
+        assert len(image) == total_size + len(trailing)
+        assert image[:3] == b'\xEB\x3C\x90'
+        assert not any(image[handler.data_start:total_size])
+        # Data beyond the filesystem is left alone
+        assert image[total_size:] == trailing
+
     def test_format_disk_cleans_fat_and_root(self, handler):
         # Fill up some clusters
         handler.write_file_to_image("file1.txt", b"A" * 2048) # 4 clusters
@@ -245,6 +449,21 @@ class TestFileIO:
         # Extracting should return empty bytes
         assert handler.extract_file(entries[0]) == b""
 
+    def test_write_returns_entry(self, handler):
+        handler.create_directory("SUB")
+        sub = handler.read_root_directory()[0]
+
+        # Short and long names, empty and non-empty, root and subdirectory
+        written = [
+            handler.write_file_to_image("SHORT.TXT", b"data"),
+            handler.write_file_to_image("A long name.txt", b"X" * 600),
+            handler.write_file_to_image("empty.txt", b"", parent_cluster=sub['cluster']),
+        ]
+
+        on_disk = handler.read_root_directory()[1:] + handler.read_directory(sub['cluster'])[2:]
+        assert written == on_disk
+        assert handler.extract_file(written[1]) == b"X" * 600
+
     def test_write_exact_sector_size(self, handler):
         # 512 bytes = exactly 1 sector/cluster
         data = b"X" * 512
@@ -309,6 +528,62 @@ class TestFileIO:
         with pytest.raises(FAT12CorruptionError):
             handler.extract_file(entries[0])
 
+    def test_extract_contiguous_file_single_read(self, handler):
+        # Distinct bytes in every cluster and a partial last cluster
+        data = os.urandom(3 * handler.bytes_per_cluster + 100)
+        handler.write_file_to_image("file.bin", data)
+        entry = handler.read_root_directory()[0]
+        handler.read_fat()  # Prime the FAT cache
+
+        with patch.object(handler, '_pread', wraps=handler._pread) as mock_pread:
+            extracted = handler.extract_file(entry)
+        mock_pread.assert_called_once()
+        assert extracted == data
+        with FAT12Image(handler.image_path) as image:
+            assert image.extract_file(image.read_root_directory()[0]) == data
+
+    def test_extract_chain_loop(self, handler):
+        handler.write_file_to_image("file.bin", b"L" * 1536)
+        entry = handler.read_root_directory()[0]
+        fat = handler.read_fat()
+        handler.set_fat_entry(fat, entry['cluster'] + 1, entry['cluster'])
+        handler.write_fat(fat)
+
+        with pytest.raises(FAT12CorruptionError, match="Loop detected"):
+            handler.extract_file(entry)
+
+    def test_batch_syncs_once(self, handler):
+        with patch('fat12_backend.handler._datasync') as mock_datasync:
+            with handler.batch():
+                with handler.batch():
+                    handler.write_file_to_image("A.TXT", b"a")
+                handler.write_file_to_image("B.TXT", b"b")
+                handler.rename_entry(handler.read_root_directory()[0], "C.TXT")
+                mock_datasync.assert_not_called()
+        mock_datasync.assert_called_once()
+        assert not handler._unsynced_writes
+        assert [e['name'] for e in handler.read_root_directory()] == ["C.TXT", "B.TXT"]
+
+    def test_write_generation(self, handler):
+        generation = handler.write_generation
+        handler.read_root_directory()
+        assert handler.write_generation == generation
+        handler.write_file_to_image("A.TXT", b"a")
+        assert handler.write_generation > generation
+
+    def test_free_space_cached_until_write(self, handler):
+        free = handler.get_free_space()
+        with patch.object(handler, '_decode_fat12', wraps=handler._decode_fat12) as mock_decode:
+            assert handler.get_free_space() == free
+            mock_decode.assert_not_called()
+
+            handler.write_file_to_image("A.TXT", b"a")
+            assert handler.get_free_space() == free - handler.bytes_per_cluster
+
+    def test_end_batch_without_begin(self, handler):
+        with pytest.raises(RuntimeError):
+            handler.end_batch()
+
 class TestDirectoryOperations:
     def test_rename_file(self, handler):
         handler.write_file_to_image("old_name.txt", b"content")
@@ -362,6 +637,117 @@ class TestDirectoryOperations:
             byte = f.read(1)
             assert byte == b'\xE5'
 
+    def test_rename_moves_entry_and_deletes_old_slots(self, handler):
+        handler.write_file_to_image("A.TXT", b"a")
+        handler.write_file_to_image("B.TXT", b"b")
+        entry = handler.read_root_directory()[0]
+
+        handler.rename_entry(entry, "A much longer name.txt")
+
+        entries = handler.read_root_directory()
+        assert [e['name'] for e in entries] == ["B.TXT", "A much longer name.txt"]
+        renamed = entries[1]
+        assert renamed['cluster'] == entry['cluster']
+        assert handler.extract_file(renamed) == b"a"
+        assert handler._pread(1, handler.root_start) == b'\xE5'
+
+    def test_rename_deletes_old_slots_in_one_write(self, handler):
+        handler.write_file_to_image("ThisIsALongName.txt", b"data")
+        handler.write_file_to_image("B.TXT", b"b")
+        entry = handler.read_root_directory()[0]
+        assert entry['index'] == 2
+
+        with patch.object(handler, '_pwrite', wraps=handler._pwrite) as mock_write:
+            handler.rename_entry(entry, "An even longer replacement name.txt")
+        # One write marks slots 0-2 deleted, one writes the new block after B.TXT
+        assert mock_write.call_count == 2
+
+        with FAT12Image(handler.image_path) as image:
+            assert image._pread(96, image.root_start)[0::32] == b'\xE5' * 3
+            entries = image.read_root_directory()
+            assert [e['name'] for e in entries] == ["B.TXT", "An even longer replacement name.txt"]
+            assert entries[1]['index'] > entries[0]['index'] == 3
+            assert image.extract_file(entries[1]) == b"data"
+
+    def test_rename_short_to_short_writes_name_only(self, handler):
+        handler.write_file_to_image("ThisIsALongName.txt", b"data")
+        handler.write_file_to_image("FOO.TXT", b"foo")
+        entry = handler.read_root_directory()[1]
+
+        with patch.object(handler, '_pwrite', wraps=handler._pwrite) as mock_write:
+            handler.rename_entry(entry, "BAR.TXT")
+        mock_write.assert_called_once_with(b"BAR     TXT", handler.root_start + 3 * 32)
+
+        entries = handler.read_root_directory()
+        assert [e['name'] for e in entries] == ["ThisIsALongName.txt", "BAR.TXT"]
+        assert handler.extract_file(entries[1]) == b"foo"
+
+    def test_rename_does_not_reopen_image(self, handler):
+        handler.write_file_to_image("ThisIsALongName.txt", b"data")
+        entry = handler.read_root_directory()[0]
+
+        with patch('builtins.open', wraps=open) as mock_open:
+            handler.rename_entry(entry, "An even longer replacement name.txt")
+        mock_open.assert_not_called()
+
+        assert handler.read_root_directory()[0]['name'] == "An even longer replacement name.txt"
+
+    def test_rename_in_subdirectory_walks_chain_once(self, handler):
+        handler.create_directory("SUB")
+        sub = handler.read_root_directory()[0]
+        for i in range(20):
+            handler.write_file_to_image(f"F{i}.TXT", b"", parent_cluster=sub['cluster'])
+        handler.write_file_to_image("A Long Name In Cluster Two.txt", b"x",
+                                    parent_cluster=sub['cluster'])
+        entry = handler.read_directory(sub['cluster'])[-1]
+
+        with patch('fat12_backend.directory.get_directory_clusters',
+                   wraps=get_directory_clusters) as mock_clusters:
+            handler.rename_entry(entry, "Short.txt")
+        mock_clusters.assert_called_once()
+
+        names = [e['name'] for e in handler.read_directory(sub['cluster'])]
+        assert names[-1] == "Short.txt"
+        assert "A Long Name In Cluster Two.txt" not in names
+
+    def test_rename_lfn_across_cluster_boundary(self, handler):
+        handler.create_directory("SUB")
+        sub = handler.read_root_directory()[0]
+        # '.', '..' and 11 files leave three slots in the first cluster, so
+        # the long name's short entry lands in the second
+        for i in range(11):
+            handler.write_file_to_image(f"F{i}.TXT", b"", parent_cluster=sub['cluster'])
+        handler.write_file_to_image("A Long Name Across Clusters.txt", b"x",
+                                    parent_cluster=sub['cluster'])
+        entry = handler.read_directory(sub['cluster'])[-1]
+        assert entry['index'] == 16
+
+        handler.rename_entry(entry, "Short.txt")
+
+        names = [e['name'] for e in handler.read_directory(sub['cluster'])]
+        assert names[-1] == "Short.txt"
+        assert "A Long Name Across Clusters.txt" not in names
+        # Renamed in place: the new name reuses the first slots and the
+        # leftovers, one on each side of the boundary, are deleted
+        raw = dict(iter_directory_entries(handler, sub['cluster']))
+        assert raw[13][11] == 0x0F
+        assert raw[15][0] == 0xE5 and raw[16][0] == 0xE5
+
+    def test_rename_expands_subdirectory(self, handler):
+        handler.create_directory("SUB")
+        sub = handler.read_root_directory()[0]
+        # '.', '..' and 14 files fill the first cluster
+        for i in range(14):
+            handler.write_file_to_image(f"F{i}.TXT", b"", parent_cluster=sub['cluster'])
+        entry = next(e for e in handler.read_directory(sub['cluster']) if e['name'] == "F0.TXT")
+
+        # The longer name needs slots in a cluster added while renaming
+        handler.rename_entry(entry, "A much longer name for this file.txt")
+
+        names = [e['name'] for e in handler.read_directory(sub['cluster'])]
+        assert "F0.TXT" not in names
+        assert names[-1] == "A much longer name for this file.txt"
+
     def test_rename_expand_fail_full_dir(self, handler):
         # Fill the directory, leaving no contiguous space for an LFN entry
         for i in range(224):
@@ -383,6 +769,18 @@ class TestDirectoryOperations:
         # Short name should be uppercase
         assert entries[0]['short_name'] == "MIXCASE.TXT"
 
+    def test_lfn_checksum_only_for_long_names(self, handler):
+        handler.write_file_to_image("SHORT1.TXT", b"")
+        handler.write_file_to_image("SHORT2.TXT", b"")
+        handler.write_file_to_image("A Long Name.txt", b"")
+
+        with patch('fat12_backend.directory.calculate_lfn_checksum',
+                   wraps=calculate_lfn_checksum) as mock_checksum:
+            entries = handler.read_root_directory()
+        # Only the entry preceded by LFN slots is checked
+        mock_checksum.assert_called_once()
+        assert [e['name'] for e in entries] == ["SHORT1.TXT", "SHORT2.TXT", "A Long Name.txt"]
+
     def test_rename_file_unicode_error(self, handler):
         handler.write_file_to_image("old.txt", b"")
         entries = handler.read_root_directory()
@@ -399,8 +797,8 @@ class TestDirectoryOperations:
         handler.write_file_to_image("file.txt", b"")
         entries = handler.read_root_directory()
         
-        # Mock open to raise exception during rename
-        with patch('builtins.open', side_effect=IOError("Mock error")):
+        # Make the image write fail during rename
+        with patch.object(handler, '_pwrite', side_effect=IOError("Mock error")):
             with pytest.raises(IOError):
                 handler.rename_entry(entries[0], "new.txt")
 
@@ -429,7 +827,7 @@ class TestDirectoryOperations:
         handler.write_file_to_image("file.txt", b"")
         entries = handler.read_root_directory()
         
-        with patch('builtins.open', side_effect=IOError("Mock error")):
+        with patch.object(handler, '_pwrite', side_effect=IOError("Mock error")):
             with pytest.raises(IOError):
                 handler.delete_file(entries[0])
 
@@ -698,6 +1096,36 @@ class TestClusterAnalysis:
         chain = handler.get_cluster_chain(5)
         assert chain == [3, 5]
 
+        # Data split across the non-contiguous runs reads back intact
+        entry_d = next(e for e in handler.read_root_directory() if e['name'] == "D.txt")
+        assert handler.extract_file(entry_d) == b"D" * 600
+
+    def test_contiguous_write_skips_small_holes(self, handler):
+        for name in ("A.txt", "B.txt", "C.txt"):
+            handler.write_file_to_image(name, b"x" * 100)
+        entry_b = next(e for e in handler.read_root_directory() if e['name'] == "B.txt")
+        handler.delete_file(entry_b)
+
+        # Cluster 3 is a one-cluster hole; a two-cluster run starts at 5
+        assert handler.find_free_run(1) == 3
+        assert handler.find_free_run(2) == 5
+        assert handler.find_free_run(handler.total_clusters) is None
+
+        handler.write_file_to_image("D.txt", b"D" * 600, contiguous=True)
+        assert handler.get_cluster_chain(5) == [5, 6]
+        assert handler.get_fat_entry(handler.read_fat(), 3) == 0
+
+    def test_get_cluster_chain_loop(self, handler):
+        # 2 -> 3 -> 4 -> 2 forms a cycle with no head
+        fat = handler.read_fat()
+        handler.set_fat_entry(fat, 2, 3)
+        handler.set_fat_entry(fat, 3, 4)
+        handler.set_fat_entry(fat, 4, 2)
+        handler.write_fat(fat)
+
+        with pytest.raises(FAT12CorruptionError):
+            handler.get_cluster_chain(3)
+
     def test_lfn_invalid_utf16(self, handler):
         # 1. Manually write a malformed LFN entry at Index 0
         # LFN entry with invalid UTF-16 sequence
@@ -778,6 +1206,33 @@ class TestHelperMethods:
         entry = handler.find_entry_by_83_name("NONEXIST   ")
         assert entry is None
 
+    def test_find_entry_by_83_name_index(self, handler):
+        handler.write_file_to_image("FILE.TXT", b"content")
+        handler.write_file_to_image("OTHER.TXT", b"content")
+
+        # Repeated lookups reuse the index built on the first one
+        with patch('fat12_backend.directory.read_directory',
+                   wraps=read_directory) as mock_read:
+            assert handler.find_entry_by_83_name("FILE    TXT")['name'] == "FILE.TXT"
+            assert handler.find_entry_by_83_name("OTHER   TXT")['name'] == "OTHER.TXT"
+            assert handler.find_entry_by_83_name("MISSING TXT") is None
+        mock_read.assert_called_once()
+
+        # Changing a returned entry leaves the index alone
+        entry = handler.find_entry_by_83_name("FILE    TXT")
+        entry['parent_cluster'] = 5
+        entry['name'] = "CHANGED.TXT"
+        again = handler.find_entry_by_83_name("FILE    TXT")
+        assert (again['name'], again['parent_cluster']) == ("FILE.TXT", 0)
+
+        # Any write invalidates it
+        entry = handler.find_entry_by_83_name("FILE    TXT")
+        handler.rename_entry(entry, "RENAMED.TXT")
+        assert handler.find_entry_by_83_name("FILE    TXT") is None
+        assert handler.find_entry_by_83_name("RENAMED TXT")['name'] == "RENAMED.TXT"
+        handler.delete_file(handler.find_entry_by_83_name("OTHER   TXT"))
+        assert handler.find_entry_by_83_name("OTHER   TXT") is None
+
     def test_get_existing_83_names(self, handler):
         handler.write_file_to_image("A.TXT", b"")
         handler.write_file_to_image("LONGFILENAME.TXT", b"", use_numeric_tail=True) # LONGFILENAME.TXT -> LONGFI~1.TXT -> LONGFI~1TXT
@@ -812,6 +1267,19 @@ class TestHelperMethods:
         assert handler.predict_short_name("File.txt", use_numeric_tail=True) == "FILE~1  TXT"
         assert handler.predict_short_name("NewFile.txt") == "NEWFILE TXT"
 
+    def test_predict_short_name_reuses_names_until_write(self, handler):
+        handler.write_file_to_image("FILE.TXT", b"")
+
+        with patch('fat12_backend.directory.iter_directory_entries',
+                   wraps=iter_directory_entries) as mock_iter:
+            for _ in range(3):
+                assert handler.predict_short_name("File.txt", use_numeric_tail=True) == "FILE~1  TXT"
+        mock_iter.assert_called_once()
+
+        # A new file in the directory is seen by the next prediction
+        handler.write_file_to_image("File.txt", b"", use_numeric_tail=True)
+        assert handler.predict_short_name("File.txt", use_numeric_tail=True) == "FILE~2  TXT"
+
     def test_get_total_cluster_count(self, handler):
         # Standard 1.44MB floppy
         # FAT size = 9 sectors * 512 bytes = 4608 bytes
@@ -848,6 +1316,13 @@ class TestHelperMethods:
         assert entry is not None
         assert entry['raw_short_name'] == "FILE    TXT"
 
+    def test_find_entry_by_83_name_lowercase_on_disk(self, handler):
+        handler.write_file_to_image("FILE.TXT", b"")
+        # Some tools store lowercase 8.3 names; the lookup is case-insensitive
+        handler._pwrite(b"file    txt", handler.root_start)
+        entry = handler.find_entry_by_83_name("FILE    TXT")
+        assert entry['raw_short_name'] == "file    txt"
+
     def test_predict_short_name_collision_sjis(self, handler):
         # If we have a file "\xE5BCDEFGH.TXT" (stored as 0x05 + BCDEFGHTXT), it decodes to "BCDEFGHTXT"
         # If we try to add "BCDEFGH.TXT" (candidate "BCDEFGH TXT"), it should NOT collide because names differ.
@@ -1046,6 +1521,20 @@ class TestFileAttributes:
         assert not entry['is_archive']
         assert not entry['is_system']
     
+    def test_unchanged_attributes_not_written(self, handler):
+        """Test that requesting the current attributes writes nothing"""
+        handler.write_file_to_image("SAME.TXT", b"data")
+        entry = handler.read_root_directory()[0]
+        assert entry['is_archive'] and not entry['is_hidden']
+
+        with patch.object(handler, '_pwrite') as mock_write, \
+             patch.object(handler, '_sync') as mock_sync:
+            assert handler.set_entry_attributes(entry, is_hidden=False, is_archive=True) is False
+        mock_write.assert_not_called()
+        mock_sync.assert_not_called()
+
+        assert handler.set_entry_attributes(entry, is_hidden=True) is True
+
     def test_attribute_bits_preserved(self, handler):
         """Test that directory bit (0x10) is preserved and can't be modified"""
         
@@ -1116,3 +1605,101 @@ class TestFileAttributes:
         assert entry['is_system']
         assert entry['is_dir'] # Should still be a directory
         assert entry['attributes'] & 0x10 # Directory bit preserved
+
+class TestDefragmentation:
+    def test_defragment_preserves_files(self, handler):
+        # Fragment a file around a deleted one, and nest a file in a subdirectory
+        handler.write_file_to_image("a.txt", b"A" * 600)
+        handler.write_file_to_image("gap.txt", b"G" * 100)
+        handler.write_file_to_image("c.txt", b"C" * 100)
+        gap = next(e for e in handler.read_root_directory() if e['name'] == "gap.txt")
+        handler.delete_file(gap)
+        handler.write_file_to_image("Long Fragmented Name.bin", bytes(range(256)) * 6,
+                                    modification_dt=datetime.datetime(2001, 2, 3, 4, 5, 6))
+        handler.create_directory("SUB")
+        sub = next(e for e in handler.read_root_directory() if e['name'] == "SUB")
+        handler.write_file_to_image("inner.txt", b"I" * 1000, parent_cluster=sub['cluster'])
+        frag = next(e for e in handler.read_root_directory() if e['name'] == "Long Fragmented Name.bin")
+        handler.set_entry_attributes(frag, is_read_only=True)
+        assert handler.get_cluster_chain(frag['cluster']) != list(range(frag['cluster'], frag['cluster'] + 3))
+
+        before = {e['name']: e for e in handler.read_root_directory()}
+        handler.defragment_filesystem()
+        after = {e['name']: e for e in handler.read_root_directory()}
+
+        assert set(after) == set(before)
+        frag = after["Long Fragmented Name.bin"]
+        assert handler.extract_file(frag) == bytes(range(256)) * 6
+        chain = handler.get_cluster_chain(frag['cluster'])
+        assert chain == list(range(chain[0], chain[0] + len(chain)))
+        assert frag['is_read_only']
+        for field in ('last_modified_time', 'last_modified_date', 'creation_time', 'creation_date'):
+            assert frag[field] == before["Long Fragmented Name.bin"][field]
+
+        inner = next(e for e in handler.read_directory(after["SUB"]['cluster']) if e['name'] == "inner.txt")
+        assert handler.extract_file(inner) == b"I" * 1000
+
+    def test_defragment_sibling_directories(self, handler):
+        # Children of different parents at the same depth interleave by name
+        handler.create_directory("A")
+        handler.create_directory("B")
+        dirs = {e['name']: e['cluster'] for e in handler.read_root_directory()}
+        for name in ("x.txt", "y.txt"):
+            handler.write_file_to_image(name, b"A" + name.encode(), parent_cluster=dirs["A"])
+        handler.write_file_to_image("m.txt", b"Bm", parent_cluster=dirs["B"])
+        handler.create_directory("DEEP", dirs["B"])
+
+        handler.defragment_filesystem()
+
+        dirs = {e['name']: e['cluster'] for e in handler.read_root_directory()}
+        a_files = {e['name']: e for e in handler.read_directory(dirs["A"]) if not e['is_dir']}
+        b_files = {e['name']: e for e in handler.read_directory(dirs["B"]) if e['name'] not in ('.', '..')}
+        assert {n: handler.extract_file(e) for n, e in a_files.items()} == {"x.txt": b"Ax.txt", "y.txt": b"Ay.txt"}
+        assert handler.extract_file(b_files["m.txt"]) == b"Bm"
+        assert b_files["DEEP"]['is_dir']
+
+    def test_defragment_preserves_metadata_of_every_entry(self, handler):
+        handler.create_directory("SUB")
+        sub = handler.read_root_directory()[0]
+        for parent in (None, sub['cluster']):
+            for i in range(5):
+                handler.write_file_to_image(f"File Number {i}.txt", b"x" * (i * 300), parent_cluster=parent,
+                                            modification_dt=datetime.datetime(1990 + i, 1 + i, 1, 12, 0, 2 * i))
+            for entry in handler.read_directory(parent):
+                if entry['name'].startswith("File Number") and entry['name'][12] in "13":
+                    handler.set_entry_attributes(entry, is_hidden=True)
+
+        def snapshot(parent):
+            fields = ('attributes', 'last_modified_time', 'last_modified_date', 'creation_date')
+            return {e['name']: tuple(e[f] for f in fields) for e in handler.read_directory(parent)
+                    if e['name'] not in ('.', '..')}
+
+        before = (snapshot(None), snapshot(sub['cluster']))
+        handler.defragment_filesystem()
+        sub = next(e for e in handler.read_root_directory() if e['name'] == "SUB")
+        assert (snapshot(None), snapshot(sub['cluster'])) == before
+
+    def test_defragment_rejects_directory_cycle(self, handler):
+        handler.create_directory("SUB")
+        sub = handler.read_root_directory()[0]
+        handler.create_directory("LOOP", sub['cluster'])
+        loop = next(e for e in handler.read_directory(sub['cluster']) if e['name'] == "LOOP")
+        # Point LOOP back at its parent's cluster
+        offset = get_entry_offset(handler, sub['cluster'], loop['index'])
+        with open(handler.image_path, 'r+b') as f:
+            f.seek(offset + 26)
+            f.write(struct.pack('<H', sub['cluster']))
+
+        with pytest.raises(FAT12CorruptionError, match="reachable twice"):
+            handler.defragment_filesystem()
+        # Nothing was formatted
+        assert handler.read_root_directory()[0]['name'] == "SUB"
+
+    def test_extract_file_from_image_snapshot(self, handler):
+        handler.write_file_to_image("file.bin", b"S" * 1500)
+        entry = handler.read_root_directory()[0]
+        with open(handler.image_path, 'rb') as f:
+            image_data = f.read()
+
+        with patch.object(handler, '_preadinto', side_effect=AssertionError("Read from disk")):
+            assert handler.extract_file(entry, image_data) == b"S" * 1500
@@ -10,7 +10,7 @@ from fat12_backend.vfat_utils import (
     decode_lfn_text, decode_short_name,
     format_83_name, get_raw_entry_chain, 
     decode_fat_datetime,
-    decode_raw_83_name
+    decode_raw_83_name, decode_raw_83_name_upper
 )
 
 class TestTimeDate:
@@ -63,6 +63,14 @@ class TestTimeDate:
         decoded = decode_fat_time(encoded)
         assert decoded == "10:00:00"
 
+    def test_decode_fat_date_time_repeated(self):
+        # Decoded strings are reused, so repeated calls must agree
+        date_val = ((2023 - 1980) << 9) | (10 << 5) | 25
+        time_val = (13 << 11) | (45 << 5) | 15
+        for _ in range(3):
+            assert decode_fat_date(date_val) == "2023-10-25"
+            assert decode_fat_time(time_val) == "13:45:30"
+
     def test_decode_fat_date_invalid_day_month(self):
         # Month 13
         invalid_month = ((2023-1980) << 9) | (13 << 5) | 1
@@ -210,6 +218,11 @@ class TestLFN:
         assert isinstance(chk, int)
         assert 0 <= chk <= 255
 
+    def test_calculate_lfn_checksum_value(self):
+        assert calculate_lfn_checksum(b"FILE    TXT") == 0x19
+        # Mutable buffers are accepted as well (the result is cached per name)
+        assert calculate_lfn_checksum(bytearray(b"FILE    TXT")) == 0x19
+
     def test_create_lfn_entries(self):
         long_name = "LongFileName.txt"
         short_name = b"LONGFIL~1TXT"
@@ -351,6 +364,13 @@ class TestNameDecoding:
         # With errors='replace' (default), 0xE5 becomes the replacement char ''
         assert decode_raw_83_name(data) == "\uFFFDBCDEFGHTXT"
 
+    def test_decode_raw_83_name_upper(self):
+        assert decode_raw_83_name_upper(b"file~1  txt") == "FILE~1  TXT"
+        assert decode_raw_83_name_upper(b"\x05bcdefghtxt") == "\uFFFDBCDEFGHTXT"
+        # Only the first byte gets the 0x05 fixup; other bytes are unchanged
+        for data in (b"Ab\x05\xE5{z} 123", b"\x00" * 11):
+            assert decode_raw_83_name_upper(data) == decode_raw_83_name(data).upper()
+
     def test_decode_short_name(self):
         # Test standard name
         entry = bytearray(32)